@@ -0,0 +1,69 @@
+"""
+Bulk writes: per-row save/delete vs. save_many/delete_many
+
+Writes N throwaway entities to the entities table one row at a time, then again
+with a single save_many call, and does the same for deletes. Rows are created
+under a random benchmark guild id and removed afterwards.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*).
+
+Run from the project root:
+    python -m benchmarks.bulk_upsert [--entities 1000]
+"""
+import argparse
+import time
+import uuid
+from data.database import db_manager
+from data.models import Entity
+from data.repositories.repository_factory import repositories
+
+def make_entities(guild_id: str, count: int) -> list:
+    return [
+        Entity(
+            id=str(uuid.uuid4()),
+            guild_id=guild_id,
+            name=f"Benchmark Entity {i}",
+            owner_id='0',
+            entity_type='generic',
+            system='generic',
+            system_specific_data={},
+            notes=[],
+            avatar_url='',
+            access_type='public'
+        )
+        for i in range(count)
+    ]
+
+def timed(label: str, func, count: int) -> float:
+    start = time.perf_counter()
+    func()
+    elapsed = time.perf_counter() - start
+    print(f"{label:>22}: {elapsed * 1000:9.1f} ms ({count / elapsed:9.0f} rows/s)")
+    return elapsed
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entities', type=int, default=1000, help='Entities to write and delete')
+    args = parser.parse_args()
+
+    repo = repositories.entity
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    entities = make_entities(guild_id, args.entities)
+    ids = [entity.id for entity in entities]
+
+    print(f"{args.entities} entities, guild {guild_id}")
+    try:
+        per_row = timed('save (per row)', lambda: [repo.save(entity, conflict_columns=['id']) for entity in entities], len(ids))
+        bulk = timed('save_many', lambda: repo.save_many(entities, conflict_columns=['id']), len(ids))
+        print(f"{'upsert speedup':>22}: {per_row / bulk:9.1f}x")
+
+        per_row = timed('delete (per row)', lambda: [repo.delete("id = %s", (id,)) for id in ids], len(ids))
+        repo.save_many(entities, conflict_columns=['id'])
+        bulk = timed('delete_many', lambda: repo.delete_many(ids), len(ids))
+        print(f"{'delete speedup':>22}: {per_row / bulk:9.1f}x")
+    finally:
+        repo.delete("guild_id = %s", (guild_id,))
+        db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
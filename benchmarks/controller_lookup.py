@@ -0,0 +1,93 @@
+"""
+Companion controller lookups: get_parents per companion vs. one batched query
+
+Creates a PC that controls N throwaway companions, then answers "which of these
+companions does the user control?" the old way (one get_parents query per
+companion) and with one get_controller_owner_ids query.
+Rows are created under a random benchmark guild id and removed afterwards.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*).
+
+Run from the project root:
+    python -m benchmarks.controller_lookup [--companions 200] [--rounds 5]
+"""
+import argparse
+import time
+import uuid
+from core.base_models import EntityLinkType
+from data.database import db_manager
+from data.models import Entity, EntityLink
+from data.repositories.repository_factory import repositories
+
+def make_entity(guild_id: str, name: str, owner_id: str, entity_type: str) -> Entity:
+    return Entity(
+        id=str(uuid.uuid4()),
+        guild_id=guild_id,
+        name=name,
+        owner_id=owner_id,
+        entity_type=entity_type,
+        system='generic',
+        system_specific_data={},
+        notes=[],
+        avatar_url='',
+        access_type='public'
+    )
+
+def timed(label: str, func, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:>34}: {elapsed * 1000:9.1f} ms per lookup")
+    return elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--companions', type=int, default=200, help='Companions controlled by the PC')
+    parser.add_argument('--rounds', type=int, default=5, help='Times to repeat each lookup')
+    args = parser.parse_args()
+
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    user_id = '1'
+    controller = make_entity(guild_id, 'Benchmark PC', user_id, 'pc')
+    companions = [make_entity(guild_id, f"Benchmark Companion {i}", '0', 'companion') for i in range(args.companions)]
+    companion_ids = [companion.id for companion in companions]
+    links = [
+        EntityLink(
+            id=str(uuid.uuid4()),
+            guild_id=guild_id,
+            from_entity_id=controller.id,
+            to_entity_id=companion.id,
+            link_type=EntityLinkType.CONTROLS.value
+        )
+        for companion in companions
+    ]
+
+    print(f"{args.companions} companions, guild {guild_id}")
+    try:
+        repositories.entity.save_many([controller] + companions, conflict_columns=['id'])
+        repositories.link.save_many(links, conflict_columns=['id'])
+
+        def per_companion():
+            return {
+                companion_id for companion_id in companion_ids
+                if any(str(parent.owner_id) == user_id for parent in repositories.link.get_parents(
+                    guild_id, companion_id, EntityLinkType.CONTROLS.value
+                ))
+            }
+
+        def batched_owners():
+            owners = repositories.link.get_controller_owner_ids(guild_id, companion_ids)
+            return {companion_id for companion_id, owner_ids in owners.items() if user_id in owner_ids}
+
+        slow, expected = timed('get_parents per companion', per_companion, args.rounds)
+        fast, result = timed('get_controller_owner_ids', batched_owners, args.rounds)
+        assert result == expected
+        print(f"{'speedup':>34}: {slow / fast:9.1f}x")
+    finally:
+        repositories.link.delete("guild_id = %s", (guild_id,))
+        repositories.entity.delete("guild_id = %s", (guild_id,))
+        db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,120 @@
+"""
+vw_entity_details: correlated subqueries vs. the set-based link summary
+
+Builds a synthetic guild (10k entities and 30k links by default) with
+generate_series, then runs EXPLAIN ANALYZE for the old view definition (four
+correlated jsonb_agg subqueries per row) and the current vw_entity_details /
+entity_link_summary on three workloads: listing the whole guild, fetching
+500 entities at once (EntityDetailsRepository.get_many) and fetching one
+entity (get_by_id). Everything runs in a transaction that is rolled back, so
+the synthetic guild never becomes visible.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*)
+with data/views.sql applied (the bot does this on startup).
+
+Run from the project root:
+    python -m benchmarks.entity_details_explain [--entities 10000] [--links 30000]
+"""
+import argparse
+import uuid
+from data.database import db_manager
+
+# vw_entity_details as it was defined before entity_link_summary
+OLD_VIEW = """
+    SELECT
+        e.id, e.guild_id, e.name, e.owner_id, e.entity_type, e.system, e.avatar_url, e.access_type,
+        (
+            SELECT jsonb_agg(jsonb_build_object('id', child.id, 'name', child.name))
+            FROM entity_links el
+            JOIN entities child ON el.to_entity_id = child.id
+            WHERE el.from_entity_id = e.id AND el.link_type = 'possesses'
+        ) AS possessed_items,
+        (
+            SELECT jsonb_agg(jsonb_build_object('id', parent.id, 'name', parent.name))
+            FROM entity_links el
+            JOIN entities parent ON el.from_entity_id = parent.id
+            WHERE el.to_entity_id = e.id AND el.link_type = 'possesses'
+        ) AS possessed_by,
+        (
+            SELECT jsonb_agg(jsonb_build_object('id', child.id, 'name', child.name))
+            FROM entity_links el
+            JOIN entities child ON el.to_entity_id = child.id
+            WHERE el.from_entity_id = e.id AND el.link_type = 'controls'
+        ) AS controls,
+        (
+            SELECT jsonb_agg(jsonb_build_object('id', parent.id, 'name', parent.name))
+            FROM entity_links el
+            JOIN entities parent ON el.from_entity_id = parent.id
+            WHERE el.to_entity_id = e.id AND el.link_type = 'controls'
+        ) AS controlled_by
+    FROM entities e
+"""
+
+GET_MANY = """
+    SELECT e.id, e.guild_id, e.name, e.owner_id, e.entity_type, e.system, e.avatar_url, e.access_type,
+           s.possessed_items, s.possessed_by, s.controls, s.controlled_by
+    FROM entities e
+    LEFT JOIN entity_link_summary(%(ids)s) s ON s.entity_id = e.id
+    WHERE e.id = ANY(%(ids)s)
+"""
+
+def populate(cur, guild_id: str, entities: int, links: int) -> None:
+    cur.execute("""
+        INSERT INTO entities (id, guild_id, name, owner_id, entity_type, system, access_type)
+        SELECT %(guild)s || '-' || i, %(guild)s, 'Entity ' || i, '0',
+               CASE WHEN i %% 10 = 0 THEN 'container' WHEN i %% 10 = 1 THEN 'pc' ELSE 'item' END,
+               'generic', 'public'
+        FROM generate_series(1, %(entities)s) AS i
+    """, {'guild': guild_id, 'entities': entities})
+    # Distinct (from, to) pairs, two thirds possesses and one third controls
+    cur.execute("""
+        INSERT INTO entity_links (id, guild_id, from_entity_id, to_entity_id, link_type, metadata)
+        SELECT %(guild)s || '-link-' || i, %(guild)s,
+               %(guild)s || '-' || (1 + (i %% %(entities)s)),
+               %(guild)s || '-' || (1 + ((i + 1 + i / %(entities)s) %% %(entities)s)),
+               CASE WHEN i %% 3 = 0 THEN 'controls' ELSE 'possesses' END,
+               '{}'::jsonb
+        FROM generate_series(0, %(links)s - 1) AS i
+        ON CONFLICT DO NOTHING
+    """, {'guild': guild_id, 'entities': entities, 'links': links})
+    cur.execute("ANALYZE entities")
+    cur.execute("ANALYZE entity_links")
+
+def explain(cur, query: str, params: dict) -> float:
+    cur.execute("EXPLAIN (ANALYZE, FORMAT JSON) " + query, params)
+    plan = cur.fetchone()
+    plan = plan[next(iter(plan))] if isinstance(plan, dict) else plan[0]
+    return plan[0]['Execution Time']
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--entities', type=int, default=10000, help='Entities in the synthetic guild')
+    parser.add_argument('--links', type=int, default=30000, help='Links in the synthetic guild')
+    parser.add_argument('--batch', type=int, default=500, help='Entities fetched by the get_many workload')
+    args = parser.parse_args()
+
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    ids = [f"{guild_id}-{i}" for i in range(1, args.batch + 1)]
+    params = {'guild': guild_id, 'ids': ids, 'id': ids[0]}
+    workloads = [
+        ('whole guild', f"SELECT * FROM ({OLD_VIEW}) v WHERE guild_id = %(guild)s",
+         "SELECT * FROM vw_entity_details WHERE guild_id = %(guild)s"),
+        (f"{args.batch} ids", f"SELECT * FROM ({OLD_VIEW}) v WHERE id = ANY(%(ids)s)", GET_MANY),
+        ('one id', f"SELECT * FROM ({OLD_VIEW}) v WHERE id = %(id)s",
+         "SELECT * FROM vw_entity_details WHERE id = %(id)s"),
+    ]
+
+    print(f"{args.entities} entities, {args.links} links (EXPLAIN ANALYZE execution time)")
+    with db_manager.transaction() as tx:
+        cur = tx.cursor
+        populate(cur, guild_id, args.entities, args.links)
+        for name, old_query, new_query in workloads:
+            old_ms = explain(cur, old_query, params)
+            new_ms = explain(cur, new_query, params)
+            print(f"{name:>12}: correlated {old_ms:9.1f} ms | set-based {new_ms:9.1f} ms | {old_ms / new_ms:6.1f}x")
+        # Never keep the synthetic guild
+        tx.rollback_only = True
+    db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,84 @@
+"""
+Event loop lag: synchronous repositories vs. repositories.aio
+
+Simulates many guilds handling interactions at once. Each handler runs a few
+repository queries; query latency is simulated with time.sleep so the benchmark
+doesn't need a live database. A heartbeat task measures how late the event loop
+wakes it up, which is the delay every other guild on the shard would see.
+
+Run from the project root:
+    python -m benchmarks.event_loop_lag [--handlers 50] [--queries 3] [--latency-ms 20]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+from data.repositories.base_repository import BaseRepository
+from data.repositories.async_repository import AsyncRepository
+
+class SlowRepository(BaseRepository[dict]):
+    """Repository whose queries just block for a fixed amount of time"""
+    def __init__(self, latency: float):
+        super().__init__('benchmark')
+        self.latency = latency
+
+    def to_dict(self, entity: dict) -> dict:
+        return entity
+
+    def from_dict(self, data: dict) -> dict:
+        return data
+
+    def execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, select_override: bool = False):
+        time.sleep(self.latency)
+        return {'id': params[0] if params else None} if fetch_one else []
+
+async def heartbeat(samples: list, stop: asyncio.Event, interval: float = 0.005):
+    """Record how late the loop runs us compared to the requested interval"""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(interval)
+        samples.append(time.perf_counter() - start - interval)
+
+async def sync_handler(repo: SlowRepository, queries: int):
+    for i in range(queries):
+        repo.find_by_id('id', str(i))
+        await asyncio.sleep(0)  # Simulated Discord I/O between queries
+
+async def async_handler(repo: AsyncRepository, queries: int):
+    for i in range(queries):
+        await repo.find_by_id('id', str(i))
+        await asyncio.sleep(0)
+
+async def run_scenario(name: str, make_handler, handlers: int):
+    samples = []
+    stop = asyncio.Event()
+    beat = asyncio.create_task(heartbeat(samples, stop))
+    await asyncio.sleep(0.02)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(make_handler() for _ in range(handlers)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await beat
+    lag_ms = sorted(s * 1000 for s in samples) or [0.0]
+    p99 = lag_ms[min(len(lag_ms) - 1, int(len(lag_ms) * 0.99))]
+    print(f"{name:>6}: total {elapsed * 1000:8.1f} ms | loop lag avg {statistics.mean(lag_ms):7.2f} ms, "
+          f"p99 {p99:7.2f} ms, max {lag_ms[-1]:7.2f} ms")
+
+async def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--handlers', type=int, default=50, help='Concurrent interaction handlers')
+    parser.add_argument('--queries', type=int, default=3, help='Queries per handler')
+    parser.add_argument('--latency-ms', type=float, default=20.0, help='Simulated query latency')
+    args = parser.parse_args()
+
+    repo = SlowRepository(args.latency_ms / 1000)
+    async_repo = AsyncRepository(repo)
+
+    print(f"{args.handlers} handlers x {args.queries} queries, {args.latency_ms} ms per query")
+    await run_scenario('sync', lambda: sync_handler(repo, args.queries), args.handlers)
+    await run_scenario('aio', lambda: async_handler(async_repo, args.queries), args.handlers)
+
+if __name__ == '__main__':
+    asyncio.run(main())
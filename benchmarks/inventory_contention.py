@@ -0,0 +1,94 @@
+"""
+Inventory contention: many players looting one container at once
+
+Fills a throwaway container with N torches, then has T threads take torches
+one at a time until the container is empty, and T threads add torches to it
+at the same time. With atomic quantity updates no torch is lost or
+duplicated: every successful take removes exactly one, and the final
+quantity matches the adds minus the takes. Prints throughput and exits
+non-zero if the totals don't add up.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*).
+
+Run from the project root:
+    python -m benchmarks.inventory_contention [--quantity 500] [--threads 8]
+"""
+import argparse
+import sys
+import threading
+import time
+import uuid
+from data.database import db_manager
+from data.models import Entity
+from data.repositories.repository_factory import repositories
+
+def make_entity(guild_id: str, name: str, entity_type: str) -> Entity:
+    return Entity(
+        id=str(uuid.uuid4()),
+        guild_id=guild_id,
+        name=name,
+        owner_id='0',
+        entity_type=entity_type,
+        system='generic',
+        system_specific_data={},
+        notes=[],
+        avatar_url='',
+        access_type='public'
+    )
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--quantity', type=int, default=500, help='Torches in the container at the start')
+    parser.add_argument('--threads', type=int, default=8, help='Concurrent looters (and as many restockers)')
+    parser.add_argument('--adds', type=int, default=20, help='Torches each restocker adds, one at a time')
+    args = parser.parse_args()
+
+    db_manager.configure_pool(max_size=args.threads * 2)
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    container = make_entity(guild_id, 'Loot Chest', 'container')
+    torch = make_entity(guild_id, 'Torch', 'item')
+    link = repositories.link
+
+    taken = [0] * args.threads
+    added = [0] * args.threads
+
+    def looter(i: int):
+        while link.take_item_quantity(guild_id, container.id, torch.name, 1):
+            taken[i] += 1
+
+    def restocker(i: int):
+        for _ in range(args.adds):
+            if link.add_item_quantity(guild_id, container.id, torch.id, torch.name, 1):
+                added[i] += 1
+
+    print(f"{args.quantity} torches, {args.threads} looters, {args.threads} restockers x {args.adds}, guild {guild_id}")
+    try:
+        repositories.entity.save_many([container, torch], conflict_columns=['id'])
+        link.add_item_quantity(guild_id, container.id, torch.id, torch.name, args.quantity)
+
+        threads = [threading.Thread(target=looter, args=(i,)) for i in range(args.threads)]
+        threads += [threading.Thread(target=restocker, args=(i,)) for i in range(args.threads)]
+        start = time.perf_counter()
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+        elapsed = time.perf_counter() - start
+
+        remaining = link.get_item_quantity(guild_id, container.id, torch.name)
+        operations = sum(taken) + sum(added)
+        print(f"taken {sum(taken)}, added {sum(added)}, remaining {remaining}")
+        print(f"{operations} operations in {elapsed * 1000:.1f} ms ({operations / elapsed:.0f} ops/s)")
+
+        expected = args.quantity + sum(added) - sum(taken)
+        if remaining != expected:
+            print(f"FAIL: expected {expected} torches left, found {remaining}")
+            sys.exit(1)
+        print("OK: no lost or duplicated updates")
+    finally:
+        link.delete("guild_id = %s", (guild_id,))
+        repositories.entity.delete("guild_id = %s", (guild_id,))
+        db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,128 @@
+"""
+Narration latency: pc:: messages with cold vs. warm speaker lookups
+
+Runs process_narration end to end for `pc::` (active character) and
+`pc::Name::` (named character) messages against fake Discord objects whose
+webhook send returns immediately, so the time measured is the bot's own work:
+the channel type check, the speaker lookup and building the webhook message.
+Cold runs invalidate repositories.narration_context before every message;
+warm runs answer the speaker from its per-guild cache. A PC is created and set
+active under a random benchmark guild id and removed afterwards.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*).
+
+Run from the project root:
+    python -m benchmarks.narration_latency [--messages 200]
+"""
+import argparse
+import asyncio
+import statistics
+import time
+import uuid
+from data.database import db_manager
+from data.models import ActiveCharacter, Entity
+from data.repositories.repository_factory import repositories
+from commands.narration import process_narration
+
+class FakePermissions:
+    manage_webhooks = True
+
+class FakeWebhook:
+    name = "PlayByPostBotCharacters"
+
+    async def send(self, **kwargs):
+        pass
+
+class FakeGuild:
+    def __init__(self, guild_id: str):
+        self.id = guild_id
+        self.me = object()
+
+class FakeChannel:
+    def __init__(self, guild: FakeGuild):
+        self.id = uuid.uuid4().int >> 64
+        self.guild = guild
+        self.webhook = FakeWebhook()
+
+    def permissions_for(self, member):
+        return FakePermissions()
+
+    async def webhooks(self):
+        return [self.webhook]
+
+    async def send(self, *args, **kwargs):
+        raise AssertionError(f"narration failed: {args}")
+
+class FakeAuthor:
+    def __init__(self, user_id: str):
+        self.id = user_id
+
+class FakeMessage:
+    def __init__(self, channel: FakeChannel, author: FakeAuthor, content: str):
+        self.guild = channel.guild
+        self.channel = channel
+        self.author = author
+        self.content = content
+
+    async def delete(self):
+        pass
+
+async def timed(label: str, message: FakeMessage, messages: int, cold: bool) -> float:
+    samples = []
+    for _ in range(messages):
+        if cold:
+            repositories.narration_context.invalidate()
+        start = time.perf_counter()
+        await process_narration(message)
+        samples.append(time.perf_counter() - start)
+    median = statistics.median(samples)
+    print(f"{label:>24}: {median * 1000:8.2f} ms median, {max(samples) * 1000:8.2f} ms max")
+    return median
+
+async def run(guild_id: str, user_id: str, messages: int):
+    channel = FakeChannel(FakeGuild(guild_id))
+    author = FakeAuthor(user_id)
+    for content in ("pc::The benchmark speaks.", "pc::Benchmark Hero::The benchmark speaks."):
+        message = FakeMessage(channel, author, content)
+        # Warm the webhook cache and connection pool so only the speaker lookup differs
+        await process_narration(message)
+        cold = await timed(f"{content.split('The')[0]} cold", message, messages, cold=True)
+        warm = await timed(f"{content.split('The')[0]} warm", message, messages, cold=False)
+        print(f"{'speedup':>24}: {cold / warm:8.1f}x")
+    print(f"{'resolver cache':>24}: {repositories.narration_context.cache_stats()}")
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--messages', type=int, default=200, help='Messages to narrate per scenario')
+    args = parser.parse_args()
+
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    user_id = str(uuid.uuid4().int >> 64)
+    hero = Entity(
+        id=str(uuid.uuid4()),
+        guild_id=guild_id,
+        name="Benchmark Hero",
+        owner_id=user_id,
+        entity_type='pc',
+        system='generic',
+        system_specific_data={},
+        notes=[],
+        avatar_url='',
+        access_type='public'
+    )
+
+    print(f"{args.messages} messages per scenario, guild {guild_id}")
+    try:
+        repositories.entity.save(hero, conflict_columns=['id'])
+        repositories.active_character.save(
+            ActiveCharacter(guild_id=guild_id, user_id=user_id, char_id=hero.id),
+            conflict_columns=['guild_id', 'user_id']
+        )
+        asyncio.run(run(guild_id, user_id, args.messages))
+    finally:
+        repositories.active_character.delete("guild_id = %s", (guild_id,))
+        repositories.entity.delete("guild_id = %s", (guild_id,))
+        db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,121 @@
+"""
+Roll throughput: regex-per-roll formulas vs. compiled dice expressions
+
+Times RollFormula.roll_formula with a few typical formulas and modifiers against
+the previous implementation, which rebuilt the formula string and re-ran
+uncompiled regular expressions on every roll (kept below as legacy_roll_formula).
+Formulas only the compiled engine understands (keep highest, exploding dice,
+several dice terms) are timed on their own. No database or Discord connection
+is needed.
+
+Run from the project root:
+    python -m benchmarks.roll_throughput [--rolls 100000]
+"""
+import argparse
+import random
+import re
+import time
+from core.dice_expression import compile_cache_info
+from core.roll_formula import RollFormula
+
+def legacy_roll_dice_formula(formula: str):
+    formula = formula.replace(" ", "").lower()
+    match = re.fullmatch(r'(\d*)d(\d+)((?:[+-]\d+)*)', formula)
+    if match:
+        num_dice = int(match.group(1)) if match.group(1) else 1
+        die_size = int(match.group(2))
+        modifier = sum(int(m) for m in re.findall(r'[+-]\d+', match.group(3) or ""))
+        rolls = [random.randint(1, die_size) for _ in range(num_dice)]
+        subtotal = sum(rolls) + modifier
+        return subtotal, f"{formula} [{subtotal}]"
+    try:
+        return int(formula), str(formula)
+    except Exception:
+        return 0, formula
+
+def legacy_roll_formula(modifiers: dict, base_roll: str):
+    """RollFormula.roll_formula before dice expressions were compiled"""
+    modifier_descriptions = []
+    rolled_mods = {}
+    for key, value in modifiers.items():
+        if isinstance(value, str) and re.match(r'^\d*d\d+', value.replace(" ", "")):
+            mod, desc = legacy_roll_dice_formula(value)
+            rolled_mods[key] = mod
+            modifier_descriptions.append(f"{key} ({desc})")
+        else:
+            try:
+                mod = int(value)
+                rolled_mods[key] = mod
+                sign = "+" if mod >= 0 else ""
+                modifier_descriptions.append(f"{key} ({sign}{mod})")
+            except Exception:
+                continue
+
+    formula = base_roll
+    for mod in rolled_mods.values():
+        formula += f"+{mod}" if mod >= 0 else f"{mod}"
+    formula = formula.replace(" ", "").lower()
+
+    fudge_match = re.fullmatch(r'(\d*)d[fF]((?:[+-]\d+)*)', formula)
+    if fudge_match:
+        num_dice = int(fudge_match.group(1)) if fudge_match.group(1) else 4
+        modifier = sum(int(m) for m in re.findall(r'[+-]\d+', fudge_match.group(2) or ""))
+        rolls = [random.choice([-1, 0, 1]) for _ in range(num_dice)]
+        symbols = ['+' if r == 1 else '-' if r == -1 else '0' for r in rolls]
+        total = sum(rolls) + modifier
+        formula_str = f"{base_roll} `{' '.join(symbols)}`"
+    else:
+        match = re.fullmatch(r'(\d*)d(\d+)((?:[+-]\d+)*)', formula)
+        if not match:
+            return "❌ Invalid format.", None
+        num_dice = int(match.group(1)) if match.group(1) else 1
+        die_size = int(match.group(2))
+        modifier = sum(int(m) for m in re.findall(r'[+-]\d+', match.group(3) or ""))
+        rolls = [random.randint(1, die_size) for _ in range(num_dice)]
+        total = sum(rolls) + modifier
+        formula_str = f"{base_roll} [{', '.join(str(r) for r in rolls)}]"
+    if modifier_descriptions:
+        formula_str += " + " + " + ".join(modifier_descriptions)
+    return f'🎲 {formula_str}\n🧮 Total: {total}', total
+
+SCENARIOS = [
+    ("1d20, no modifiers", "1d20", {}),
+    ("1d20 + 2 modifiers", "1d20", {"mod1": "3", "mod2": "-1"}),
+    ("4df + skill", "4df", {"Athletics": 2}),
+    ("2d6 + dice modifier", "2d6", {"mod1": "1d6+1", "mod2": "2"}),
+    ("20d6 pool", "20d6", {}),
+]
+
+COMPILED_ONLY = [
+    ("4d6kh3", "4d6kh3", {}),
+    ("2d6! + 1d4", "2d6!+1d4", {"mod1": "1"}),
+    ("(1d8+2)*2", "(1d8+2)*2", {}),
+]
+
+def rolls_per_second(func, rolls: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rolls):
+        func()
+    return rolls / (time.perf_counter() - start)
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rolls', type=int, default=100000, help='Rolls per scenario')
+    args = parser.parse_args()
+
+    print(f"{'scenario':>24} {'legacy/s':>12} {'compiled/s':>12} {'speedup':>8}")
+    for label, base_roll, modifiers in SCENARIOS:
+        formula = RollFormula(modifiers)
+        legacy = rolls_per_second(lambda: legacy_roll_formula(modifiers, base_roll), args.rolls)
+        compiled = rolls_per_second(lambda: formula.roll_formula(None, base_roll), args.rolls)
+        print(f"{label:>24} {legacy:12,.0f} {compiled:12,.0f} {compiled / legacy:7.1f}x")
+
+    for label, base_roll, modifiers in COMPILED_ONLY:
+        formula = RollFormula(modifiers)
+        compiled = rolls_per_second(lambda: formula.roll_formula(None, base_roll), args.rolls)
+        print(f"{label:>24} {'-':>12} {compiled:12,.0f}")
+
+    print(f"{'parse cache':>24}: {compile_cache_info()}")
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,105 @@
+"""
+Scene NPC lookups: whole-guild scans vs. targeted (guild_id, scene_id) queries
+
+Creates a guild with S scenes holding N NPCs each, then times the old lookups
+(load every scene_npcs row / every scene and character in the guild and filter
+in Python) against get_scene_npc_ids and get_scene_npcs, which filter by
+(guild_id, scene_id) in SQL, join to entities and match scene names through
+idx_scenes_guild_lower_name. Rows are created under a random benchmark guild
+id and removed afterwards.
+
+Needs a database configured the same way as the bot (DATABASE_URL or DB_*).
+
+Run from the project root:
+    python -m benchmarks.scene_npc_lookup [--scenes 300] [--npcs 10] [--rounds 20]
+"""
+import argparse
+import random
+import time
+import uuid
+from data.database import db_manager
+from data.models import Entity, Scene, SceneNPC
+from data.repositories.repository_factory import repositories
+
+def make_npc(guild_id: str, name: str) -> Entity:
+    return Entity(
+        id=str(uuid.uuid4()),
+        guild_id=guild_id,
+        name=name,
+        owner_id='0',
+        entity_type='npc',
+        system='generic',
+        system_specific_data={},
+        notes=[],
+        avatar_url='',
+        access_type='public'
+    )
+
+def timed(label: str, func, rounds: int):
+    start = time.perf_counter()
+    for _ in range(rounds):
+        result = func()
+    elapsed = (time.perf_counter() - start) / rounds
+    print(f"{label:>28}: {elapsed * 1000:9.2f} ms per lookup")
+    return elapsed, result
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--scenes', type=int, default=300, help='Scenes in the guild')
+    parser.add_argument('--npcs', type=int, default=10, help='NPCs in each scene')
+    parser.add_argument('--rounds', type=int, default=20, help='Times to repeat each lookup')
+    args = parser.parse_args()
+
+    guild_id = f"benchmark-{uuid.uuid4()}"
+    scenes = [
+        Scene(guild_id=guild_id, scene_id=str(uuid.uuid4()), name=f"Benchmark Scene {i}",
+              is_active=False, creation_time=time.time() + i, image_url=None)
+        for i in range(args.scenes)
+    ]
+    npcs = []
+    scene_npcs = []
+    for scene in scenes:
+        for i in range(args.npcs):
+            npc = make_npc(guild_id, f"{scene.name} NPC {i}")
+            npcs.append(npc)
+            scene_npcs.append(SceneNPC(guild_id=guild_id, scene_id=scene.scene_id, npc_id=npc.id))
+    target = random.choice(scenes)
+
+    print(f"{args.scenes} scenes x {args.npcs} NPCs, guild {guild_id}")
+    try:
+        repositories.scene.save_many(scenes, conflict_columns=['guild_id', 'scene_id'])
+        repositories.entity.save_many(npcs, conflict_columns=['id'])
+        repositories.scene_npc.save_many(scene_npcs, conflict_columns=['guild_id', 'scene_id', 'npc_id'])
+
+        def scan_ids():
+            rows = repositories.scene_npc.find_all_by_column('guild_id', guild_id)
+            return {row.npc_id for row in rows if row.scene_id == target.scene_id}
+
+        def scan_npcs():
+            all_scenes = repositories.scene.find_all_by_column('guild_id', guild_id)
+            scene = next(s for s in all_scenes if s.name.lower() == target.name.upper().lower())
+            npc_ids = [sn.npc_id for sn in repositories.scene_npc.find_all_by_column('scene_id', scene.scene_id)]
+            all_chars = repositories.character.find_all_by_column('guild_id', guild_id)
+            return {c.id for c in all_chars if c.is_npc and c.id in npc_ids}
+
+        slow, expected = timed('scan scene_npcs', scan_ids, args.rounds)
+        fast, result = timed('get_scene_npc_ids', lambda: set(
+            repositories.scene_npc.get_scene_npc_ids(guild_id, target.scene_id)
+        ), args.rounds)
+        assert result == expected
+        print(f"{'speedup':>28}: {slow / fast:9.1f}x")
+
+        slow, expected = timed('scan scenes and characters', scan_npcs, args.rounds)
+        fast, result = timed('get_scene_npcs by name', lambda: {
+            c.id for c in repositories.scene_npc.get_scene_npcs(guild_id, target.name.upper())
+        }, args.rounds)
+        assert result == expected
+        print(f"{'speedup':>28}: {slow / fast:9.1f}x")
+    finally:
+        repositories.scene_npc.delete("guild_id = %s", (guild_id,))
+        repositories.entity.delete("guild_id = %s", (guild_id,))
+        repositories.scene.delete("guild_id = %s", (guild_id,))
+        db_manager.close_pool()
+
+if __name__ == '__main__':
+    main()
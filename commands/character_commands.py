@@ -8,115 +8,80 @@ from data.repositories.repository_factory import repositories
 import core.factories as factories
 import json
 
+CHARACTER_TYPES = (EntityType.PC.value, EntityType.NPC.value, EntityType.COMPANION.value)
+
+def _user_can_see_character(index, entry, user_id: str, is_gm: bool) -> bool:
+    """Whether a name index entry shows up in a user's character autocompletes"""
+    if entry.entity_type == EntityType.NPC.value:
+        # GMs can see all NPCs
+        return is_gm
+    if entry.entity_type == EntityType.PC.value:
+        # Users can see their own PCs, GMs can see all PCs
+        return is_gm or entry.owner_id == user_id
+    if entry.entity_type == EntityType.COMPANION.value:
+        # Users can see companions they own or that are controlled by their characters
+        return is_gm or entry.owner_id == user_id or index.is_controlled_by_user(entry, user_id)
+    return False
+
 async def pc_switch_name_autocomplete(interaction: discord.Interaction, current: str):
-    all_chars = repositories.character.get_all_by_guild(interaction.guild.id)
-    pcs = [
-        c for c in all_chars
-        if not c.is_npc and str(c.owner_id) == str(interaction.user.id)
-    ]
-    options = [c.name for c in pcs if current.lower() in c.name.lower()]
-    return [app_commands.Choice(name=name, value=name) for name in options[:25]]
+    index = await repositories.name_index.get_async(interaction.guild.id)
+    user_id = str(interaction.user.id)
+    pcs = index.search(current, entity_types=[EntityType.PC.value], predicate=lambda e: e.owner_id == user_id)
+    return [app_commands.Choice(name=e.name, value=e.name) for e in pcs]
 
 async def pc_name_gm_autocomplete(interaction: discord.Interaction, current: str):
-    all_chars = repositories.character.get_all_by_guild(interaction.guild.id)
-    pcs = [c for c in all_chars if not c.is_npc]
-    options = [c.name for c in pcs if current.lower() in c.name.lower()]
-    return [app_commands.Choice(name=name, value=name) for name in options[:25]]
+    index = await repositories.name_index.get_async(interaction.guild.id)
+    pcs = index.search(current, entity_types=[EntityType.PC.value])
+    return [app_commands.Choice(name=e.name, value=e.name) for e in pcs]
 
 async def character_or_npc_autocomplete(interaction: discord.Interaction, current: str):
     """Autocomplete for commands that can target PCs, NPCs, and companions"""
-    all_chars = repositories.character.get_all_by_guild(interaction.guild.id)
+    index = await repositories.name_index.get_async(interaction.guild.id)
     
     # Check if user is GM
     is_gm = await repositories.server.has_gm_permission(interaction.guild.id, interaction.user)
+    user_id = str(interaction.user.id)
     
-    # Filter characters based on permissions
-    options = []
-    for c in all_chars:
-        if c.entity_type == EntityType.NPC and is_gm:
-            # GMs can see all NPCs
-            options.append(c.name)
-        elif c.entity_type == EntityType.PC and (str(c.owner_id) == str(interaction.user.id) or is_gm):
-            # Users can see their own PCs, GMs can see all PCs
-            options.append(c.name)
-        elif c.entity_type == EntityType.COMPANION:
-            # Users can see companions they own or that are controlled by their characters
-            if str(c.owner_id) == str(interaction.user.id) or is_gm:
-                options.append(c.name)
-            else:
-                # Check if user owns any characters that control this companion
-                controlling_chars = repositories.link.get_parents(
-                    str(interaction.guild.id),
-                    c.id,
-                    EntityLinkType.CONTROLS.value
-                )
-                
-                user_controls_companion = any(
-                    str(controller.owner_id) == str(interaction.user.id) 
-                    for controller in controlling_chars
-                )
-                
-                if user_controls_companion:
-                    options.append(c.name)
-    
-    # Filter by current input
-    filtered_options = [name for name in options if current.lower() in name.lower()]
-    return [app_commands.Choice(name=name, value=name) for name in filtered_options[:25]]
+    # Filter characters by input and permissions
+    options = index.search(
+        current,
+        entity_types=CHARACTER_TYPES,
+        predicate=lambda e: _user_can_see_character(index, e, user_id, is_gm)
+    )
+    return [app_commands.Choice(name=e.name, value=e.name) for e in options]
 
 async def companion_autocomplete(interaction: discord.Interaction, current: str):
     """Autocomplete specifically for companion entities"""
-    all_chars = repositories.character.get_all_by_guild(interaction.guild.id)
+    index = await repositories.name_index.get_async(interaction.guild.id)
     
     # Check if user is GM
     is_gm = await repositories.server.has_gm_permission(interaction.guild.id, interaction.user)
+    user_id = str(interaction.user.id)
     
-    # Filter for companions only
-    options = []
-    for c in all_chars:
-        if c.entity_type == EntityType.COMPANION:
-            # Users can see companions they own or that are controlled by their characters
-            if str(c.owner_id) == str(interaction.user.id) or is_gm:
-                options.append(c.name)
-            else:
-                # Check if user owns any characters that control this companion
-                controlling_chars = repositories.link.get_parents(
-                    str(interaction.guild.id),
-                    c.id,
-                    EntityLinkType.CONTROLS.value
-                )
-                
-                user_controls_companion = any(
-                    str(controller.owner_id) == str(interaction.user.id) 
-                    for controller in controlling_chars
-                )
-                
-                if user_controls_companion:
-                    options.append(c.name)
-    
-    # Filter by current input
-    filtered_options = [name for name in options if current.lower() in name.lower()]
-    return [app_commands.Choice(name=name, value=name) for name in filtered_options[:25]]
+    # Filter for companions by input and permissions
+    options = index.search(
+        current,
+        entity_types=[EntityType.COMPANION.value],
+        predicate=lambda e: _user_can_see_character(index, e, user_id, is_gm)
+    )
+    return [app_commands.Choice(name=e.name, value=e.name) for e in options]
 
 async def owner_characters_autocomplete(interaction: discord.Interaction, current: str):
     """Autocomplete for entities that can own other entities"""
     is_gm = await repositories.server.has_gm_permission(str(interaction.guild.id), interaction.user)
+    index = await repositories.name_index.get_async(interaction.guild.id)
+    user_id = str(interaction.user.id)
     
     if is_gm:
-        # GMs can see all entities as potential owners
-        characters = repositories.character.get_all_by_guild(str(interaction.guild.id))
+        # GMs can see all characters, companions included, as potential owners
+        characters = index.search(current, entity_types=CHARACTER_TYPES)
     else:
-        # Users can only use their own entities as owners
-        characters = repositories.character.get_user_characters(str(interaction.guild.id), str(interaction.user.id))
-    
-    # Filter by current input
-    filtered_entities = [
-        char for char in characters 
-        if current.lower() in char.name.lower()
-    ]
+        # Users can only use their own characters and companions as owners
+        characters = index.search(current, entity_types=CHARACTER_TYPES, predicate=lambda e: e.owner_id == user_id)
     
     return [
-        app_commands.Choice(name=f"{char.name} ({char.entity_type.value})", value=char.name)
-        for char in filtered_entities[:25]
+        app_commands.Choice(name=f"{char.name} ({char.entity_type})", value=char.name)
+        for char in characters
     ]
 
 async def multi_character_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
@@ -127,42 +92,18 @@ async def multi_character_autocomplete(interaction: discord.Interaction, current
     already_selected = [part.strip() for part in parts[:-1]] if len(parts) > 1 else []
     
     # Get available characters (excluding already selected)
-    all_chars = repositories.character.get_all_by_guild(str(interaction.guild.id))
+    index = await repositories.name_index.get_async(str(interaction.guild.id))
     is_gm = await repositories.server.has_gm_permission(str(interaction.guild.id), interaction.user)
+    user_id = str(interaction.user.id)
     
-    available_chars = []
-    for char in all_chars:
-        # Skip if already selected
-        if char.name in already_selected:
-            continue
-            
-        # Check if current typing matches
-        if current_typing and current_typing.lower() not in char.name.lower():
-            continue
-            
-        # Check permissions
-        if char.entity_type == EntityType.NPC and is_gm:
-            available_chars.append(char.name)
-        elif char.entity_type == EntityType.PC and (str(char.owner_id) == str(interaction.user.id) or is_gm):
-            available_chars.append(char.name)
-        elif char.entity_type == EntityType.COMPANION:
-            if str(char.owner_id) == str(interaction.user.id) or is_gm:
-                available_chars.append(char.name)
-            else:
-                # Check if user owns any characters that control this companion
-                controlling_chars = repositories.link.get_parents(
-                    str(interaction.guild.id),
-                    char.id,
-                    EntityLinkType.CONTROLS.value
-                )
-                
-                user_controls_companion = any(
-                    str(controller.owner_id) == str(interaction.user.id) 
-                    for controller in controlling_chars
-                )
-                
-                if user_controls_companion:
-                    available_chars.append(char.name)
+    available_chars = [
+        e.name for e in index.search(
+            current_typing,
+            entity_types=CHARACTER_TYPES,
+            predicate=lambda e: e.name not in already_selected and _user_can_see_character(index, e, user_id, is_gm),
+            limit=24  # Leave room for summary if needed
+        )
+    ]
     
     # Build the choice values (preserve what's already typed + add new selection)
     prefix = ', '.join(already_selected)
@@ -434,18 +375,11 @@ class CharacterCommands(commands.Cog):
             # Companions can be viewed by their owner or by the owner of characters that control them
             if str(character.owner_id) != str(interaction.user.id) and not is_gm:
                 # Check if user owns any characters that control this companion
-                controlling_chars = repositories.link.get_parents(
+                if not repositories.link.user_controls_entity(
                     str(interaction.guild.id),
-                    character.id,
-                    EntityLinkType.CONTROLS.value
-                )
-                
-                user_controls_companion = any(
-                    str(controller.owner_id) == str(interaction.user.id) 
-                    for controller in controlling_chars
-                )
-                
-                if not user_controls_companion:
+                    str(interaction.user.id),
+                    character.id
+                ):
                     await interaction.response.send_message(
                         "❌ You can only view companions you own or that are controlled by your characters.", 
                         ephemeral=True
@@ -893,24 +827,25 @@ class ConfirmDeleteCharacterView(discord.ui.View):
 
     @discord.ui.button(label="Delete", style=discord.ButtonStyle.danger)
     async def confirm_delete(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.transfer_inventory:
-            # Remove all POSSESSES links for this character
-            possessed_entities = repositories.link.get_children(
-                str(interaction.guild.id),
-                self.character.id,
-                EntityLinkType.POSSESSES.value
-            )
-            
-            for entity in possessed_entities:
-                repositories.link.delete_links_by_entities(
+        with repositories.transaction():
+            if self.transfer_inventory:
+                # Remove all POSSESSES links for this character
+                possessed_entities = repositories.link.get_children(
                     str(interaction.guild.id),
                     self.character.id,
-                    entity.id,
                     EntityLinkType.POSSESSES.value
                 )
+            
+                for entity in possessed_entities:
+                    repositories.link.delete_links_by_entities(
+                        str(interaction.guild.id),
+                        self.character.id,
+                        entity.id,
+                        EntityLinkType.POSSESSES.value
+                    )
         
-        # Delete the character (this will also delete all remaining links)
-        repositories.character.delete_character(interaction.guild.id, self.character.id)
+            # Delete the character (this will also delete all remaining links)
+            repositories.character.delete_character(interaction.guild.id, self.character.id)
         
         delete_msg = f"✅ Deleted character **{self.character.name}**."
         if self.transfer_inventory:
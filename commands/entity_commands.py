@@ -8,6 +8,9 @@ from core.base_models import AccessType, BaseEntity, EntityType, EntityLinkType
 from data.repositories.repository_factory import repositories
 import core.factories as factories
 
+# Entities /entity list shows per page; more would not fit in the embed anyway
+ENTITY_LIST_PAGE_SIZE = 50
+
 # Autocomplete functions
 async def entity_type_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
     """Autocomplete for entity types based on current system"""
@@ -263,83 +266,37 @@ class EntityCommands(commands.Cog):
             )
             title = f"Entities possessed by {owner.name}"
         else:
-            # Get accessible entities for this user
-            entities = repositories.entity.get_all_accessible(
+            # Get accessible top-level entities (not possessed by another entity) in one query
+            entities = repositories.entity.get_top_level_accessible(
                 str(interaction.guild.id), 
                 str(interaction.user.id), 
-                is_gm
+                is_gm,
+                entity_type=entity_type,
+                limit=ENTITY_LIST_PAGE_SIZE + 1
             )
-            
-            # Filter to only entities that are not owned by other entities
-            top_level_entities = []
-            for entity in entities:
-                owners = repositories.link.get_parents(
-                    str(interaction.guild.id), 
-                    entity.id, 
-                    EntityLinkType.POSSESSES.value
-                )
-                if not owners:  # No owners = top-level
-                    top_level_entities.append(entity)
-            
-            entities = top_level_entities
             title = "Accessible top-level entities"
             
             if entity_type:
-                # Apply entity type filter
-                entities = [e for e in entities if e.entity_type.value == entity_type]
                 title += f" ({entity_type})"
         
         if not entities:
             await interaction.followup.send("No entities found.", ephemeral=True)
             return
         
-        # Create embed
-        embed = discord.Embed(title=title, color=discord.Color.blue())
-        embed.set_footer(text="🌐 = Public, 🔒 = GM Only")
-        
-        # Group by entity type for display
-        by_type = {}
-        for entity in entities:
-            type_name = entity.entity_type.value
-            if type_name not in by_type:
-                by_type[type_name] = []
-            by_type[type_name].append(entity)
-        
-        # Add fields for each type
-        for type_name, type_entities in by_type.items():
-            entity_list = []
-            for entity in type_entities:
-                # Always show access level indicator
-                access_indicator = "🔒" if entity.access_type == AccessType.GM_ONLY else "🌐"
-                entry = f"• {entity.name} {access_indicator}"
-                
-                if show_details:
-                    # Add ownership info for GMs or for user's own entities
-                    if is_gm and entity.owner_id:
-                        entry += f" (owned by <@{entity.owner_id}>)"
-                    elif not is_gm and entity.entity_type == EntityType.PC and entity.owner_id == str(interaction.user.id):
-                        entry += " (your PC)"
-                
-                # Show possessed entities count if any
-                possessed_entities = repositories.link.get_children(
-                    str(interaction.guild.id), 
-                    entity.id, 
-                    EntityLinkType.POSSESSES.value
-                )
-                if possessed_entities:
-                    entry += f" ({len(possessed_entities)} possessed)"
-                
-                entity_list.append(entry)
-            
-            field_value = "\n".join(entity_list)[:1024]  # Discord field limit
-            
-            embed.add_field(
-                name=f"{type_name.title()} ({len(type_entities)})",
-                value=field_value,
-                inline=False
-            )
+        view = None
+        if len(entities) > ENTITY_LIST_PAGE_SIZE:
+            entities = entities[:ENTITY_LIST_PAGE_SIZE]
+            if owner_entity and owner_entity.strip():
+                footer_note = f"Showing the first {ENTITY_LIST_PAGE_SIZE}"
+            else:
+                # Top-level lists page through the rest with a keyset cursor
+                view = EntityListPageView(title, is_gm, entity_type, show_details, entities[-1], page=1)
+                footer_note = "Page 1"
+        else:
+            footer_note = None
         
-        await interaction.followup.send(embed=embed, ephemeral=True)
+        embed = build_entity_list_embed(interaction, title, entities, is_gm, show_details, footer_note)
+        await interaction.followup.send(embed=embed, view=view, ephemeral=True)
 
     @entity_group.command(name="view", description="View entity details with edit interface")
     @app_commands.describe(
@@ -408,7 +365,9 @@ class EntityCommands(commands.Cog):
             return
         
         # Perform rename
-        repositories.entity.rename_entity(entity.id, new_name)
+        if not repositories.entity.rename_entity(str(interaction.guild.id), entity.id, new_name):
+            await interaction.response.send_message(f"❌ Failed to rename `{entity_name}`.", ephemeral=True)
+            return
         
         await interaction.response.send_message(
             f"✅ Renamed `{entity_name}` to `{new_name}`.",
@@ -559,47 +518,18 @@ class EntityCommands(commands.Cog):
             await interaction.followup.send(f"❌ Invalid access type. Must be 'public' or 'gm_only'.", ephemeral=True)
             return
         
-        # Get all possessed entities recursively
-        def get_all_possessed_recursively(entity_id: str, visited: set = None) -> List[BaseEntity]:
-            """Recursively get all possessed entities to avoid infinite loops"""
-            if visited is None:
-                visited = set()
-            
-            if entity_id in visited:
-                return []
-            
-            visited.add(entity_id)
-            possessed = repositories.link.get_children(
-                str(interaction.guild.id), 
-                entity_id, 
-                EntityLinkType.POSSESSES.value
-            )
-            
-            all_possessed = possessed.copy()
-            for child in possessed:
-                all_possessed.extend(get_all_possessed_recursively(child.id, visited))
-            
-            return all_possessed
-        
-        # Set access for the main entity
-        entity.set_access_type(new_access_type)
-        system = repositories.server.get_system(str(interaction.guild.id))
-        repositories.entity.upsert_entity(str(interaction.guild.id), entity, system=system)
-        
-        # Get all possessed entities
-        all_possessed = get_all_possessed_recursively(entity.id)
+        # Set access for the entity and everything it possesses, however deeply nested
+        all_possessed = repositories.entity.set_access_type_recursive(
+            str(interaction.guild.id),
+            entity.id,
+            new_access_type
+        )
         
-        # Set access for all possessed entities
-        updated_count = 1  # Count the main entity
         failed_updates = []
-        
-        for possessed_entity in all_possessed:
-            try:
-                possessed_entity.set_access_type(new_access_type)
-                repositories.entity.upsert_entity(str(interaction.guild.id), possessed_entity, system=system)
-                updated_count += 1
-            except Exception as e:
-                failed_updates.append(f"{possessed_entity.name}: {str(e)}")
+        if all_possessed is None:
+            all_possessed = []
+            failed_updates = [f"{entity.name}: database error"]
+        updated_count = 0 if failed_updates else 1 + len(all_possessed)  # Count the main entity
         
         # Create response message
         access_display = "Public" if new_access_type.value == "public" else "GM Only"
@@ -611,10 +541,10 @@ class EntityCommands(commands.Cog):
             # Group possessed entities by type for display
             by_type = {}
             for possessed in all_possessed:
-                type_name = possessed.entity_type.value
+                type_name = possessed['entity_type']
                 if type_name not in by_type:
                     by_type[type_name] = []
-                by_type[type_name].append(possessed.name)
+                by_type[type_name].append(possessed['name'])
             
             type_summary = []
             for type_name, names in by_type.items():
@@ -660,6 +590,96 @@ class EntityCommands(commands.Cog):
         
         await interaction.followup.send(embed=embed, ephemeral=True)
 
+def build_entity_list_embed(interaction: discord.Interaction, title: str, entities: List[BaseEntity],
+                            is_gm: bool, show_details: bool, footer_note: str = None) -> discord.Embed:
+    """Embed for one page of /entity list, grouped by entity type"""
+    # Count possessed entities for everything listed in one query
+    possessed_counts = repositories.link.count_children(
+        str(interaction.guild.id),
+        [entity.id for entity in entities],
+        EntityLinkType.POSSESSES.value
+    )
+
+    # Create embed
+    embed = discord.Embed(title=title, color=discord.Color.blue())
+    footer = "🌐 = Public, 🔒 = GM Only"
+    if footer_note:
+        footer += f" • {footer_note}"
+    embed.set_footer(text=footer)
+
+    # Group by entity type for display
+    by_type = {}
+    for entity in entities:
+        type_name = entity.entity_type.value
+        if type_name not in by_type:
+            by_type[type_name] = []
+        by_type[type_name].append(entity)
+
+    # Add fields for each type
+    for type_name, type_entities in by_type.items():
+        entity_list = []
+        for entity in type_entities:
+            # Always show access level indicator
+            access_indicator = "🔒" if entity.access_type == AccessType.GM_ONLY else "🌐"
+            entry = f"• {entity.name} {access_indicator}"
+
+            if show_details:
+                # Add ownership info for GMs or for user's own entities
+                if is_gm and entity.owner_id:
+                    entry += f" (owned by <@{entity.owner_id}>)"
+                elif not is_gm and entity.entity_type == EntityType.PC and entity.owner_id == str(interaction.user.id):
+                    entry += " (your PC)"
+
+            # Show possessed entities count if any
+            possessed_count = possessed_counts.get(entity.id, 0)
+            if possessed_count:
+                entry += f" ({possessed_count} possessed)"
+
+            entity_list.append(entry)
+
+        field_value = "\n".join(entity_list)[:1024]  # Discord field limit
+
+        embed.add_field(
+            name=f"{type_name.title()} ({len(type_entities)})",
+            value=field_value,
+            inline=False
+        )
+
+    return embed
+
+class EntityListPageView(discord.ui.View):
+    """Next page button for /entity list, continuing after the last entity shown"""
+    def __init__(self, title: str, is_gm: bool, entity_type: Optional[str], show_details: bool, last_entity: BaseEntity, page: int):
+        super().__init__(timeout=300)
+        self.title = title
+        self.is_gm = is_gm
+        self.entity_type = entity_type
+        self.show_details = show_details
+        self.after = (last_entity.name, last_entity.id)
+        self.page = page
+
+    @discord.ui.button(label="Next page", style=discord.ButtonStyle.secondary)
+    async def next_page(self, interaction: discord.Interaction, button: discord.ui.Button):
+        entities = await repositories.aio.entity.get_top_level_accessible(
+            str(interaction.guild.id),
+            str(interaction.user.id),
+            self.is_gm,
+            entity_type=self.entity_type,
+            after=self.after,
+            limit=ENTITY_LIST_PAGE_SIZE + 1
+        )
+        if not entities:
+            await interaction.response.edit_message(content="No more entities.", embed=None, view=None)
+            return
+        
+        page = self.page + 1
+        view = None
+        if len(entities) > ENTITY_LIST_PAGE_SIZE:
+            entities = entities[:ENTITY_LIST_PAGE_SIZE]
+            view = EntityListPageView(self.title, self.is_gm, self.entity_type, self.show_details, entities[-1], page)
+        embed = build_entity_list_embed(interaction, self.title, entities, self.is_gm, self.show_details, f"Page {page}")
+        await interaction.response.edit_message(embed=embed, view=view)
+
 class ConfirmDeleteAllView(discord.ui.View):
     """Confirmation view for bulk entity deletion"""
     def __init__(self, entities_to_delete: List[BaseEntity], entity_type: str = None):
@@ -672,16 +692,15 @@ class ConfirmDeleteAllView(discord.ui.View):
         """Execute the bulk deletion"""
         await interaction.response.defer()
         
-        deleted_count = 0
         failed_deletions = []
         
-        # Delete each entity
-        for entity in self.entities_to_delete:
-            try:
-                repositories.entity.delete_entity(str(interaction.guild.id), entity.id)
-                deleted_count += 1
-            except Exception as e:
-                failed_deletions.append(f"{entity.name}: {str(e)}")
+        # Delete all entities in one statement
+        deleted_count = repositories.entity.delete_entities(
+            str(interaction.guild.id),
+            [entity.id for entity in self.entities_to_delete]
+        )
+        if deleted_count < len(self.entities_to_delete):
+            failed_deletions.append(f"{len(self.entities_to_delete) - deleted_count} entities could not be deleted")
         
         # Create result message
         filter_text = f" of type '{self.entity_type}'" if self.entity_type else ""
@@ -741,24 +760,25 @@ class ConfirmDeleteEntityView(discord.ui.View):
 
     @discord.ui.button(label="Delete", style=discord.ButtonStyle.danger)
     async def confirm_delete(self, interaction: discord.Interaction, button: discord.ui.Button):
-        if self.transfer_inventory:
-            # Remove all POSSESSES links for this entity
-            possessed_entities = repositories.link.get_children(
-                str(interaction.guild.id),
-                self.entity.id,
-                EntityLinkType.POSSESSES.value
-            )
-            
-            for possessed_entity in possessed_entities:
-                repositories.link.delete_links_by_entities(
+        with repositories.transaction():
+            if self.transfer_inventory:
+                # Remove all POSSESSES links for this entity
+                possessed_entities = repositories.link.get_children(
                     str(interaction.guild.id),
                     self.entity.id,
-                    possessed_entity.id,
                     EntityLinkType.POSSESSES.value
                 )
-        
-        # Delete the entity (this will also delete all remaining links)
-        repositories.entity.delete_entity(str(interaction.guild.id), self.entity.id)
+            
+                for possessed_entity in possessed_entities:
+                    repositories.link.delete_links_by_entities(
+                        str(interaction.guild.id),
+                        self.entity.id,
+                        possessed_entity.id,
+                        EntityLinkType.POSSESSES.value
+                    )
+        
+            # Delete the entity (this will also delete all remaining links)
+            repositories.entity.delete_entity(str(interaction.guild.id), self.entity.id)
         
         delete_msg = f"✅ Deleted entity `{self.entity.name}`."
         if self.transfer_inventory:
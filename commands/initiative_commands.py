@@ -4,6 +4,7 @@ from discord import app_commands
 from typing import List
 from core.base_models import EntityType
 from core.initiative_types import InitiativeParticipant
+from core.message_editor import message_handle
 from data.repositories.repository_factory import repositories
 import core.factories as factories
 
@@ -92,7 +93,7 @@ class InitiativeCommands(commands.Cog):
             message_id = repositories.initiative.get_initiative_message_id(str(guild_id), str(channel_id))
             if message_id:
                 try:
-                    message = await interaction.channel.fetch_message(int(message_id))
+                    message = message_handle(interaction.channel, message_id)
                     await message.delete()
                 except (discord.NotFound, discord.Forbidden, discord.HTTPException):
                     pass  # Ignore if we can't find or delete the message
@@ -111,7 +112,7 @@ class InitiativeCommands(commands.Cog):
         all_chars = repositories.character.get_all_by_guild(str(guild_id))
         non_gm_pcs = [c for c in all_chars if not c.is_npc and not repositories.server.has_gm_permission(str(guild_id), c.owner_id)]
         scene = repositories.scene.get_active_scene(str(guild_id))
-        npcs = repositories.scene_npc.get_scene_npcs(str(guild_id), scene.name)
+        npcs = repositories.scene_npc.get_scene_npcs(str(guild_id), scene_id=scene.scene_id) if scene else []
         participants = [
             InitiativeParticipant(
                 id=str(c.id),
@@ -150,7 +151,7 @@ class InitiativeCommands(commands.Cog):
         message_id = repositories.initiative.get_initiative_message_id(str(guild_id), str(channel_id))
         if message_id:
             try:
-                message = await interaction.channel.fetch_message(int(message_id))
+                message = message_handle(interaction.channel, message_id)
                 await message.delete()
             except (discord.NotFound, discord.Forbidden, discord.HTTPException):
                 pass  # Ignore if we can't find or delete the message
@@ -2,6 +2,7 @@ import re
 import discord
 from core.base_models import BaseCharacter, BaseEntity, EntityType, SystemType
 import core.factories as factories
+from core.webhook_cache import character_webhooks
 from data.repositories.repository_factory import repositories
 
 async def process_narration(message: discord.Message):
@@ -10,7 +11,7 @@ async def process_narration(message: discord.Message):
         return  # Only process in guild channels
     
     # Check channel restrictions for narration
-    channel_type = repositories.channel_permissions.get_channel_type(
+    channel_type = await repositories.channel_permissions.get_channel_type_async(
         str(message.guild.id), 
         str(message.channel.id)
     )
@@ -54,7 +55,7 @@ async def process_narration(message: discord.Message):
             speech_content = match.group(2).strip()
             
             # Try to find the named character
-            character = repositories.character.get_character_by_name(guild_id, character_name)
+            character = await repositories.narration_context.get_character_by_name(guild_id, character_name)
             
             if not character:
                 await message.channel.send(f"❌ Character '{character_name}' not found.", delete_after=10)
@@ -77,7 +78,7 @@ async def process_narration(message: discord.Message):
             
         else:
             # Standard format: pc::message (use active character)
-            character = repositories.active_character.get_active_character(guild_id, user_id)
+            character = await repositories.narration_context.get_active_character(guild_id, user_id)
             if not character:
                 await message.channel.send("❌ You don't have an active character set. Use `/character switch` first or specify a character name with `pc::Character Name::message`.", delete_after=10)
                 try:
@@ -124,7 +125,7 @@ async def process_narration(message: discord.Message):
             alias = None
         
         # Find the NPC
-        character = repositories.character.get_character_by_name(guild_id, npc_name)
+        character = await repositories.narration_context.get_character_by_name(guild_id, npc_name)
         
         # Handle case where NPC doesn't exist - create a temporary character object
         if not character:
@@ -167,16 +168,7 @@ async def can_user_speak_as_character(guild_id: int, user_id: int, character: Ba
     
     # If it's a companion, check if user owns any characters that control this companion
     if character.entity_type == EntityType.COMPANION:
-        from core.base_models import EntityLinkType
-        controlling_chars = repositories.link.get_parents(
-            str(guild_id),
-            character.id,
-            EntityLinkType.CONTROLS.value
-        )
-        
-        for controller in controlling_chars:
-            if str(controller.owner_id) == str(user_id):
-                return True
+        return await repositories.aio.link.user_controls_entity(str(guild_id), str(user_id), character.id)
     
     return False
 
@@ -216,8 +208,6 @@ async def send_character_webhook(channel: discord.TextChannel, character: BaseCh
     # Determine display name (use alias if provided)
     display_name = alias if alias else character.name
     
-    # Get or create the first webhook with the name "PlayByPostBotCharacters"
-    webhook = next((wh for wh in await channel.webhooks() if wh.name == "PlayByPostBotCharacters"), None) or await channel.create_webhook(name="PlayByPostBotCharacters")
     embed = discord.Embed(
         description=content,
         color=get_character_color(character)
@@ -232,7 +222,7 @@ async def send_character_webhook(channel: discord.TextChannel, character: BaseCh
 
     if character.avatar_url:
         embed.set_thumbnail(url=character.avatar_url)
-        await webhook.send(
+        send_kwargs = dict(
             embeds=[embed],
             username=display_name,
             avatar_url=character.avatar_url,
@@ -242,13 +232,23 @@ async def send_character_webhook(channel: discord.TextChannel, character: BaseCh
         # Use a default avatar if character has no avatar
         #url=get_default_avatar(character)
         #embed.set_thumbnail(url=url)
-        await webhook.send(
+        send_kwargs = dict(
             embeds=[embed],
             username=display_name,
             #avatar_url=url,
             allowed_mentions=allowed_mentions
         )
 
+    # Get or create the "PlayByPostBotCharacters" webhook, cached per channel
+    webhook = await character_webhooks.get(channel)
+    try:
+        await webhook.send(**send_kwargs)
+    except discord.NotFound:
+        # The cached webhook was deleted; look it up again (recreating it if needed) and retry once
+        character_webhooks.invalidate(channel.id)
+        webhook = await character_webhooks.get(channel)
+        await webhook.send(**send_kwargs)
+
 def get_character_color(character):
     """Return a color for the character based on system and character type."""
     if character.entity_type == EntityType.NPC:
@@ -1,9 +1,15 @@
-from typing import List
+import asyncio
+from typing import List, Tuple
 import discord
 from discord.ext import commands
 from discord import app_commands
 from commands.character_commands import multi_character_autocomplete
+from commands.scene_commands import scene_name_autocomplete
+from core.base_models import SystemType
+from core.batch_roll import compile_batch_dice, roll_totals
+from core.dice_expression import DiceSyntaxError, normalize
 from core.roll_formula import RollFormula
+from core.roll_odds import OddsError, dice_distribution
 from core.shared_views import RequestRollView
 import core.factories as factories
 from data.repositories.repository_factory import repositories
@@ -12,7 +18,7 @@ from rpg_systems.mgt2e.mgt2e_character import MGT2ECharacter
 
 async def roll_parameters_autocomplete(interaction: discord.Interaction, current: str) -> List[app_commands.Choice[str]]:
     """Provide helpful autocomplete for roll parameters based on the system"""
-    system = repositories.server.get_system(str(interaction.guild.id))
+    system = await repositories.aio.server.get_system(str(interaction.guild.id))
     
     choices = []
     
@@ -31,6 +37,25 @@ async def roll_parameters_autocomplete(interaction: discord.Interaction, current
     
     return choices[:25]  # Discord limit
 
+def build_batch_roll_embed(title: str, results: List[Tuple[str, int]], difficulty: int = None) -> discord.Embed:
+    """One line per roller, highest total first, with a summary footer"""
+    results = sorted(results, key=lambda result: result[1], reverse=True)
+    lines = []
+    for name, total in results:
+        mark = "" if difficulty is None else (" ✅" if total >= difficulty else " ❌")
+        lines.append(f"`{total:>4}` {name}{mark}")
+    description = "\n".join(lines)
+    if len(description) > 4000:
+        description = description[:4000].rsplit("\n", 1)[0] + "\n…"
+
+    totals = [total for _, total in results]
+    footer = f"{len(totals)} rolls · high {max(totals)} · low {min(totals)} · average {sum(totals) / len(totals):.1f}"
+    if difficulty is not None:
+        footer += f" · {sum(total >= difficulty for total in totals)} of {len(totals)} reached {difficulty}"
+    embed = discord.Embed(title=title, description=description, color=discord.Color.orange())
+    embed.set_footer(text=footer)
+    return embed
+
 async def _get_fate_roll_parameter_choices(guild_id: str, current: str, parts: List[str], current_typing: str) -> List[app_commands.Choice[str]]:
     """Get Fate-specific roll parameter choices"""
     choices = []
@@ -70,7 +95,7 @@ async def _get_fate_roll_parameter_choices(guild_id: str, current: str, parts: L
         skill_part = current_typing[6:]  # Remove "skill:" prefix
         
         # Get default skills for this guild/system
-        default_skills = repositories.default_skills.get_default_skills(guild_id, SystemType.FATE)
+        default_skills = await repositories.aio.default_skills.get_default_skills(guild_id, SystemType.FATE)
         if not default_skills:
             default_skills = FateCharacter.DEFAULT_SKILLS
         
@@ -168,7 +193,7 @@ async def _get_mgt2e_roll_parameter_choices(guild_id: str, current: str, parts:
         skill_part = current_typing[6:]  # Remove "skill:" prefix
         
         # Get default skills for this guild/system
-        default_skills = repositories.default_skills.get_default_skills(guild_id, SystemType.MGT2E)
+        default_skills = await repositories.aio.default_skills.get_default_skills(guild_id, SystemType.MGT2E)
         if not default_skills:
             default_skills = MGT2ECharacter.DEFAULT_SKILLS
         
@@ -277,12 +302,12 @@ class RollCommands(commands.Cog):
     )
     @app_commands.autocomplete(roll_parameters=roll_parameters_autocomplete)
     async def roll_check(self, interaction: discord.Interaction, roll_parameters: str = None, difficulty: int = None):
-        character = repositories.active_character.get_active_character(str(interaction.guild.id), str(interaction.user.id))
+        character = await repositories.aio.active_character.get_active_character(str(interaction.guild.id), str(interaction.user.id))
         if not character:
             await interaction.response.send_message("❌ No active character set or character not found.", ephemeral=True)
             return
         
-        system = repositories.server.get_system(str(interaction.guild.id))
+        system = await repositories.aio.server.get_system(str(interaction.guild.id))
         roll_parameters_dict = RollFormula.roll_parameters_to_dict(roll_parameters)
         roll_formula_obj = factories.get_specific_roll_formula(system, roll_parameters_dict)
         await character.send_roll_message(interaction, roll_formula_obj, difficulty)
@@ -293,12 +318,12 @@ class RollCommands(commands.Cog):
     )
     async def roll_custom(self, interaction: discord.Interaction):
         """Open a fully interactive UI for rolling dice with your character"""
-        character = repositories.active_character.get_active_character(str(interaction.guild.id), str(interaction.user.id))
+        character = await repositories.aio.active_character.get_active_character(str(interaction.guild.id), str(interaction.user.id))
         if not character:
             await interaction.response.send_message("❌ No active character set. Use `/character switch` to choose one.", ephemeral=True)
             return
         
-        system = repositories.server.get_system(str(interaction.guild.id))
+        system = await repositories.aio.server.get_system(str(interaction.guild.id))
         roll_formula_obj = factories.get_specific_roll_formula(system, {})
         formula_view = factories.get_specific_roll_formula_view(system, roll_formula_obj)
         await interaction.response.send_message(
@@ -307,6 +332,98 @@ class RollCommands(commands.Cog):
             ephemeral=True
         )
 
+    @roll_group.command(
+        name="odds",
+        description="Chance of meeting a difficulty with your active character's roll or a dice formula"
+    )
+    @app_commands.describe(
+        difficulty="Total to meet or beat (e.g. 8)",
+        roll_parameters="Roll parameters for your active character, e.g. skill:Gun Combat,bane",
+        dice="Dice formula to check instead of your character's roll, e.g. 3d6+2 or 4d6kh3"
+    )
+    @app_commands.autocomplete(roll_parameters=roll_parameters_autocomplete)
+    async def roll_odds(self, interaction: discord.Interaction, difficulty: int, roll_parameters: str = None, dice: str = None):
+        # Working out big distributions can take a moment, so acknowledge first and compute off the event loop
+        await interaction.response.defer(ephemeral=True, thinking=True)
+        loop = asyncio.get_running_loop()
+        try:
+            if dice:
+                distribution = await loop.run_in_executor(None, dice_distribution, dice)
+                subject = f"`{normalize(dice)}`"
+            else:
+                character = await repositories.aio.active_character.get_active_character(str(interaction.guild.id), str(interaction.user.id))
+                if not character:
+                    await interaction.followup.send("❌ No active character set. Use `/character switch` or give a `dice` formula.", ephemeral=True)
+                    return
+                
+                system = await repositories.aio.server.get_system(str(interaction.guild.id))
+                roll_formula_obj = factories.get_specific_roll_formula(system, RollFormula.roll_parameters_to_dict(roll_parameters))
+                if system == SystemType.FATE:
+                    base_roll = roll_formula_obj.base_dice()
+                elif system == SystemType.MGT2E:
+                    base_roll = "2d6"
+                else:
+                    base_roll = await repositories.aio.server.get_generic_base_roll(interaction.guild.id) or "1d20"
+                distribution, formula = await loop.run_in_executor(None, roll_formula_obj.roll_distribution, character, base_roll)
+                subject = f"**{character.name}**: {formula}"
+        except (DiceSyntaxError, OddsError) as e:
+            await interaction.followup.send(f"❌ {e}", ephemeral=True)
+            return
+        except RecursionError:
+            await interaction.followup.send("❌ That formula is too deeply nested to work out its odds.", ephemeral=True)
+            return
+
+        chance = distribution.at_least(difficulty)
+        await interaction.followup.send(
+            f"🎯 {subject} vs **{difficulty}**\n"
+            f"📊 Chance of {difficulty}+: **{chance:.1%}**\n"
+            f"Average {distribution.mean:.1f}, range {distribution.minimum} to {distribution.maximum}",
+            ephemeral=True
+        )
+
+    @roll_group.command(
+        name="npcs",
+        description="GM: Roll the same dice for every NPC in a scene at once"
+    )
+    @app_commands.describe(
+        dice="Dice formula to roll for each NPC, e.g. 1d20+2 or 2d6",
+        difficulty="Optional difficulty number to compare against (e.g. 15)",
+        scene="Scene whose NPCs roll (defaults to the active scene)"
+    )
+    @app_commands.autocomplete(scene=scene_name_autocomplete)
+    async def roll_npcs(self, interaction: discord.Interaction, dice: str, difficulty: int = None, scene: str = None):
+        if not await repositories.server.has_gm_permission(str(interaction.guild.id), interaction.user):
+            await interaction.response.send_message("❌ Only GMs can use this command.", ephemeral=True)
+            return
+
+        npcs = await repositories.aio.scene_npc.get_scene_npcs(str(interaction.guild.id), scene_name=scene)
+        if not npcs:
+            where = f"scene **{scene}**" if scene else "the active scene"
+            await interaction.response.send_message(f"❌ No NPCs found in {where}.", ephemeral=True)
+            return
+
+        try:
+            expression = compile_batch_dice(dice)
+        except DiceSyntaxError as e:
+            await interaction.response.send_message(f"❌ {e}", ephemeral=True)
+            return
+        except RecursionError:
+            await interaction.response.send_message("❌ That formula is too deeply nested to roll.", ephemeral=True)
+            return
+
+        # A batch can draw up to MAX_BATCH_DICE dice, so acknowledge first and roll off the event loop
+        await interaction.response.defer(thinking=True)
+        loop = asyncio.get_running_loop()
+        try:
+            totals = await loop.run_in_executor(None, roll_totals, expression, len(npcs))
+        except DiceSyntaxError as e:
+            await interaction.followup.send(f"❌ {e}")
+            return
+
+        title = f"🎲 {expression.text} for {len(npcs)} NPCs" + (f" in {scene}" if scene else "")
+        embed = build_batch_roll_embed(title, [(npc.name, total) for npc, total in zip(npcs, totals)], difficulty)
+        await interaction.followup.send(embed=embed)
+
     @roll_group.command(
         name="request", 
         description="GM: Prompt selected characters to roll with a button"
@@ -329,8 +446,8 @@ class RollCommands(commands.Cog):
             await interaction.response.send_message("❌ Only GMs can use this command.", ephemeral=True)
             return
 
-        system = repositories.server.get_system(str(interaction.guild.id))
-        all_chars = repositories.character.get_all_by_guild(str(interaction.guild.id))
+        system = await repositories.aio.server.get_system(str(interaction.guild.id))
+        all_chars = await repositories.aio.character.get_all_by_guild(str(interaction.guild.id))
         char_names = [name.strip() for name in chars_to_roll.split(",") if name.strip()]
         chars = [c for c in all_chars if c.name in char_names]
         if not chars:
@@ -1,8 +1,10 @@
+import functools
 import logging
 import discord
 from discord.ext import commands
 from discord import app_commands
 from core import shared_views
+from core.message_editor import FanOutReport, edit_stored_message, fan_out, message_handle, pinned_message_editor
 from data.repositories.repository_factory import repositories
 
 import core.factories as factories
@@ -26,7 +28,7 @@ async def npcs_in_scene_autocomplete(interaction: discord.Interaction, current:
     active_scene = repositories.scene.get_active_scene(str(interaction.guild.id))
     if not active_scene:
         return []
-    all_chars = repositories.scene_npc.get_scene_npcs(str(interaction.guild.id), active_scene.scene_id)
+    all_chars = repositories.scene_npc.get_scene_npcs(str(interaction.guild.id), scene_id=active_scene.scene_id)
     
     npcs = [c for c in all_chars]
     options = [c.name for c in npcs]
@@ -89,39 +91,24 @@ class SceneCommands(commands.Cog):
         # Use defer to prevent the interaction from timing out
         await interaction.response.defer(ephemeral=True, thinking=True)
 
-        # Step 1: Unpin any existing pinned scene messages
+        # Step 1: Unpin any existing pinned scene messages, in every channel at once
         pinned_messages = repositories.pinned_scene.get_all_pinned_messages(str(interaction.guild.id))
-        
-        for pinned_msg in pinned_messages:
-            try:
-                # Get the channel
-                channel = interaction.guild.get_channel(int(pinned_msg.channel_id))
-                if not channel:
-                    continue
-                    
-                # Get the message
-                try:
-                    message = await channel.fetch_message(int(pinned_msg.message_id))
-                    if message:
-                        # Unpin the message
-                        await message.unpin()
-                        
-                        # Update the message to show it's no longer the active scene
-                        await message.edit(
-                            content="⚠️ **SCENE CHANGED** ⚠️",
-                            embed=discord.Embed(
-                                title=f"Scene Changed to: {scene_name}",
-                                description=f"This scene is no longer active. The active scene is now **{scene_name}**.",
-                                color=discord.Color.dark_gold()
-                            ),
-                            view=None
-                        )
-                except discord.NotFound:
-                    pass  # Message was deleted, just continue
-                except Exception as e:
-                    logging.error(f"Error updating old scene message: {e}")
-            except Exception as e:
-                logging.error(f"Error handling old scene message: {e}")
+        report = await self._retire_pinned_messages(
+            interaction.guild,
+            pinned_messages,
+            content="⚠️ **SCENE CHANGED** ⚠️",
+            embed=discord.Embed(
+                title=f"Scene Changed to: {scene_name}",
+                description=f"This scene is no longer active. The active scene is now **{scene_name}**.",
+                color=discord.Color.dark_gold()
+            )
+        )
+        for message_id, e in report.errors:
+            logging.error(f"Error updating old scene message {message_id}: {e}")
+        logging.info(
+            f"Scene switch unpinned {report.succeeded} messages ({report.failed} failed) "
+            f"in {report.elapsed_seconds * 1000:.0f} ms"
+        )
         
         # Clear all existing pins from the database
         repositories.pinned_scene.clear_all_pins(str(interaction.guild.id))
@@ -150,6 +137,8 @@ class SceneCommands(commands.Cog):
             response += f" (from **{old_scene.name}**)"
         if message:
             response += "\n✅ The scene has been pinned to this channel."
+        if report.failed:
+            response += f"\n⚠️ Failed to update {report.failed} previously pinned scene message{'s' if report.failed > 1 else ''}."
         
         await interaction.followup.send(response, ephemeral=True)
 
@@ -515,37 +504,25 @@ class SceneCommands(commands.Cog):
         # Get all pinned messages for this guild
         pinned_messages = repositories.pinned_scene.get_all_pinned_messages(str(interaction.guild.id))
         
-        # Track successful/failed unpins
-        successful = 0
-        failed = 0
-        
-        # Unpin all messages
-        for pinned_msg in pinned_messages:
-            try:
-                # Get the channel
-                channel = interaction.guild.get_channel(int(pinned_msg.channel_id))
-                if not channel:
-                    continue
-                    
-                # Get the message
-                message = await channel.fetch_message(int(pinned_msg.message_id))
-                if message:
-                    # Unpin the message
-                    await message.unpin()
-                    # Update message content to show it's no longer active
-                    await message.edit(
-                        content="🛑 **SCENE TRACKING DISABLED** 🛑",
-                        embed=discord.Embed(
-                            title="Scene Tracking Disabled",
-                            description="Scene tracking has been turned off. This message is no longer being updated.",
-                            color=discord.Color.darker_grey()
-                        ),
-                        view=None
-                    )
-                    successful += 1
-            except Exception as e:
-                logging.error(f"Failed to unpin scene message: {e}")
-                failed += 1
+        # Unpin all messages, in every channel at once
+        report = await self._retire_pinned_messages(
+            interaction.guild,
+            pinned_messages,
+            content="🛑 **SCENE TRACKING DISABLED** 🛑",
+            embed=discord.Embed(
+                title="Scene Tracking Disabled",
+                description="Scene tracking has been turned off. This message is no longer being updated.",
+                color=discord.Color.darker_grey()
+            )
+        )
+        for message_id, e in report.errors:
+            logging.error(f"Failed to unpin scene message {message_id}: {e}")
+        logging.info(
+            f"Scene unpin unpinned {report.succeeded} messages ({report.failed} failed) "
+            f"in {report.elapsed_seconds * 1000:.0f} ms"
+        )
+        successful = report.succeeded
+        failed = report.failed
         
         # Clear the pinned messages from the database
         repositories.pinned_scene.clear_all_pins(str(interaction.guild.id))
@@ -623,6 +600,27 @@ class SceneCommands(commands.Cog):
         
         await interaction.response.send_message(embed=embed, ephemeral=True)
 
+    async def _retire_pinned_messages(self, guild, pinned_messages, content, embed) -> FanOutReport:
+        """
+        Unpin scene messages and replace them with a final notice, in every channel at once.
+        Messages that were already deleted are skipped; other failures are collected in the report.
+        """
+        async def retire_message(channel, message_id):
+            # Handle to the stored message; no fetch needed to unpin or edit it
+            message = message_handle(channel, message_id)
+            try:
+                await message.unpin()
+                await pinned_message_editor.edit(message, content=content, embed=embed, view=None)
+            except discord.NotFound:
+                pass  # Message was deleted, just continue
+        
+        jobs = []
+        for pinned_msg in pinned_messages:
+            channel = guild.get_channel(int(pinned_msg.channel_id))
+            if channel:
+                jobs.append((channel.id, pinned_msg.message_id, functools.partial(retire_message, channel, pinned_msg.message_id)))
+        return await fan_out(jobs)
+
     # Helper method to update all pinned scenes after a change
     async def _update_all_pinned_scenes(self, guild, scene_id=None):
         """
@@ -649,41 +647,55 @@ class SceneCommands(commands.Cog):
                 else:
                     return  # No active scene to update
         
-            # Update all relevant pinned messages
+            def make_view(pinned_msg):
+                # Create a new view for the scene
+                view = factories.get_specific_scene_view(
+                    system=system,
+                    guild_id=str(guild.id), 
+                    channel_id=pinned_msg.channel_id,
+                    scene_id=pinned_msg.scene_id,
+                    message_id=pinned_msg.message_id
+                )
+                
+                # IMPORTANT: Always set is_gm to False for pinned scene updates
+                # This ensures that hidden aspects are always hidden in public pinned messages
+                view.is_gm = False
+                view.build_view_components()
+                return view
+            
+            # Pick the messages to update: only this scene's, in channels we can still see
+            targets = []
             for pinned_msg in pinned_messages:
                 if scene_id and pinned_msg.scene_id != str(scene_id):
                     continue  # Only update messages for this scene
-                
-                try:
-                    # Get the channel
-                    channel = guild.get_channel(int(pinned_msg.channel_id))
-                    if not channel:
-                        continue
-                        
-                    # Create a new view for the scene
-                    view = factories.get_specific_scene_view(
-                        system=system,
-                        guild_id=str(guild.id), 
-                        channel_id=pinned_msg.channel_id,
-                        scene_id=pinned_msg.scene_id,
-                        message_id=pinned_msg.message_id
-                    )
-                    
-                    # IMPORTANT: Always set is_gm to False for pinned scene updates
-                    # This ensures that hidden aspects are always hidden in public pinned messages
-                    view.is_gm = False
-                    view.build_view_components()
-                    
-                    # Get the embed and content
-                    embed, content = await view.create_scene_content()
-                    
-                    # Get the message
-                    message = await channel.fetch_message(int(pinned_msg.message_id))
-                    if message:
-                        # Update the message
-                        await message.edit(content=content, embed=embed, view=view)
-                except Exception as e:
-                    logging.error(f"Failed to update pinned scene message: {e}")
+                channel = guild.get_channel(int(pinned_msg.channel_id))
+                if channel:
+                    targets.append((channel, pinned_msg))
+            
+            # Every pinned message of a scene shows the same public content, so render each scene once up front
+            rendered = {}
+            for channel, pinned_msg in targets:
+                if pinned_msg.scene_id not in rendered:
+                    try:
+                        rendered[pinned_msg.scene_id] = await make_view(pinned_msg).create_scene_content()
+                    except Exception as e:
+                        rendered[pinned_msg.scene_id] = None
+                        logging.error(f"Failed to render scene {pinned_msg.scene_id} for its pinned messages: {e}")
+            
+            async def update_message(channel, pinned_msg):
+                embed, content = rendered[pinned_msg.scene_id]
+                # Edit the message in place without fetching it first; a deleted message is skipped
+                await edit_stored_message(channel, pinned_msg.message_id, content=content, embed=embed, view=make_view(pinned_msg))
+            
+            # Update all relevant pinned messages, in every channel at once
+            jobs = [
+                (channel.id, pinned_msg.message_id, functools.partial(update_message, channel, pinned_msg))
+                for channel, pinned_msg in targets
+                if rendered[pinned_msg.scene_id] is not None
+            ]
+            report = await fan_out(jobs)
+            for message_id, e in report.errors:
+                logging.error(f"Failed to update pinned scene message {message_id}: {e}")
         except Exception as e:
             logging.error(f"Error in _update_all_pinned_scenes: {e}")
 
@@ -701,31 +713,18 @@ class ConfirmDeleteView(discord.ui.View):
             # Get all pinned messages for this scene
             pinned_messages = repositories.pinned_scene.get_all_pinned_messages(str(interaction.guild.id))
             
-            for pinned_msg in pinned_messages:
-                if pinned_msg.scene_id == self.scene.scene_id:
-                    try:
-                        # Get the channel
-                        channel = interaction.guild.get_channel(int(pinned_msg.channel_id))
-                        if not channel:
-                            continue
-                            
-                        # Get the message
-                        message = await channel.fetch_message(int(pinned_msg.message_id))
-                        if message:
-                            # Unpin the message
-                            await message.unpin()
-                            # Update message content to show the scene is deleted
-                            await message.edit(
-                                content="🗑️ **SCENE DELETED** 🗑️",
-                                embed=discord.Embed(
-                                    title="Scene Deleted",
-                                    description=f"Scene **{self.scene.name}** has been deleted.",
-                                    color=discord.Color.red()
-                                ),
-                                view=None
-                            )
-                    except Exception as e:
-                        logging.error(f"Failed to update pinned message for deleted scene: {e}")
+            report = await self.cog._retire_pinned_messages(
+                interaction.guild,
+                [pinned_msg for pinned_msg in pinned_messages if pinned_msg.scene_id == self.scene.scene_id],
+                content="🗑️ **SCENE DELETED** 🗑️",
+                embed=discord.Embed(
+                    title="Scene Deleted",
+                    description=f"Scene **{self.scene.name}** has been deleted.",
+                    color=discord.Color.red()
+                )
+            )
+            for message_id, e in report.errors:
+                logging.error(f"Failed to update pinned message {message_id} for deleted scene: {e}")
         except Exception as e:
             logging.error(f"Error handling scene deletion cleanup: {e}")
             
@@ -3,6 +3,7 @@ from discord.ext import commands
 from discord import app_commands
 from core import channel_restriction
 from core.base_models import SystemType
+from core.dice_expression import DiceSyntaxError, compile_dice
 import core.factories as factories
 from data.repositories.repository_factory import repositories
 
@@ -352,7 +353,6 @@ class SetupCommands(commands.Cog):
     @channel_restriction.no_ic_channels()
     async def setup_generic_dice(self, interaction: discord.Interaction, base_dice: str):
         """Set the base dice formula for the Generic system"""
-        import re
         
         # Check GM permissions
         if not await repositories.server.has_gm_permission(str(interaction.guild.id), interaction.user):
@@ -370,9 +370,13 @@ class SetupCommands(commands.Cog):
         
         # Validate dice format
         base_dice = base_dice.strip()
-        if not re.match(r'^\d*d\d+([+-]\d+)?$', base_dice.replace(' ', '').lower()):
+        try:
+            valid = compile_dice(base_dice).has_dice
+        except DiceSyntaxError:
+            valid = False
+        if not valid:
             await interaction.response.send_message(
-                "❌ Invalid dice format. Use formats like: 1d20, 2d6, 3d6+1, 1d100, etc.",
+                "❌ Invalid dice format. Use formats like: 1d20, 2d6, 3d6+1, 1d100, 4d6kh3, 2d6!, etc.",
                 ephemeral=True
             )
             return
@@ -343,7 +343,7 @@ class EntityLinkType(Enum):
         links_dict = {}
         
         # Use the new view to get aggregated link data
-        entity_details = repositories.vw_entity_details.get_by_id(entity.id)
+        entity_details = repositories.entity_details.get_by_id(entity.id)
 
         if entity_details:
             # Entities this entity owns
@@ -483,13 +483,8 @@ class BaseEntity(BaseRpgObj):
     
     def get_item_quantity(self, guild_id: str, item_name: str) -> int:
         """Get the total quantity of an item in the container"""
-        total_quantity = 0
-        for contained_item in self.get_contained_items(guild_id):
-            if contained_item.name == item_name:
-                links = self.get_links_to_entity(guild_id, contained_item.id, EntityLinkType.POSSESSES)
-                if links:
-                    total_quantity += links[0].metadata.get("quantity", 1)
-        return total_quantity
+        from data.repositories.repository_factory import repositories
+        return repositories.link.get_item_quantity(guild_id, self.id, item_name)
     
     def can_take_item(self, guild_id: str, item_name: str, quantity: int = 1) -> bool:
         """Check if we can take the specified quantity of an item"""
@@ -498,23 +493,12 @@ class BaseEntity(BaseRpgObj):
     
     def take_item(self, guild_id: str, item_name: str, quantity: int = 1) -> 'BaseEntity':
         """Take items from container, returns the item entity for adding to inventory"""
-        if not self.can_take_item(guild_id, item_name, quantity):
-            return None
-        
-        # Find the item
-        target_item = None
-        for contained_item in self.get_contained_items(guild_id):
-            if contained_item.name == item_name:
-                target_item = contained_item
-                break
-        
-        if not target_item:
+        from data.repositories.repository_factory import repositories
+        # Checks and decrements the stack in one statement, so concurrent takes can't overdraw it
+        item_id = repositories.link.take_item_quantity(guild_id, self.id, item_name, quantity)
+        if not item_id:
             return None
-        
-        # Remove the quantity
-        self.remove_item(guild_id, target_item, quantity)
-        
-        return target_item
+        return repositories.entity.get_by_id(item_id)
     
     def get_links_to_entity(self, guild_id: str, entity_id: str, link_type: EntityLinkType) -> List[EntityLink]:
         """Helper method to get links to a specific entity"""
@@ -598,35 +582,15 @@ class BaseEntity(BaseRpgObj):
         if item.entity_type != EntityType.ITEM:
             return False
         
-        # Check if we already have this item (by name for stacking)
-        existing_links = []
-        for contained_item in self.get_contained_items(guild_id):
-            if contained_item.name == item.name:
-                links = self.get_links_to_entity(guild_id, contained_item.id, EntityLinkType.POSSESSES)
-                if links:
-                    existing_links.extend(links)
-        
-        if existing_links:
-            # Stack with existing item
-            link = existing_links[0]
-            current_quantity = link.metadata.get("quantity", 1)
-            link.metadata["quantity"] = current_quantity + quantity
-            
-            from data.repositories.repository_factory import repositories
-            repositories.link.save(link)
-            return True
-        else:
-            # Check if container has space for new unique item
-            max_items = self.data.get("max_items", 0)
-            if max_items > 0:
-                unique_items = len(self.get_contained_items(guild_id))
-                if unique_items >= max_items:
-                    return False
-            
-            # Create new link with quantity metadata
-            metadata = {"quantity": quantity}
-            self.add_link(guild_id, item, EntityLinkType.POSSESSES, metadata)
-            return True
+        from data.repositories.repository_factory import repositories
+        return repositories.link.add_item_quantity(
+            guild_id,
+            self.id,
+            item.id,
+            item.name,
+            quantity,
+            max_items=self.data.get("max_items") or 0
+        )
     
     def remove_from_inventory(self, guild_id: str, item: 'BaseEntity') -> bool:
         """Remove an item from this entity's inventory"""
@@ -639,27 +603,8 @@ class BaseEntity(BaseRpgObj):
         if item.entity_type != EntityType.ITEM:
             return False
         
-        # If no quantity specified, remove all
-        if quantity is None:
-            return self.remove_link(guild_id, item, EntityLinkType.POSSESSES)
-        
-        # Get current link to check quantity
-        links = self.get_links_to_entity(guild_id, item.id, EntityLinkType.POSSESSES)
-        if not links:
-            return False
-        
-        link = links[0]
-        current_quantity = link.metadata.get("quantity", 1)
-        
-        if quantity >= current_quantity:
-            # Remove completely
-            return self.remove_link(guild_id, item, EntityLinkType.POSSESSES)
-        else:
-            # Update quantity
-            from data.repositories.repository_factory import repositories
-            link.metadata["quantity"] = current_quantity - quantity
-            repositories.link.save(link)
-            return True
+        from data.repositories.repository_factory import repositories
+        return repositories.link.remove_item_quantity(guild_id, self.id, item.id, quantity)
 
 class BaseCharacter(BaseEntity):
     """
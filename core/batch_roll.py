@@ -0,0 +1,100 @@
+import operator
+import random
+from typing import List, Union
+from core.dice_expression import MAX_EXPLOSIONS, BinaryOp, Constant, DiceExpression, DiceLimitError, DiceTerm, Group, Negate, Node, compile_dice
+
+# Dice one batch may draw in total, across every roll of every formula
+MAX_BATCH_DICE = 1000000
+
+_OPERATORS = {'+': operator.add, '-': operator.sub, '*': operator.mul}
+
+def _draw_sums(term: DiceTerm, times: int, rng) -> List[int]:
+    """Totals of `times` rolls of a plain NdX/NdF term, drawing every die in one call"""
+    count = term.count
+    if count == 0:
+        return [0] * times
+    dice = count * times
+    draws = rng.choices(term.faces, k=dice)
+    if count == 1:
+        return draws
+    return [sum(draws[i:i + count]) for i in range(0, dice, count)]
+
+def _draw_kept_sums(term: DiceTerm, times: int, rng) -> List[int]:
+    """Totals of `times` rolls of a term keeping its highest or lowest dice, drawing every die in one call"""
+    count = term.count
+    direction, keep = term.keep
+    draws = rng.choices(term.faces, k=count * times)
+    if direction == 'h':
+        return [sum(sorted(draws[i:i + count])[count - keep:]) if keep else 0 for i in range(0, count * times, count)]
+    return [sum(sorted(draws[i:i + count])[:keep]) for i in range(0, count * times, count)]
+
+def _draw_exploding_sums(term: DiceTerm, times: int, rng) -> List[int]:
+    """
+    Totals of `times` rolls of an exploding term. The first dice of every roll are drawn in one
+    call, then each round of explosions across all rolls in one more, up to MAX_EXPLOSIONS per roll.
+    """
+    count = term.count
+    sides = term.sides
+    draws = rng.choices(term.faces, k=count * times)
+    rolls = [draws[i:i + count] for i in range(0, count * times, count)]
+    pending = [dice.count(sides) for dice in rolls]
+    explosions = [0] * times
+    exploding = [i for i in range(times) if pending[i]]
+    while exploding:
+        wanted = [min(pending[i], MAX_EXPLOSIONS - explosions[i]) for i in exploding]
+        extra = rng.choices(term.faces, k=sum(wanted))
+        still_exploding = []
+        start = 0
+        for i, k in zip(exploding, wanted):
+            chunk = extra[start:start + k]
+            start += k
+            rolls[i].extend(chunk)
+            explosions[i] += k
+            pending[i] = chunk.count(sides)
+            if pending[i] and explosions[i] < MAX_EXPLOSIONS:
+                still_exploding.append(i)
+        exploding = still_exploding
+
+    if not term.keep:
+        return [sum(dice) for dice in rolls]
+    direction, keep = term.keep
+    if direction == 'h':
+        return [sum(sorted(dice)[len(dice) - keep:]) if keep else 0 for dice in rolls]
+    return [sum(sorted(dice)[:keep]) for dice in rolls]
+
+def _roll_node(node: Node, times: int, rng) -> List[int]:
+    if isinstance(node, Constant):
+        return [node.value] * times
+    if isinstance(node, DiceTerm):
+        if node.explode:
+            return _draw_exploding_sums(node, times, rng)
+        if node.keep:
+            return _draw_kept_sums(node, times, rng)
+        return _draw_sums(node, times, rng)
+    if isinstance(node, Negate):
+        return [-value for value in _roll_node(node.operand, times, rng)]
+    if isinstance(node, Group):
+        return _roll_node(node.inner, times, rng)
+    if isinstance(node, BinaryOp):
+        return list(map(_OPERATORS[node.op], _roll_node(node.left, times, rng), _roll_node(node.right, times, rng)))
+    raise TypeError(f"Unsupported dice expression node {node!r}")
+
+def compile_batch_dice(expression: str) -> DiceExpression:
+    """
+    Compile a dice expression for roll_totals. Batches show no per-die breakdown, so instead of
+    the per-term and per-expression dice caps only MAX_BATCH_DICE bounds the work.
+    """
+    return compile_dice(expression, max_dice=MAX_BATCH_DICE, max_total_dice=MAX_BATCH_DICE)
+
+def roll_totals(expression: Union[str, DiceExpression], times: int, rng=random) -> List[int]:
+    """
+    Roll a dice expression `times` times and return only the totals.
+    Dice for all rolls are drawn together instead of building a breakdown for each roll.
+    """
+    if isinstance(expression, str):
+        expression = compile_batch_dice(expression)
+    if times <= 0:
+        return []
+    if sum(term.count for term in expression.dice_terms) * times > MAX_BATCH_DICE:
+        raise DiceLimitError(f"Rolling '{expression.text}' {times} times needs more than {MAX_BATCH_DICE} dice")
+    return _roll_node(expression.root, times, rng)
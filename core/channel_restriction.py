@@ -20,7 +20,7 @@ def channel_restricted(allowed_types: List[str]):
         @wraps(func)
         async def wrapper(self, interaction: discord.Interaction, *args, **kwargs):
             # Get the channel type for this channel
-            channel_type = repositories.channel_permissions.get_channel_type(
+            channel_type = await repositories.channel_permissions.get_channel_type_async(
                 str(interaction.guild.id), 
                 str(interaction.channel.id)
             )
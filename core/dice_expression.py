@@ -0,0 +1,330 @@
+import random
+import re
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from functools import lru_cache
+from typing import List, Optional, Tuple
+
+# A single term rolling more dice or bigger dice than this is refused
+MAX_DICE = 100
+MAX_SIDES = 1000
+# Whole expressions are refused past this many dice, numbers and dice terms, or nested parentheses and signs,
+# which keeps the breakdown postable in one message and the parser and evaluators off Python's recursion limit
+MAX_TOTAL_DICE = 200
+MAX_TERMS = 20
+MAX_NESTING = 20
+# Extra dice a single exploding term may add before it stops
+MAX_EXPLOSIONS = 100
+
+FUDGE_SIDES = 'f'
+FUDGE_FACES = (-1, 0, 1)
+FUDGE_SYMBOLS = {-1: '-', 0: '0', 1: '+'}
+
+_TOKEN = re.compile(r"(?P<dice>(?P<count>\d*)d(?P<sides>\d+|f)(?P<options>(?:!|k[hl]?\d+)*))|(?P<number>\d+)|(?P<op>[-+*()])")
+_OPTION = re.compile(r"!|k([hl]?)(\d+)")
+
+class DiceSyntaxError(ValueError):
+    """The text is not a dice expression this module understands"""
+
+class DiceLimitError(DiceSyntaxError):
+    """The expression is valid but rolls more or bigger dice than allowed"""
+
+@dataclass
+class TermRoll:
+    """The dice one DiceTerm rolled, in roll order, and the positions of the dice kept"""
+    term: "DiceTerm"
+    rolls: List[int]
+    kept: List[int]
+
+    @property
+    def kept_rolls(self) -> List[int]:
+        return [self.rolls[i] for i in self.kept]
+
+    def describe(self) -> str:
+        if self.term.is_fudge:
+            return f"{self.term.text} `{' '.join(FUDGE_SYMBOLS[r] for r in self.rolls)}`"
+        if not self.term.explode and len(self.kept) == len(self.rolls):
+            return f"{self.term.text} [{', '.join(map(str, self.rolls))}]"
+        kept = set(self.kept)
+        exploding = self.term.explode
+        faces = []
+        for i, r in enumerate(self.rolls):
+            face = f"{r}!" if exploding and r == self.term.sides else str(r)
+            faces.append(face if i in kept else f"~~{face}~~")
+        return f"{self.term.text} [{', '.join(faces)}]"
+
+@dataclass
+class DiceRoll:
+    """One roll of a DiceExpression: the total, a breakdown for chat and what each term rolled"""
+    total: int
+    description: str
+    terms: List[TermRoll] = field(default_factory=list)
+
+class Node(ABC):
+    """A node of a compiled dice expression"""
+    @abstractmethod
+    def roll(self, rng, terms: List[TermRoll]) -> Tuple[int, str]:
+        """Roll the node, appending a TermRoll for every die term, and return (value, description)"""
+        pass
+
+    @abstractmethod
+    def dice_terms(self) -> List["DiceTerm"]:
+        """Every die term under this node, left to right"""
+        pass
+
+class Constant(Node):
+    def __init__(self, value: int):
+        self.value = value
+
+    def dice_terms(self):
+        return []
+
+    def roll(self, rng, terms):
+        return self.value, str(self.value)
+
+class DiceTerm(Node):
+    """NdX or NdF, optionally exploding and keeping the highest or lowest dice"""
+    def __init__(self, text: str, count: int, sides, explode: bool = False, keep: Optional[Tuple[str, int]] = None):
+        self.text = text
+        self.count = count
+        self.sides = sides
+        self.explode = explode
+        self.keep = keep
+        self.is_fudge = sides == FUDGE_SIDES
+        self.faces = FUDGE_FACES if self.is_fudge else range(1, sides + 1)
+
+    def dice_terms(self):
+        return [self]
+
+    def roll(self, rng, terms):
+        rolls = rng.choices(self.faces, k=self.count)
+        if self.explode:
+            sides = self.sides
+            pending = rolls.count(sides)
+            explosions = 0
+            while pending and explosions < MAX_EXPLOSIONS:
+                extra = rng.choices(self.faces, k=min(pending, MAX_EXPLOSIONS - explosions))
+                explosions += len(extra)
+                rolls.extend(extra)
+                pending = extra.count(sides)
+
+        if self.keep:
+            direction, keep_count = self.keep
+            # Stable sort so equal dice are kept in roll order
+            order = sorted(range(len(rolls)), key=rolls.__getitem__, reverse=(direction == 'h'))
+            kept = sorted(order[:keep_count])
+            total = sum(rolls[i] for i in kept)
+        else:
+            kept = list(range(len(rolls)))
+            total = sum(rolls)
+
+        term_roll = TermRoll(self, rolls, kept)
+        terms.append(term_roll)
+        return total, term_roll.describe()
+
+class Negate(Node):
+    def __init__(self, operand: Node):
+        self.operand = operand
+
+    def dice_terms(self):
+        return self.operand.dice_terms()
+
+    def roll(self, rng, terms):
+        value, description = self.operand.roll(rng, terms)
+        return -value, f"-{description}"
+
+class Group(Node):
+    """A parenthesized sub-expression, kept so the breakdown shows the parentheses"""
+    def __init__(self, inner: Node):
+        self.inner = inner
+
+    def dice_terms(self):
+        return self.inner.dice_terms()
+
+    def roll(self, rng, terms):
+        value, description = self.inner.roll(rng, terms)
+        return value, f"({description})"
+
+class BinaryOp(Node):
+    OPERATIONS = {
+        '+': lambda a, b: a + b,
+        '-': lambda a, b: a - b,
+        '*': lambda a, b: a * b,
+    }
+
+    def __init__(self, op: str, left: Node, right: Node):
+        self.op = op
+        self.apply = self.OPERATIONS[op]
+        self.left = left
+        self.right = right
+
+    def dice_terms(self):
+        return self.left.dice_terms() + self.right.dice_terms()
+
+    def roll(self, rng, terms):
+        left, left_description = self.left.roll(rng, terms)
+        right, right_description = self.right.roll(rng, terms)
+        return self.apply(left, right), f"{left_description} {self.op} {right_description}"
+
+class DiceExpression:
+    """
+    A compiled dice expression such as `2d6+3`, `4d6kh3`, `1d20+1d4-1`, `3d6!`, `4df+2` or `(1d8+2)*2`.
+    Roll it as often as needed; only random numbers are generated per roll.
+
+    Syntax (case and spaces are ignored):
+    - `NdX`: N dice with X sides, N defaults to 1
+    - `NdF`: N Fate dice (-1, 0 or +1), N defaults to 4
+    - `khK` / `kK` / `klK` after a die: keep the K highest / lowest dice
+    - `!` after a die: exploding, every die showing its maximum adds another die
+    - whole numbers, `+`, `-`, `*` and parentheses
+    """
+    def __init__(self, text: str, root: Node):
+        self.text = text
+        self.root = root
+        self.dice_terms: List[DiceTerm] = root.dice_terms()
+
+    @property
+    def has_dice(self) -> bool:
+        return bool(self.dice_terms)
+
+    def roll(self, rng=random) -> DiceRoll:
+        terms: List[TermRoll] = []
+        total, description = self.root.roll(rng, terms)
+        return DiceRoll(total, description, terms)
+
+    def __repr__(self):
+        return f"DiceExpression({self.text!r})"
+
+class _Parser:
+    """Recursive descent over the tokens of one expression"""
+    def __init__(self, text: str, max_dice: int = MAX_DICE, max_total_dice: int = MAX_TOTAL_DICE):
+        self.text = text
+        self.max_dice = max_dice
+        self.max_total_dice = max_total_dice
+        self.tokens = self._tokenize(text)
+        self.position = 0
+        self.depth = 0
+        self.terms = 0
+        self.dice = 0
+
+    @staticmethod
+    def _tokenize(text: str) -> List[re.Match]:
+        tokens = []
+        position = 0
+        while position < len(text):
+            match = _TOKEN.match(text, position)
+            if not match:
+                raise DiceSyntaxError(f"Unexpected '{text[position:]}' in '{text}'")
+            tokens.append(match)
+            position = match.end()
+        if not tokens:
+            raise DiceSyntaxError("Empty dice expression")
+        return tokens
+
+    def _nest(self) -> None:
+        self.depth += 1
+        if self.depth > MAX_NESTING:
+            raise DiceSyntaxError(f"'{self.text}' nests more than {MAX_NESTING} levels deep")
+
+    def _peek(self) -> Optional[str]:
+        if self.position < len(self.tokens):
+            return self.tokens[self.position].group('op')
+        return None
+
+    def parse(self) -> Node:
+        node = self._sum()
+        if self.position != len(self.tokens):
+            raise DiceSyntaxError(f"Unexpected '{self.tokens[self.position].group()}' in '{self.text}'")
+        return node
+
+    def _sum(self) -> Node:
+        node = self._product()
+        while self._peek() in ('+', '-'):
+            op = self._peek()
+            self.position += 1
+            node = BinaryOp(op, node, self._product())
+        return node
+
+    def _product(self) -> Node:
+        node = self._unary()
+        while self._peek() == '*':
+            self.position += 1
+            node = BinaryOp('*', node, self._unary())
+        return node
+
+    def _unary(self) -> Node:
+        op = self._peek()
+        if op in ('+', '-'):
+            self.position += 1
+            self._nest()
+            operand = self._unary()
+            self.depth -= 1
+            return Negate(operand) if op == '-' else operand
+        return self._atom()
+
+    def _atom(self) -> Node:
+        if self.position >= len(self.tokens):
+            raise DiceSyntaxError(f"'{self.text}' ends unexpectedly")
+        token = self.tokens[self.position]
+        self.position += 1
+        if token.group('dice') or token.group('number'):
+            self.terms += 1
+            if self.terms > MAX_TERMS:
+                raise DiceLimitError(f"'{self.text}' has more than {MAX_TERMS} dice terms and numbers")
+        if token.group('dice'):
+            return self._dice(token)
+        if token.group('number'):
+            return Constant(int(token.group('number')))
+        if token.group('op') == '(':
+            self._nest()
+            inner = self._sum()
+            if self._peek() != ')':
+                raise DiceSyntaxError(f"Missing ')' in '{self.text}'")
+            self.position += 1
+            self.depth -= 1
+            return Group(inner)
+        raise DiceSyntaxError(f"Unexpected '{token.group()}' in '{self.text}'")
+
+    def _dice(self, token: re.Match) -> DiceTerm:
+        sides = token.group('sides')
+        if sides == FUDGE_SIDES:
+            count = int(token.group('count')) if token.group('count') else 4
+        else:
+            sides = int(sides)
+            count = int(token.group('count')) if token.group('count') else 1
+            if sides < 1:
+                raise DiceSyntaxError(f"'{token.group()}' has no sides")
+        if count > self.max_dice or (sides != FUDGE_SIDES and sides > MAX_SIDES):
+            raise DiceLimitError(f"'{token.group()}' rolls more than {self.max_dice} dice or dice over d{MAX_SIDES}")
+        self.dice += count
+        if self.dice > self.max_total_dice:
+            raise DiceLimitError(f"'{self.text}' rolls more than {self.max_total_dice} dice in total")
+
+        explode = False
+        keep = None
+        for option in _OPTION.finditer(token.group('options')):
+            if option.group() == '!':
+                if sides == FUDGE_SIDES or sides == 1:
+                    raise DiceSyntaxError(f"'{token.group()}' can't explode")
+                explode = True
+            else:
+                keep = ('l' if option.group(1) == 'l' else 'h', int(option.group(2)))
+        return DiceTerm(token.group(), count, sides, explode, keep)
+
+def normalize(expression: str) -> str:
+    return expression.replace(" ", "").lower()
+
+@lru_cache(maxsize=1024)
+def _compile(text: str, max_dice: int, max_total_dice: int) -> DiceExpression:
+    return DiceExpression(text, _Parser(text, max_dice, max_total_dice).parse())
+
+def compile_dice(expression: str, max_dice: int = MAX_DICE, max_total_dice: int = MAX_TOTAL_DICE) -> DiceExpression:
+    """
+    Compile a dice expression, reusing the cached compilation of the same text.
+    max_dice and max_total_dice override the per-term and per-expression dice limits.
+    """
+    return _compile(normalize(expression), max_dice, max_total_dice)
+
+def compile_cache_info():
+    """Hits, misses and size of the compiled expression cache"""
+    return _compile.cache_info()
@@ -627,19 +627,17 @@ class TakeItemModal(ui.Modal, title="Take Items from Container"):
         item_name = self.item_name.value.strip()
         guild_id = str(interaction.guild.id)
         
-        # Check if item exists in container with sufficient quantity
-        if not container.can_take_item(guild_id, item_name, quantity):
-            available = container.get_item_quantity(guild_id, item_name)
-            await interaction.response.send_message(
-                f"❌ Not enough {item_name} in container. Available: {available}, Requested: {quantity}",
-                ephemeral=True
-            )
-            return
-        
-        # Take the item
+        # Take the item; the quantity check happens atomically with the update
         item = container.take_item(guild_id, item_name, quantity)
         if not item:
-            await interaction.response.send_message(f"❌ Could not take {item_name} from container.", ephemeral=True)
+            available = container.get_item_quantity(guild_id, item_name)
+            if available < quantity:
+                await interaction.response.send_message(
+                    f"❌ Not enough {item_name} in container. Available: {available}, Requested: {quantity}",
+                    ephemeral=True
+                )
+            else:
+                await interaction.response.send_message(f"❌ Could not take {item_name} from container.", ephemeral=True)
             return
         
         # Add to character's inventory
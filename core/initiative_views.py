@@ -4,11 +4,12 @@ import discord
 from discord import ui, SelectOption
 from core.initiative_types import GenericInitiative, PopcornInitiative
 from core.base_models import BaseInitiative
+from core.message_editor import message_handle, pinned_message_editor
 from data.repositories.repository_factory import repositories
 
 async def get_gm_ids(guild: discord.Guild):
     """Get GM user IDs from the guild"""
-    gm_role_id = repositories.server.get_gm_role_id(str(guild.id))
+    gm_role_id = await repositories.aio.server.get_gm_role_id(str(guild.id))
     if not gm_role_id:
         return set()
     
@@ -41,12 +42,12 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
         channel_id = interaction.channel.id
         
         # Get initiative data from the database
-        initiative = repositories.initiative.get_active_initiative(str(guild_id), str(channel_id))
+        initiative = await repositories.aio.initiative.get_active_initiative(str(guild_id), str(channel_id))
         if not initiative:
             return False
             
         # Get the message ID from the database if we don't have it
-        message_id = repositories.initiative.get_initiative_message_id(str(guild_id), str(channel_id))
+        message_id = await repositories.aio.initiative.get_initiative_message_id(str(guild_id), str(channel_id))
         if not message_id:
             return False
             
@@ -65,19 +66,11 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
         
         # Get the message ID from the database if we don't have it
         if not self.message_id:
-            self.message_id = repositories.initiative.get_initiative_message_id(str(self.guild_id), str(self.channel_id))
+            self.message_id = await repositories.aio.initiative.get_initiative_message_id(str(self.guild_id), str(self.channel_id))
 
-        # If we have a message ID, try to fetch and update that message
+        # If we have a message ID, return a handle to it; it is only fetched if an edit finds it missing
         if self.message_id:
-            try:
-                message = await channel.fetch_message(int(self.message_id))
-                # Update the existing message with current content
-                embed, content = await self.create_initiative_content()
-                await message.edit(content=content, embed=embed, view=self)
-                return message
-            except (discord.NotFound, discord.Forbidden, discord.HTTPException):
-                # Message not found or can't be accessed, we'll create a new one
-                pass
+            return message_handle(channel, self.message_id)
         
         return None
 
@@ -110,10 +103,17 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
         if not view:
             view = self
         
+        # Acknowledge the interaction first, since the edit below is debounced and may take a moment to go out
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=False)
+        
         if message:
             try:
-                # If the message exists, just update it
-                await message.edit(content=content, embed=embed, view=view)
+                # If the message exists, just update it; bursts of updates are coalesced into one edit
+                await pinned_message_editor.edit(message, content=content, embed=embed, view=view)
+            except discord.NotFound:
+                # Message was deleted, pin a new one below
+                message = None
             except Exception as e:
                 logging.error(f"Error updating initiative message: {e}")
                 # Fallback to sending a new message if editing fails
@@ -128,8 +128,9 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
                         ephemeral=True
                     )
                 return None
-        else:
-            # Pin it if it doesn't exist
+        
+        if not message:
+            # Pin it if it doesn't exist or was deleted
             message = await interaction.channel.send(content=content, embed=embed, view=view)
         
             try:
@@ -137,7 +138,7 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
                 self.message_id = message.id
                 
                 # Store the message ID in the database
-                repositories.initiative.set_initiative_message_id(str(self.guild_id), str(self.channel_id), str(message.id))
+                await repositories.aio.initiative.set_initiative_message_id(str(self.guild_id), str(self.channel_id), str(message.id))
                 
                 # Send a temporary message indicating the initiative has been pinned
                 temp_msg = await interaction.channel.send("📌 Initiative tracking has been pinned. You can always find the current turn at the top of the channel.")
@@ -162,7 +163,7 @@ class BasePinnedInitiativeView(ABC, discord.ui.View):
             if current_participant and not current_participant.is_npc and current_participant.owner_id:
                 mention = f"<@{current_participant.owner_id}>, it's your turn!"
                 mention_str= f"{mention}"
-                await interaction.response.send_message(mention_str, ephemeral=False)
+                await interaction.followup.send(mention_str, ephemeral=False)
 
 class GenericInitiativeView(BasePinnedInitiativeView):
     """
@@ -283,33 +284,30 @@ class GenericInitiativeView(BasePinnedInitiativeView):
 
     async def handle_end_turn(self, interaction):
         """Handle the end turn button press"""
+        await interaction.response.defer(ephemeral=True, thinking=False)
         self.initiative.advance_turn()
-        repositories.initiative.update_initiative_state(str(self.guild_id), str(self.channel_id), self.initiative)
+        await repositories.aio.initiative.update_initiative_state(str(self.guild_id), str(self.channel_id), self.initiative)
         embed, content = await self.create_initiative_content()
         new_view = GenericInitiativeView(self.guild_id, self.channel_id, self.initiative, self.message_id)
         await self.update_initiative_message(interaction, content=content, embed=embed, view=new_view)
-        if not interaction.response.is_done():
-                await interaction.response.defer(ephemeral=True, thinking=False)
-
         
     async def handle_start_initiative(self, interaction):
         """Handle the start initiative button press"""
+        await interaction.response.defer(ephemeral=True, thinking=False)
         self.initiative.is_started = True
         self.initiative.current_index = 0
-        repositories.initiative.update_initiative_state(str(self.guild_id), str(self.channel_id), self.initiative)
+        await repositories.aio.initiative.update_initiative_state(str(self.guild_id), str(self.channel_id), self.initiative)
         embed, content = await self.create_initiative_content()
         new_view = GenericInitiativeView(self.guild_id, self.channel_id, self.initiative, self.message_id)
         await self.update_initiative_message(interaction, content=content, embed=embed, view=new_view)
-        if not interaction.response.is_done():
-                await interaction.response.defer(ephemeral=True, thinking=False)
 
     async def update_view(self, interaction: discord.Interaction):
         """Update the initiative pinned message with current state"""
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=False)
         new_view = GenericInitiativeView(self.guild_id, self.channel_id, self.initiative, self.message_id)
         embed, content = await self.create_initiative_content()
         await self.update_initiative_message(interaction, content=content, embed=embed, view=new_view)
-        if not interaction.response.is_done():
-                await interaction.response.defer(ephemeral=True, thinking=False)
 
     async def create_initiative_content(self):
         """Create the content for a generic initiative view"""
@@ -368,13 +366,14 @@ class FirstPickerSelect(ui.Select):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=False)
         first_id = self.values[0]
         initiative = self.parent_view.initiative
         # Set the first turn
         initiative.current = first_id
         initiative.remaining_in_round = [p.id for p in initiative.participants if p.id != first_id]
         # Save updated initiative state to DB
-        repositories.initiative.update_initiative_state(str(self.parent_view.guild_id), str(self.parent_view.channel_id), initiative)
+        await repositories.aio.initiative.update_initiative_state(str(self.parent_view.guild_id), str(self.parent_view.channel_id), initiative)
         await self.parent_view.update_view(interaction)
 
 class PopcornNextSelect(ui.Select):
@@ -383,10 +382,11 @@ class PopcornNextSelect(ui.Select):
         self.parent_view = parent_view
 
     async def callback(self, interaction: discord.Interaction):
+        await interaction.response.defer(ephemeral=True, thinking=False)
         next_id = self.values[0]
         initiative = self.parent_view.initiative
         initiative.advance_turn(next_id)
-        repositories.initiative.update_initiative_state(str(self.parent_view.guild_id), str(self.parent_view.channel_id), initiative)
+        await repositories.aio.initiative.update_initiative_state(str(self.parent_view.guild_id), str(self.parent_view.channel_id), initiative)
         await self.parent_view.update_view(interaction)
 
 class EmptyPersistentSelect(ui.Select):
@@ -425,8 +425,10 @@ class EmptyPersistentSelect(ui.Select):
         embed, content = await new_view.create_initiative_content()
         
         # Update the message with the properly initialized view
-        message = await interaction.channel.fetch_message(int(self.parent_view.message_id))
-        await message.edit(content=content, embed=embed, view=new_view)
+        await pinned_message_editor.edit(
+            message_handle(interaction.channel, self.parent_view.message_id),
+            content=content, embed=embed, view=new_view
+        )
         
         # Let the user know what happened
         await interaction.followup.send(
@@ -538,20 +540,24 @@ class PopcornInitiativeView(BasePinnedInitiativeView):
             # Get the current embed/content to update the message
             embed, content = await new_view.create_initiative_content()
             
+            # Acknowledge first, the edit below is debounced
+            await interaction.response.defer(ephemeral=True, thinking=False)
             try:
                 # Use the actual message update here instead of trying to handle the select menu directly
                 # This preserves correct options in the select menu
-                message = await interaction.channel.fetch_message(int(self.message_id))
-                await message.edit(content=content, embed=embed, view=new_view)
+                await pinned_message_editor.edit(
+                    message_handle(interaction.channel, self.message_id),
+                    content=content, embed=embed, view=new_view
+                )
                 
                 # Let the user know that they need to select again with the proper menu
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "⚠️ The bot was restarted. The initiative view has been refreshed. Please make your selection again.",
                     ephemeral=True
                 )
             except Exception as e:
                 logging.error(f"Error updating initiative message after restart: {e}")
-                await interaction.response.send_message(
+                await interaction.followup.send(
                     "❌ Failed to update the initiative view. Please try again or restart initiative.",
                     ephemeral=True
                 )
@@ -619,11 +625,11 @@ class PopcornInitiativeView(BasePinnedInitiativeView):
 
     async def update_view(self, interaction: discord.Interaction):
         """Update the initiative pinned message with current state"""
+        if not interaction.response.is_done():
+            await interaction.response.defer(ephemeral=True, thinking=False)
         new_view = PopcornInitiativeView(self.guild_id, self.channel_id, self.initiative, self.message_id)
         embed, content = await self.create_initiative_content()
         await self.update_initiative_message(interaction, content=content, embed=embed, view=new_view)
-        if not interaction.response.is_done():
-                await interaction.response.defer(ephemeral=True, thinking=False)
 
 class SetOrderButton(ui.Button):
     def __init__(self, parent_view: GenericInitiativeView):
@@ -632,7 +638,7 @@ class SetOrderButton(ui.Button):
 
     async def callback(self, interaction: discord.Interaction):
         # Check if the user is a GM
-        gm_role_id = repositories.server.get_gm_role_id(str(interaction.guild.id))
+        gm_role_id = await repositories.aio.server.get_gm_role_id(str(interaction.guild.id))
         is_gm = False
         if gm_role_id:
             gm_role = interaction.guild.get_role(int(gm_role_id))
@@ -713,7 +719,7 @@ class SetInitiativeOrderModal(discord.ui.Modal, title="Set Initiative Order"):
             self.parent_view.initiative.current_index = 0
             
         # Save to database
-        repositories.initiative.update_initiative_state(
+        await repositories.aio.initiative.update_initiative_state(
             str(self.parent_view.guild_id), 
             str(self.parent_view.channel_id), 
             self.parent_view.initiative
@@ -738,7 +744,7 @@ class SetInitiativeOrderModal(discord.ui.Modal, title="Set Initiative Order"):
             view=new_view
         )
 
-        await interaction.response.send_message(
+        await interaction.followup.send(
             "✅ Initiative order set to " + ", ".join([p.name for p in new_order]),
             ephemeral=False
         )
\ No newline at end of file
@@ -0,0 +1,67 @@
+import time
+from contextlib import contextmanager
+from enum import Enum
+from typing import Dict
+import discord
+
+NARRATION_PREFIXES = ("gm::", "pc::", "npc::")
+
+class MessageClass(Enum):
+    """What on_message needs to do with a message, decided from attributes it already has"""
+    OWN = "own"               # Sent by this bot
+    BOT = "bot"               # Sent by another bot
+    WEBHOOK = "webhook"       # Sent through a webhook, including our own character narration
+    DIRECT = "direct"         # A DM to the bot
+    NARRATION = "narration"   # gm::, pc:: or npc:: speech
+    COMMAND = "command"       # Starts with the bot's command prefix
+    MENTION = "mention"       # Mentions users, so it may start automatic reminders
+    CHAT = "chat"             # Any other guild message
+
+def classify_message(message: discord.Message, bot_user_id: int, command_prefix: str) -> MessageClass:
+    """Classify a message without touching the database or the Discord API"""
+    if message.author.id == bot_user_id:
+        return MessageClass.OWN
+    if message.webhook_id is not None:
+        return MessageClass.WEBHOOK
+    if message.author.bot:
+        return MessageClass.BOT
+    if message.guild is None:
+        return MessageClass.DIRECT
+    content = message.content
+    if content.startswith(NARRATION_PREFIXES):
+        return MessageClass.NARRATION
+    if content.startswith(command_prefix):
+        return MessageClass.COMMAND
+    if message.mentions:
+        return MessageClass.MENTION
+    return MessageClass.CHAT
+
+class MessageDispatchStats:
+    """Messages seen and time spent handling them in on_message, per message class"""
+    def __init__(self):
+        self.counts: Dict[MessageClass, int] = {message_class: 0 for message_class in MessageClass}
+        self.seconds: Dict[MessageClass, float] = {message_class: 0.0 for message_class in MessageClass}
+
+    @contextmanager
+    def track(self, message_class: MessageClass):
+        """Count a message of message_class and add the time spent in the block to it"""
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.counts[message_class] += 1
+            self.seconds[message_class] += time.perf_counter() - start
+
+    def stats(self) -> dict:
+        """Count, total and average handling time of each message class seen so far"""
+        return {
+            message_class.value: {
+                'count': count,
+                'total_ms': round(self.seconds[message_class] * 1000, 1),
+                'avg_ms': round(self.seconds[message_class] * 1000 / count, 3)
+            }
+            for message_class, count in self.counts.items() if count
+        }
+
+# Shared by main.on_message
+message_stats = MessageDispatchStats()
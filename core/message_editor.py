@@ -0,0 +1,195 @@
+import asyncio
+import logging
+import time
+import discord
+from dataclasses import dataclass, field
+from typing import Any, Awaitable, Callable, Dict, Hashable, Iterable, List, Optional, Tuple
+
+class _PendingEdit:
+    """The latest render queued for one message, when it is due, and everyone waiting on it"""
+    __slots__ = ('message', 'fields', 'waiters', 'due')
+
+    def __init__(self, message):
+        self.message = message
+        self.fields: Dict[str, Any] = {}
+        self.waiters: List[asyncio.Future] = []
+        self.due = 0.0
+
+class CoalescingMessageEditor:
+    """
+    Debounced, coalescing editor for pinned messages that change often.
+
+    Edits are keyed by message id. Only the latest render of a message is kept;
+    it is sent once no newer render has arrived for debounce_seconds, so a burst
+    of End Turn clicks or aspect edits becomes a single PATCH. Edits in the same
+    channel share Discord's per-channel rate limit bucket, so they are sent one
+    at a time and at least min_interval_seconds apart.
+    """
+    # Channels remembered for rate limit spacing before idle ones are forgotten
+    MAX_TRACKED_CHANNELS = 1000
+
+    def __init__(self, debounce_seconds: float = 0.5, min_interval_seconds: float = 1.0):
+        self.debounce_seconds = debounce_seconds
+        self.min_interval_seconds = min_interval_seconds
+        self._pending: Dict[int, _PendingEdit] = {}
+        self._flush_tasks: Dict[int, asyncio.Task] = {}
+        self._channel_locks: Dict[int, asyncio.Lock] = {}
+        self._last_edit: Dict[int, float] = {}
+        self.submitted = 0
+        self.sent = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    async def edit(self, message, **fields):
+        """
+        Queue an edit of message (a Message or PartialMessage) and wait until it, or a newer
+        render of the same message, has been applied. Returns the edited message; raises what
+        message.edit raised if the edit fails.
+        """
+        loop = asyncio.get_running_loop()
+        pending = self._pending.get(message.id)
+        if pending is None:
+            pending = self._pending[message.id] = _PendingEdit(message)
+        else:
+            self.coalesced += 1
+        pending.message = message
+        pending.fields = fields
+        # Every new render restarts the debounce
+        pending.due = loop.time() + self.debounce_seconds
+        future = loop.create_future()
+        pending.waiters.append(future)
+        self.submitted += 1
+
+        if message.id not in self._flush_tasks:
+            self._flush_tasks[message.id] = loop.create_task(self._flush_loop(message.id))
+        return await future
+
+    async def _flush_loop(self, message_id: int):
+        loop = asyncio.get_running_loop()
+        pending = None
+        error = None
+        try:
+            # Renders queued while an edit is in flight get their own debounce and flush
+            while message_id in self._pending:
+                while self._pending[message_id].due > loop.time():
+                    await asyncio.sleep(self._pending[message_id].due - loop.time())
+                pending = self._pending.pop(message_id)
+                await self._apply(pending)
+                pending = None
+        except Exception as e:
+            error = e
+            logging.error(f"Error flushing edits of message {message_id}: {e}")
+        finally:
+            self._flush_tasks.pop(message_id, None)
+            # Don't leave callers waiting on an edit that won't be sent: hand them the error,
+            # or cancel them along with this task
+            for unsent in (pending, self._pending.pop(message_id, None)):
+                if unsent is not None:
+                    for waiter in unsent.waiters:
+                        if waiter.done():
+                            continue
+                        if error is None:
+                            waiter.cancel()
+                        else:
+                            waiter.set_exception(error)
+
+    async def _apply(self, pending: _PendingEdit):
+        loop = asyncio.get_running_loop()
+        channel_id = pending.message.channel.id
+        lock = self._channel_locks.setdefault(channel_id, asyncio.Lock())
+        async with lock:
+            wait = self._last_edit.get(channel_id, 0.0) + self.min_interval_seconds - loop.time()
+            if wait > 0:
+                await asyncio.sleep(wait)
+            try:
+                result = await pending.message.edit(**pending.fields)
+            except Exception as e:
+                self.failed += 1
+                logging.error(f"Error editing message {pending.message.id}: {e}")
+                for waiter in pending.waiters:
+                    if not waiter.done():
+                        waiter.set_exception(e)
+            else:
+                self.sent += 1
+                for waiter in pending.waiters:
+                    if not waiter.done():
+                        waiter.set_result(result)
+            finally:
+                self._last_edit[channel_id] = loop.time()
+        if len(self._last_edit) > self.MAX_TRACKED_CHANNELS:
+            self._forget_idle_channels(loop.time())
+
+        if len(pending.waiters) > 1:
+            logging.debug(f"Coalesced {len(pending.waiters)} edits of message {pending.message.id} into one")
+
+    def _forget_idle_channels(self, now: float):
+        for channel_id, last_edit in list(self._last_edit.items()):
+            lock = self._channel_locks.get(channel_id)
+            if now - last_edit >= self.min_interval_seconds and not (lock and lock.locked()):
+                del self._last_edit[channel_id]
+                self._channel_locks.pop(channel_id, None)
+
+    def stats(self) -> dict:
+        """Edits requested, edits actually sent, and edits saved by coalescing"""
+        return {
+            'submitted': self.submitted,
+            'sent': self.sent,
+            'coalesced': self.coalesced,
+            'failed': self.failed,
+            'pending': len(self._pending)
+        }
+
+# Shared by every pinned scene and initiative message
+pinned_message_editor = CoalescingMessageEditor()
+
+def message_handle(channel, message_id) -> discord.PartialMessage:
+    """A handle for editing, pinning or deleting a stored message without fetching it first"""
+    return channel.get_partial_message(int(message_id))
+
+async def edit_stored_message(channel, message_id, **fields) -> Optional[discord.Message]:
+    """
+    Edit a message whose id we stored earlier, through a partial message and the pinned message editor.
+    Returns None if the message has been deleted.
+    """
+    try:
+        return await pinned_message_editor.edit(message_handle(channel, message_id), **fields)
+    except discord.NotFound:
+        return None
+
+@dataclass
+class FanOutReport:
+    """Outcome of a fan_out: how many jobs succeeded, each failure, and the wall-clock time"""
+    succeeded: int = 0
+    errors: List[Tuple[Any, Exception]] = field(default_factory=list)
+    elapsed_seconds: float = 0.0
+
+    @property
+    def failed(self) -> int:
+        return len(self.errors)
+
+async def fan_out(jobs: Iterable[Tuple[Hashable, Any, Callable[[], Awaitable]]], max_concurrency: int = 8) -> FanOutReport:
+    """
+    Run (channel_id, label, job) jobs concurrently and collect their errors instead of stopping at the first.
+    Jobs for the same channel share its rate limit buckets and run one after another; at most
+    max_concurrency channels are worked on at once.
+    """
+    by_channel: Dict[Hashable, List[Tuple[Any, Callable[[], Awaitable]]]] = {}
+    for channel_id, label, job in jobs:
+        by_channel.setdefault(channel_id, []).append((label, job))
+
+    report = FanOutReport()
+    semaphore = asyncio.Semaphore(max_concurrency)
+
+    async def run_channel(channel_jobs):
+        async with semaphore:
+            for label, job in channel_jobs:
+                try:
+                    await job()
+                    report.succeeded += 1
+                except Exception as e:
+                    report.errors.append((label, e))
+
+    start = time.perf_counter()
+    await asyncio.gather(*(run_channel(channel_jobs) for channel_jobs in by_channel.values()))
+    report.elapsed_seconds = time.perf_counter() - start
+    return report
@@ -1,11 +1,16 @@
 from abc import ABC
-import random
 import re
-from typing import Dict, TYPE_CHECKING
+from typing import Dict, List, Tuple, TYPE_CHECKING
+from core.dice_expression import DiceLimitError, DiceSyntaxError, compile_dice, normalize
+from core.roll_odds import Distribution, OddsError, dice_distribution
 
 if TYPE_CHECKING:
     from core.base_models import BaseCharacter
 
+# Modifier values that start like a dice expression are rolled rather than read as numbers
+_DICE_MODIFIER = re.compile(r'^\d*d(\d+|f)')
+# Breakdowns are cut to this length so the result always fits in one Discord message
+MAX_BREAKDOWN_LENGTH = 1800
 
 class RollFormula(ABC):
     """
@@ -39,101 +44,92 @@ class RollFormula(ABC):
     
     def roll_formula(self, character: "BaseCharacter", base_roll: str):
         """
-        Parses and rolls a dice formula like '2d6+3-2', '1d20+5-1', '1d100', etc.
-        Modifiers can now also be dice formulas (e.g., Athletics: 1d6, mod1: 1d12+9).
+        Rolls a dice expression like '2d6+3-2', '1d20+5-1', '4d6kh3', '2d8+1d6' or '4df' plus this formula's modifiers.
+        Modifiers can also be dice expressions (e.g., Athletics: 1d6, mod1: 1d12+9).
         Returns a tuple: (result_string, total)
         The result string breaks out the formula into its elements, e.g.:
-        4df (+ - - 0) + Athletics (2) + mod1 (10)
+        4df `+ - - 0` + Athletics (2) + mod1 (1d12+9 [19])
+        """
+        modifier_descriptions, total_mod = self.roll_modifiers(character)
+
+        try:
+            expression = compile_dice(base_roll)
+        except DiceLimitError:
+            return "😵 That's a lot of dice. Try fewer.", None
+        except DiceSyntaxError:
+            return "❌ Invalid format. Use like `2d6+3-2`, `1d20+5-1`, `4d6kh3`, `2d6!`, or `4df+1`.", None
+
+        roll = expression.roll()
+        total = roll.total + total_mod
+        formula_str = roll.description
+        if modifier_descriptions:
+            formula_str += " + " + " + ".join(modifier_descriptions)
+        if len(formula_str) > MAX_BREAKDOWN_LENGTH:
+            formula_str = formula_str[:MAX_BREAKDOWN_LENGTH - 1] + "…"
+        response = f'🎲 {formula_str}\n🧮 Total: {total}'
+        return response, total
+
+    def roll_modifiers(self, character: "BaseCharacter") -> Tuple[List[str], int]:
+        """
+        Rolls or reads every modifier, returning their descriptions and their sum.
+        Values that are neither numbers nor dice expressions are skipped.
         """
         modifier_descriptions = []
         total_mod = 0
-        rolled_mods = {}
-
-        # Gather all modifiers and their sources, supporting dice formulas
         for key, value in self.get_modifiers(character).items():
-            if isinstance(value, str) and re.match(r'^\d*d\d+', value.replace(" ", "")):
+            if isinstance(value, str) and _DICE_MODIFIER.match(value.replace(" ", "").lower()):
                 mod, desc = RollFormula.roll_dice_formula(value)
-                rolled_mods[key] = mod  # Store the rolled value for later use
                 total_mod += mod
-                # Extract the total from the roll_dice_formula result (mod)
                 modifier_descriptions.append(f"{key} ({desc})")
             else:
                 try:
                     mod = int(value)
-                    rolled_mods[key] = mod
                     total_mod += mod
                     sign = "+" if mod >= 0 else ""
                     modifier_descriptions.append(f"{key} ({sign}{mod})")
                 except Exception:
                     continue
+        return modifier_descriptions, total_mod
 
-        # Build the full formula string for rolling, using the already rolled modifiers
-        formula = base_roll
-        for key, mod in rolled_mods.items():
-            if mod >= 0:
-                formula += f"+{mod}"
+    def roll_distribution(self, character: "BaseCharacter", base_roll: str) -> Tuple[Distribution, str]:
+        """
+        Exact distribution of the total roll_formula would roll, and the formula it covers, e.g.:
+        4df + Athletics (+2) + mod1 (1d6)
+        Raises DiceSyntaxError or OddsError if base_roll can't be used.
+        """
+        distribution = dice_distribution(base_roll)
+        descriptions = [normalize(base_roll)]
+        for key, value in self.get_modifiers(character).items():
+            if isinstance(value, str) and _DICE_MODIFIER.match(value.replace(" ", "").lower()):
+                try:
+                    distribution += dice_distribution(value)
+                except (DiceSyntaxError, OddsError):
+                    continue
+                descriptions.append(f"{key} ({normalize(value)})")
             else:
-                formula += f"{mod}"
-
-        formula = formula.replace(" ", "").lower()
-        fudge_pattern = r'(\d*)d[fF]((?:[+-]\d+)*)'
-        fudge_match = re.fullmatch(fudge_pattern, formula)
-        if fudge_match:
-            num_dice = int(fudge_match.group(1)) if fudge_match.group(1) else 4
-            modifiers_str = fudge_match.group(2) or ""
-            modifiers_list = [int(m) for m in re.findall(r'[+-]\d+', modifiers_str)]
-            modifier = sum(modifiers_list)
-            rolls = [random.choice([-1, 0, 1]) for _ in range(num_dice)]
-            symbols = ['+' if r == 1 else '-' if r == -1 else '0' for r in rolls]
-            total = sum(rolls) + modifier
-            # Compose the detailed formula string
-            formula_str = f"{base_roll} `{' '.join(symbols)}`"
-            if modifier_descriptions:
-                formula_str += " + " + " + ".join(modifier_descriptions)
-            response = f'🎲 {formula_str}\n🧮 Total: {total}'
-            return response, total
-
-        # Accepts 1d20+3-2, 2d6+1-1, etc.
-        pattern = r'(\d*)d(\d+)((?:[+-]\d+)*)'
-        match = re.fullmatch(pattern, formula)
-        if match:
-            num_dice = int(match.group(1)) if match.group(1) else 1
-            die_size = int(match.group(2))
-            modifiers_str = match.group(3) or ""
-            modifiers_list = [int(m) for m in re.findall(r'[+-]\d+', modifiers_str)]
-            modifier = sum(modifiers_list)
-            if num_dice > 100 or die_size > 1000:
-                return "😵 That's a lot of dice. Try fewer.", None
-            rolls = [random.randint(1, die_size) for _ in range(num_dice)]
-            total = sum(rolls) + modifier
-            # Compose the detailed formula string
-            formula_str = f"{base_roll} [{', '.join(str(r) for r in rolls)}]"
-            if modifier_descriptions:
-                formula_str += " + " + " + ".join(modifier_descriptions)
-            response = f'🎲 {formula_str}\n🧮 Total: {total}'
-            return response, total
-
-        return "❌ Invalid format. Use like `2d6+3-2`, `1d20+5-1`, `1d100`, or `4df+1`.", None
+                try:
+                    mod = int(value)
+                except Exception:
+                    continue
+                distribution = distribution.shift(mod)
+                sign = "+" if mod >= 0 else ""
+                descriptions.append(f"{key} ({sign}{mod})")
+        return distribution, " + ".join(descriptions)
 
     @staticmethod
     def roll_dice_formula(formula: str):
-        formula = formula.replace(" ", "").lower()
-        pattern = r'(\d*)d(\d+)((?:[+-]\d+)*)'
-        match = re.fullmatch(pattern, formula)
-        if match:
-            num_dice = int(match.group(1)) if match.group(1) else 1
-            die_size = int(match.group(2))
-            modifiers_str = match.group(3) or ""
-            modifiers_list = [int(m) for m in re.findall(r'[+-]\d+', modifiers_str)]
-            modifier = sum(modifiers_list)
-            rolls = [random.randint(1, die_size) for _ in range(num_dice)]
-            subtotal = sum(rolls) + modifier
-            return subtotal, f"{formula} [{subtotal}]"
-        # Try to parse as a simple integer
+        """Rolls a dice expression or reads a number, returning (subtotal, description); (0, formula) if it is neither"""
         try:
-            return int(formula), str(formula)
-        except Exception:
+            expression = compile_dice(formula)
+        except DiceSyntaxError:
             return 0, formula
+        if not expression.has_dice:
+            try:
+                return int(formula), str(formula)
+            except Exception:
+                return 0, formula
+        subtotal = expression.roll().total
+        return subtotal, f"{expression.text} [{subtotal}]"
         
     @staticmethod
     def roll_parameters_to_dict(roll_parameters: str) -> dict:
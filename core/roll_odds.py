@@ -0,0 +1,216 @@
+from collections import Counter, defaultdict
+from functools import lru_cache
+from itertools import accumulate
+from math import comb
+from typing import Dict, Sequence, Tuple
+from core.dice_expression import (
+    FUDGE_FACES, MAX_EXPLOSIONS, BinaryOp, Constant, DiceTerm, Group, Negate, Node, compile_dice, normalize
+)
+
+# Rough number of steps allowed to work out the odds of keeping dice before giving up
+MAX_KEEP_WORK = 2000000
+# Largest spread of totals (maximum - minimum) and largest len(a) * len(b) of one convolution worked out exactly
+MAX_SUPPORT = 100000
+MAX_CONVOLUTION_WORK = 5000000
+# Exploding dice are followed until the chance of exploding again drops below this
+EXPLOSION_PRECISION = 1e-12
+
+class OddsError(ValueError):
+    """The dice expression is valid but its exact odds can't be computed"""
+
+class Distribution:
+    """Exact probability of every total of a roll; probabilities[i] is the chance of rolling offset + i"""
+    __slots__ = ('offset', 'probabilities')
+
+    def __init__(self, offset: int, probabilities: Sequence[float]):
+        self.offset = offset
+        self.probabilities = tuple(probabilities)
+
+    @classmethod
+    def constant(cls, value: int) -> "Distribution":
+        return cls(value, (1.0,))
+
+    @classmethod
+    def from_counts(cls, counts: Dict[int, int]) -> "Distribution":
+        """Distribution of totals from the number of ways each total can be rolled"""
+        low, high = min(counts), max(counts)
+        outcomes = sum(counts.values())
+        return cls(low, [counts.get(total, 0) / outcomes for total in range(low, high + 1)])
+
+    @property
+    def minimum(self) -> int:
+        return self.offset
+
+    @property
+    def maximum(self) -> int:
+        return self.offset + len(self.probabilities) - 1
+
+    @property
+    def mean(self) -> float:
+        return sum((self.offset + i) * p for i, p in enumerate(self.probabilities))
+
+    def probability(self, total: int) -> float:
+        index = total - self.offset
+        return self.probabilities[index] if 0 <= index < len(self.probabilities) else 0.0
+
+    def at_least(self, total: int) -> float:
+        """Chance of rolling total or more"""
+        index = max(total - self.offset, 0)
+        return min(sum(self.probabilities[index:]), 1.0)
+
+    def shift(self, amount: int) -> "Distribution":
+        return Distribution(self.offset + amount, self.probabilities)
+
+    def negate(self) -> "Distribution":
+        return Distribution(-self.maximum, self.probabilities[::-1])
+
+    def scale(self, factor: int) -> "Distribution":
+        if factor == 0:
+            return Distribution.constant(0)
+        if factor < 0:
+            return self.scale(-factor).negate()
+        _check_support((len(self.probabilities) - 1) * factor)
+        probabilities = [0.0] * ((len(self.probabilities) - 1) * factor + 1)
+        probabilities[::factor] = self.probabilities
+        return Distribution(self.offset * factor, probabilities)
+
+    def __add__(self, other: "Distribution") -> "Distribution":
+        """Distribution of the sum of two independent rolls"""
+        if len(self.probabilities) * len(other.probabilities) > MAX_CONVOLUTION_WORK:
+            raise OddsError("Too many possible totals to work out exact odds")
+        _check_support(self.maximum - self.minimum + other.maximum - other.minimum)
+        return Distribution(self.offset + other.offset, _convolve(self.probabilities, other.probabilities))
+
+    def __repr__(self):
+        return f"Distribution({self.minimum}..{self.maximum}, mean={self.mean:.2f})"
+
+def _check_support(spread: int) -> None:
+    if spread > MAX_SUPPORT:
+        raise OddsError(f"Totals spread over more than {MAX_SUPPORT} values, too many to work out exact odds")
+
+def _convolve(a: Sequence[float], b: Sequence[float]) -> list:
+    if len(a) < len(b):
+        a, b = b, a
+    result = [0.0] * (len(a) + len(b) - 1)
+    for shift, weight in enumerate(b):
+        if weight:
+            for i, p in enumerate(a, shift):
+                result[i] += p * weight
+    return result
+
+@lru_cache(maxsize=512)
+def uniform_pool(count: int, low: int, faces: int) -> Distribution:
+    """count dice whose faces are low .. low + faces - 1"""
+    if count == 0:
+        return Distribution.constant(0)
+    # Ways to roll each total are the coefficients of (1 + x + ... + x^(faces-1))^count,
+    # i.e. (1 - x^faces)^count divided by (1 - x)^count: a sparse series followed by count running sums
+    _check_support(count * (faces - 1))
+    size = count * (faces - 1) + 1
+    ways = [0] * size
+    for k in range((size - 1) // faces + 1):
+        ways[k * faces] = (-1) ** k * comb(count, k)
+    for _ in range(count):
+        ways = list(accumulate(ways))
+    outcomes = faces ** count
+    return Distribution(low * count, [w / outcomes for w in ways])
+
+@lru_cache(maxsize=256)
+def exploding_die(sides: int) -> Distribution:
+    """One die that rolls again and adds whenever it shows its highest face"""
+    counts = {}
+    chance = 1.0 / sides
+    explosions = 0
+    while True:
+        for face in range(1, sides):
+            counts[explosions * sides + face] = chance
+        explosions += 1
+        if chance < EXPLOSION_PRECISION or explosions > MAX_EXPLOSIONS:
+            break
+        chance /= sides
+    low = min(counts)
+    return Distribution(low, [counts.get(total, 0.0) for total in range(low, max(counts) + 1)])
+
+@lru_cache(maxsize=256)
+def exploding_pool(count: int, sides: int) -> Distribution:
+    if count == 1:
+        return exploding_die(sides)
+    half = exploding_pool(count // 2, sides)
+    pool = half + half
+    if count % 2:
+        pool += exploding_die(sides)
+    # Drop the long tail of totals only reachable by many explosions
+    probabilities = pool.probabilities
+    end = len(probabilities)
+    while end > 1 and probabilities[end - 1] < EXPLOSION_PRECISION:
+        end -= 1
+    return Distribution(pool.offset, probabilities[:end])
+
+@lru_cache(maxsize=256)
+def keep_pool(count: int, faces: Tuple[int, ...], highest: bool, keep: int) -> Distribution:
+    """Total of the keep highest (or lowest) of count dice"""
+    if len(faces) * (count + 1) ** 2 * (keep * (len(faces) - 1) + 1) > MAX_KEEP_WORK:
+        raise OddsError(f"Too many dice to work out exact odds for keeping {keep} of {count}")
+    # Hand out the dice face by face, best face first: dice placed so far -> {kept total: ways}.
+    # The first keep dice placed are the ones kept.
+    states = {0: Counter({0: 1})}
+    for face in (faces[::-1] if highest else faces):
+        next_states = defaultdict(Counter)
+        for placed, totals in states.items():
+            remaining = count - placed
+            for showing in range(remaining + 1):
+                ways = comb(remaining, showing)
+                added = (min(placed + showing, keep) - min(placed, keep)) * face
+                target = next_states[placed + showing]
+                for total, n in totals.items():
+                    target[total + added] += n * ways
+        states = next_states
+    return Distribution.from_counts(states[count])
+
+def term_distribution(term: DiceTerm) -> Distribution:
+    if term.is_fudge:
+        low, faces = FUDGE_FACES[0], len(FUDGE_FACES)
+    else:
+        low, faces = 1, term.sides
+    if term.keep and term.keep[1] < term.count:
+        if term.explode:
+            raise OddsError(f"Exact odds for '{term.text}' (exploding dice that are also kept) aren't supported")
+        direction, keep = term.keep
+        return keep_pool(term.count, tuple(range(low, low + faces)), direction == 'h', keep)
+    if term.explode:
+        return exploding_pool(term.count, term.sides)
+    return uniform_pool(term.count, low, faces)
+
+def node_distribution(node: Node) -> Distribution:
+    if isinstance(node, Constant):
+        return Distribution.constant(node.value)
+    if isinstance(node, DiceTerm):
+        return term_distribution(node)
+    if isinstance(node, Negate):
+        return node_distribution(node.operand).negate()
+    if isinstance(node, Group):
+        return node_distribution(node.inner)
+    if isinstance(node, BinaryOp):
+        left, right = node_distribution(node.left), node_distribution(node.right)
+        if node.op == '+':
+            return left + right
+        if node.op == '-':
+            return left + right.negate()
+        if node.op == '*':
+            if len(right.probabilities) == 1:
+                return left.scale(right.minimum)
+            if len(left.probabilities) == 1:
+                return right.scale(left.minimum)
+            raise OddsError("Exact odds for multiplying two rolls together aren't supported")
+    raise OddsError(f"Unsupported dice expression node {node!r}")
+
+@lru_cache(maxsize=1024)
+def _dice_distribution(text: str) -> Distribution:
+    return node_distribution(compile_dice(text).root)
+
+def dice_distribution(expression: str) -> Distribution:
+    """
+    Exact distribution of a dice expression's total. Raises DiceSyntaxError for invalid
+    expressions and OddsError for ones whose odds can't be computed exactly.
+    """
+    return _dice_distribution(normalize(expression))
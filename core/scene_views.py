@@ -4,6 +4,7 @@ import discord
 from discord import ui
 from discord.ext import commands
 from core import factories
+from core.message_editor import message_handle, pinned_message_editor
 from data.repositories.repository_factory import repositories
 
 class BasePinnableSceneView(ABC, discord.ui.View):
@@ -42,7 +43,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
         """Initialize the view if it was loaded as a persistent view"""
         if not self.is_initialized:
             # Get scene ID from the database for this channel
-            scene_info = repositories.pinned_scene.get_scene_message_info(str(interaction.guild.id), str(interaction.channel.id))
+            scene_info = await repositories.aio.pinned_scene.get_scene_message_info(str(interaction.guild.id), str(interaction.channel.id))
             if not scene_info:
                 return False
                 
@@ -69,15 +70,14 @@ class BasePinnableSceneView(ABC, discord.ui.View):
             # Check if we have a stored message ID
             if self.message_id:
                 try:
-                    # Try to fetch the existing message
+                    # Use a handle to the existing message; it is only fetched if an edit finds it missing
                     channel = interaction.guild.get_channel(int(self.channel_id))
                     if not channel:
                         channel = await interaction.guild.fetch_channel(int(self.channel_id))
                         
-                    message = await channel.fetch_message(int(self.message_id))
-                    return message
+                    return message_handle(channel, self.message_id)
                 except discord.NotFound:
-                    # Message was deleted, we'll create a new one
+                    # Channel was deleted, we'll create a new message
                     pass
                 except Exception as e:
                     logging.error(f"Error fetching scene message: {e}")
@@ -113,7 +113,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
         """
         try:
             # Check if the scene is active - only active scenes can be pinned
-            scene = repositories.scene.find_by_id('scene_id', self.scene_id)
+            scene = await repositories.aio.scene.find_by_id('scene_id', self.scene_id)
             if not scene or not scene.is_active:
                 await interaction.followup.send(
                     "❌ Only the active scene can be pinned.",
@@ -130,7 +130,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
             await message.pin()
             
             # Store the message ID in the pinned messages database
-            repositories.pinned_scene.set_pinned_message(str(self.guild_id), str(self.scene_id), str(self.channel_id), str(message.id))
+            await repositories.aio.pinned_scene.set_pinned_message(str(self.guild_id), str(self.scene_id), str(self.channel_id), str(message.id))
             
             # Send a temporary message indicating the scene has been pinned
             temp_msg = await interaction.channel.send("📌 Scene view has been pinned. You can always find the current scene at the top of the channel.")
@@ -180,15 +180,20 @@ class BasePinnableSceneView(ABC, discord.ui.View):
             return None
             
         try:
-            # Always use message.edit rather than interaction.response.edit_message
-            # This ensures we're updating the pinned message, not responding to the interaction
-            await message.edit(content=content, embed=embed, view=view)
-            
-            # If the interaction hasn't been responded to yet, send a deferred message update
-            # or acknowledge the interaction to prevent "interaction failed" errors
+            # Acknowledge the interaction first to prevent "interaction failed" errors,
+            # since the edit below is debounced and may take a moment to go out
             if not interaction.response.is_done():
                 await interaction.response.defer(ephemeral=True, thinking=False)
                 
+            # Always edit the pinned message rather than interaction.response.edit_message
+            # This ensures we're updating the pinned message, not responding to the interaction
+            try:
+                await pinned_message_editor.edit(message, content=content, embed=embed, view=view)
+            except discord.NotFound:
+                # Message was deleted since we stored its id, send a new one with the current content
+                self.message_id = None
+                message = await self.get_scene_message(interaction)
+                
             return message
         except Exception as e:
             logging.error(f"Error updating scene message: {e}")
@@ -211,7 +216,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
         Both should always be updated for active scenes.
         """
         # Check if this scene is active
-        scene = repositories.scene.find_by_id('scene_id', self.scene_id)
+        scene = await repositories.aio.scene.find_by_id('scene_id', self.scene_id)
         is_active = scene and scene.is_active
         
         # Get the current content
@@ -232,7 +237,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
         
         # Always update the ephemeral view for the current user
         # Create a view with proper GM permissions for the ephemeral message
-        system = repositories.server.get_system(str(self.guild_id))
+        system = await repositories.aio.server.get_system(str(self.guild_id))
         ephemeral_view = factories.get_specific_scene_view(
             system=system,
             guild_id=self.guild_id, 
@@ -268,7 +273,8 @@ class BasePinnableSceneView(ABC, discord.ui.View):
             await message.unpin()
             
             # Update the message to show it's no longer active
-            await message.edit(
+            await pinned_message_editor.edit(
+                message,
                 content="🛑 **SCENE TRACKING DISABLED** 🛑",
                 embed=discord.Embed(
                     title="Scene Tracking Disabled",
@@ -279,7 +285,7 @@ class BasePinnableSceneView(ABC, discord.ui.View):
             )
             
             # Remove the message from the pinned messages database
-            repositories.pinned_scene.clear_all_pins(str(self.guild_id))
+            await repositories.aio.pinned_scene.clear_all_pins(str(self.guild_id))
             
             return True
         except Exception as e:
@@ -339,28 +345,24 @@ class GenericSceneView(BasePinnableSceneView):
     """Generic implementation of pinned scene view"""
     
     async def create_scene_content(self):
-        # Get scene info
-        scene = repositories.scene.find_by_id('scene_id', self.scene_id)
-        if not scene:
+        # Load the scene, its NPCs and notes in one query
+        snapshot = await repositories.aio.scene_snapshot.load(str(self.guild_id), str(self.scene_id))
+        if not snapshot:
             return discord.Embed(
                 title="❌ Scene Not Found",
                 description="This scene no longer exists.",
                 color=discord.Color.red()
             ), "❌ **SCENE ERROR** ❌"
         
-        # Get NPCs in scene
-        npc_ids = repositories.scene_npc.get_scene_npc_ids(str(self.guild_id), str(self.scene_id))
+        scene = snapshot.scene
         
         # Format scene content
         lines = []
-        for npc_id in npc_ids:
-            npc = repositories.entity.get_by_id(str(npc_id))
-            if npc:
-                # Show NPC details for everyone
-                lines.append(npc.format_npc_scene_entry(is_gm=False))
+        for npc in snapshot.npcs:
+            # Show NPC details for everyone
+            lines.append(npc.format_npc_scene_entry(is_gm=False))
                 
-        # Get scene notes
-        notes = repositories.scene_notes.get_scene_notes(str(self.guild_id), str(self.scene_id))
+        notes = snapshot.notes
         
         # Create embed
         embed = discord.Embed(
@@ -426,7 +428,7 @@ class SceneNotesModal(discord.ui.Modal, title="Edit Scene Notes"):
 
     async def on_submit(self, interaction: discord.Interaction):
         # Update notes in DB
-        repositories.scene_notes.set_scene_notes(str(self.parent_view.guild_id), str(self.parent_view.scene_id), self.notes.value)
+        await repositories.aio.scene_notes.set_scene_notes(str(self.parent_view.guild_id), str(self.parent_view.scene_id), self.notes.value)
         
         # Find any SceneCommands cog instance to use its update method
         scene_cog = None
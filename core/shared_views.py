@@ -113,11 +113,7 @@ class EditSceneNotesModal(discord.ui.Modal, title="Edit Scene Notes"):
         is_gm = await repositories.server.has_gm_permission(str(interaction.guild.id), interaction.user)
         active_scene = repositories.scene.get_active_scene(str(self.guild_id))
         
-        lines = []
-        for npc_id in npc_ids:
-            npc = repositories.entity.get_by_id(str(npc_id))
-            if npc:
-                lines.append(npc.format_npc_scene_entry(is_gm))
+        lines = [npc.format_npc_scene_entry(is_gm) for npc in repositories.entity.get_by_ids(npc_ids)]
                 
         notes = repositories.scene_notes.get_scene_notes(str(self.guild_id), str(self.scene_id))
         description = ""
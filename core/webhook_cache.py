@@ -0,0 +1,97 @@
+import asyncio
+from collections import OrderedDict
+from typing import Dict
+import discord
+
+CHARACTER_WEBHOOK_NAME = "PlayByPostBotCharacters"
+
+class WebhookCache:
+    """
+    Per-channel cache of the webhook used to post as characters.
+
+    Warmed lazily: the first post in a channel lists its webhooks (creating ours
+    if it is missing) and later posts reuse the result. Entries are dropped when
+    Discord reports the webhook missing or it no longer shows up in the channel's
+    webhooks, and the least recently used channel is evicted once max_channels is reached.
+    """
+    def __init__(self, max_channels: int = 1000):
+        self.max_channels = max_channels
+        self._webhooks: "OrderedDict[int, discord.Webhook]" = OrderedDict()
+        # One lookup per channel at a time, so concurrent posts don't create duplicate webhooks
+        self._locks: Dict[int, asyncio.Lock] = {}
+        # Lookups holding or waiting for each channel's lock; the lock is dropped when the last one leaves
+        self._lock_users: Dict[int, int] = {}
+        self.hits = 0
+        self.list_calls = 0
+        self.invalidations = 0
+
+    async def get(self, channel: discord.TextChannel) -> discord.Webhook:
+        """The character webhook for channel, listing or creating it only on a cache miss"""
+        webhook = self._cached(channel.id)
+        if webhook:
+            return webhook
+
+        lock = self._locks.setdefault(channel.id, asyncio.Lock())
+        self._lock_users[channel.id] = self._lock_users.get(channel.id, 0) + 1
+        try:
+            async with lock:
+                # Another post may have warmed the cache while we waited
+                webhook = self._cached(channel.id)
+                if webhook:
+                    return webhook
+
+                self.list_calls += 1
+                webhook = next((wh for wh in await channel.webhooks() if wh.name == CHARACTER_WEBHOOK_NAME), None)
+                if webhook is None:
+                    webhook = await channel.create_webhook(name=CHARACTER_WEBHOOK_NAME)
+
+                self._webhooks[channel.id] = webhook
+                while len(self._webhooks) > self.max_channels:
+                    self._webhooks.popitem(last=False)
+                return webhook
+        finally:
+            self._lock_users[channel.id] -= 1
+            if not self._lock_users[channel.id]:
+                del self._lock_users[channel.id]
+                del self._locks[channel.id]
+
+    def _cached(self, channel_id: int):
+        webhook = self._webhooks.get(channel_id)
+        if webhook is not None:
+            self._webhooks.move_to_end(channel_id)
+            self.hits += 1
+        return webhook
+
+    def invalidate(self, channel_id: int) -> None:
+        """Forget the webhook cached for a channel"""
+        if self._webhooks.pop(channel_id, None) is not None:
+            self.invalidations += 1
+
+    async def invalidate_if_missing(self, channel: discord.TextChannel) -> None:
+        """
+        Forget the webhook cached for channel if the channel no longer lists it.
+        Webhook updates also fire for the webhook we just created, so the cached one is kept while it exists.
+        """
+        webhook = self._webhooks.get(channel.id)
+        if webhook is None:
+            return
+        self.list_calls += 1
+        try:
+            webhook_ids = {wh.id for wh in await channel.webhooks()}
+        except discord.HTTPException:
+            webhook_ids = set()
+        # Only drop the entry we checked; a newer lookup may have replaced it meanwhile
+        if webhook.id not in webhook_ids and self._webhooks.get(channel.id) is webhook:
+            self.invalidate(channel.id)
+
+    def stats(self) -> dict:
+        """Cached channels, webhook list calls made, and list calls saved by the cache"""
+        return {
+            'channels': len(self._webhooks),
+            'list_calls': self.list_calls,
+            'saved_list_calls': self.hits,
+            'invalidations': self.invalidations
+        }
+
+# Shared by all character narration
+character_webhooks = WebhookCache()
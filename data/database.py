@@ -1,19 +1,217 @@
 import os
+import time
+import threading
+from collections import deque
+from contextvars import ContextVar
 import psycopg2
+from psycopg2 import extensions
 from psycopg2.extras import RealDictCursor
 from contextlib import contextmanager
 import logging
 
+class PoolTimeoutError(Exception):
+    """Raised when no pooled connection becomes available in time"""
+    pass
+
+class ConnectionPool:
+    """
+    Thread-safe pool of psycopg2 connections.
+
+    Connections are validated when checked out, and connections that have sat
+    idle longer than max_idle_seconds are closed and replaced (recycled).
+    """
+    def __init__(self, connect, min_size: int = 1, max_size: int = 10,
+                 max_idle_seconds: float = 300.0, checkout_timeout: float = 30.0):
+        if min_size < 0 or max_size < 1 or min_size > max_size:
+            raise ValueError(f"Invalid pool sizes: min_size={min_size}, max_size={max_size}")
+        self._connect = connect
+        self.min_size = min_size
+        self.max_size = max_size
+        self.max_idle_seconds = max_idle_seconds
+        self.checkout_timeout = checkout_timeout
+
+        self._idle = deque()  # (connection, last_used) pairs, most recently used on the right
+        self._cond = threading.Condition()
+        self._in_use = 0
+        self._waiting = 0
+        self._created = 0
+        self._recycled = 0
+        self._closed = False
+
+        for _ in range(min_size):
+            self._idle.append((self._new_connection(), time.monotonic()))
+
+    def _new_connection(self):
+        conn = self._connect()
+        with self._cond:
+            self._created += 1
+        return conn
+
+    def _refill(self, count: int) -> None:
+        """Open count connections whose slots the caller reserved, and add them to the idle set"""
+        for _ in range(count):
+            try:
+                conn = self._new_connection()
+            except Exception as e:
+                logging.warning(f"Could not top the database pool back up to min_size: {e}")
+                conn = None
+            with self._cond:
+                self._in_use -= 1
+                if conn is not None:
+                    if self._closed:
+                        self._discard(conn)
+                    else:
+                        self._idle.append((conn, time.monotonic()))
+                self._cond.notify()
+
+    def _discard(self, conn) -> None:
+        try:
+            if not conn.closed:
+                conn.close()
+        except Exception:
+            pass
+
+    def _is_usable(self, conn) -> bool:
+        """Health check run on every checkout"""
+        if conn.closed:
+            return False
+        try:
+            with conn.cursor() as cur:
+                cur.execute("SELECT 1")
+            conn.rollback()
+            return True
+        except Exception:
+            return False
+
+    def _total(self) -> int:
+        return self._in_use + len(self._idle)
+
+    def _recycle_idle(self) -> None:
+        """Close connections that have been idle too long. Caller must hold the lock."""
+        if self.max_idle_seconds is None:
+            return
+        cutoff = time.monotonic() - self.max_idle_seconds
+        # Oldest connections are on the left
+        while self._idle and self._idle[0][1] < cutoff:
+            conn, _ = self._idle.popleft()
+            self._discard(conn)
+            self._recycled += 1
+
+    def getconn(self):
+        """Check a validated connection out of the pool"""
+        deadline = time.monotonic() + self.checkout_timeout
+        with self._cond:
+            if self._closed:
+                raise PoolTimeoutError("Connection pool is closed")
+            self._recycle_idle()
+            while True:
+                if self._idle:
+                    conn, _ = self._idle.pop()
+                    self._in_use += 1
+                    break
+                if self._total() < self.max_size:
+                    # Reserve the slot before connecting outside the lock
+                    self._in_use += 1
+                    conn = None
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise PoolTimeoutError(
+                        f"Timed out after {self.checkout_timeout}s waiting for a database connection"
+                    )
+                self._waiting += 1
+                try:
+                    self._cond.wait(remaining)
+                finally:
+                    self._waiting -= 1
+
+            # Reserve slots to top the pool back up to min_size after recycling
+            refill = max(0, self.min_size - self._total())
+            self._in_use += refill
+
+        self._refill(refill)
+        try:
+            if conn is not None and not self._is_usable(conn):
+                logging.warning("Discarding broken pooled database connection")
+                self._discard(conn)
+                with self._cond:
+                    self._recycled += 1
+                conn = None
+            if conn is None:
+                conn = self._new_connection()
+            return conn
+        except Exception:
+            with self._cond:
+                self._in_use -= 1
+                self._cond.notify()
+            raise
+
+    def putconn(self, conn, discard: bool = False) -> None:
+        """Return a connection to the pool"""
+        if not discard and not conn.closed:
+            try:
+                # Never hand out a connection with an open transaction
+                if conn.get_transaction_status() != extensions.TRANSACTION_STATUS_IDLE:
+                    conn.rollback()
+            except Exception:
+                discard = True
+
+        with self._cond:
+            self._in_use -= 1
+            if discard or conn.closed or self._closed:
+                self._discard(conn)
+            else:
+                self._idle.append((conn, time.monotonic()))
+            self._cond.notify()
+
+    def closeall(self) -> None:
+        """Close every idle connection and refuse further checkouts"""
+        with self._cond:
+            self._closed = True
+            while self._idle:
+                conn, _ = self._idle.pop()
+                self._discard(conn)
+            self._cond.notify_all()
+
+    def stats(self) -> dict:
+        """Snapshot of pool usage counters"""
+        with self._cond:
+            return {
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'waiting': self._waiting,
+                'created': self._created,
+                'recycled': self._recycled,
+                'min_size': self.min_size,
+                'max_size': self.max_size
+            }
+
+class Transaction:
+    """A connection and cursor pinned for the duration of a transaction() block"""
+    def __init__(self, conn):
+        self.conn = conn
+        self.cursor = conn.cursor(cursor_factory=RealDictCursor)
+        # Set when a query inside the block fails; the block then rolls back instead of committing
+        self.rollback_only = False
+        # Callbacks to run once the block has committed
+        self.on_commit = []
+
+# The transaction active for the current thread / asyncio task, if any
+_current_transaction: ContextVar[Transaction] = ContextVar('current_transaction', default=None)
+
 class DatabaseConnection:
     def __init__(self):
         self.connection_params = self._get_connection_params()
-    
+        self.pool_config = self._get_pool_config()
+        self._pool = None
+        self._pool_lock = threading.Lock()
+
     def _get_connection_params(self):
         # Railway provides DATABASE_URL automatically
         database_url = os.getenv('DATABASE_URL')
         if database_url:
             return {'dsn': database_url}
-        
+
         # Fallback for local development
         return {
             'host': os.getenv('DB_HOST', 'localhost'),
@@ -22,24 +220,154 @@ class DatabaseConnection:
             'user': os.getenv('DB_USER', 'postgres'),
             'password': os.getenv('DB_PASSWORD', 'password')
         }
-    
+
+    def _get_pool_config(self):
+        return {
+            'min_size': int(os.getenv('DB_POOL_MIN_SIZE', '1')),
+            'max_size': int(os.getenv('DB_POOL_MAX_SIZE', '10')),
+            'max_idle_seconds': float(os.getenv('DB_POOL_MAX_IDLE_SECONDS', '300')),
+            'checkout_timeout': float(os.getenv('DB_POOL_CHECKOUT_TIMEOUT', '30'))
+        }
+
+    def _connect(self):
+        if 'dsn' in self.connection_params:
+            return psycopg2.connect(self.connection_params['dsn'], cursor_factory=RealDictCursor)
+        return psycopg2.connect(**self.connection_params, cursor_factory=RealDictCursor)
+
+    @property
+    def pool(self) -> ConnectionPool:
+        """The connection pool, created on first use"""
+        if self._pool is None:
+            with self._pool_lock:
+                if self._pool is None:
+                    self._pool = ConnectionPool(self._connect, **self.pool_config)
+        return self._pool
+
+    def configure_pool(self, min_size: int = None, max_size: int = None,
+                       max_idle_seconds: float = None, checkout_timeout: float = None) -> None:
+        """Override pool settings. Takes effect the next time the pool is created."""
+        overrides = {
+            'min_size': min_size,
+            'max_size': max_size,
+            'max_idle_seconds': max_idle_seconds,
+            'checkout_timeout': checkout_timeout
+        }
+        self.pool_config.update({k: v for k, v in overrides.items() if v is not None})
+        self.close_pool()
+
+    def close_pool(self) -> None:
+        with self._pool_lock:
+            if self._pool is not None:
+                self._pool.closeall()
+                self._pool = None
+
+    def pool_stats(self) -> dict:
+        """Usage counters for the connection pool (in use, waiting, created, recycled)"""
+        if self._pool is None:
+            return {'in_use': 0, 'idle': 0, 'waiting': 0, 'created': 0, 'recycled': 0,
+                    'min_size': self.pool_config['min_size'], 'max_size': self.pool_config['max_size']}
+        return self._pool.stats()
+
+    @property
+    def in_transaction(self) -> bool:
+        return _current_transaction.get() is not None
+
     @contextmanager
-    def get_connection(self):
-        conn = None
+    def transaction(self):
+        """
+        Run every query in the block on one pinned connection and cursor and commit once at the end.
+        Nested transaction() blocks join the enclosing transaction.
+        """
+        outer = _current_transaction.get()
+        if outer is not None:
+            yield outer
+            return
+
+        pool = self.pool
+        conn = pool.getconn()
+        tx = Transaction(conn)
+        token = _current_transaction.set(tx)
+        discard = False
+        committed = False
         try:
-            if 'dsn' in self.connection_params:
-                conn = psycopg2.connect(self.connection_params['dsn'], cursor_factory=RealDictCursor)
+            yield tx
+            if tx.rollback_only:
+                conn.rollback()
+                logging.error("Transaction rolled back because a query inside it failed")
             else:
-                conn = psycopg2.connect(**self.connection_params, cursor_factory=RealDictCursor)
+                conn.commit()
+                committed = True
+        except Exception as e:
+            try:
+                conn.rollback()
+            except Exception:
+                discard = True
+            logging.error(f"Database error: {e}")
+            raise
+        finally:
+            _current_transaction.reset(token)
+            try:
+                tx.cursor.close()
+            except Exception:
+                pass
+            pool.putconn(conn, discard=discard or conn.closed)
+        if committed:
+            for callback in tx.on_commit:
+                try:
+                    callback()
+                except Exception as e:
+                    logging.error(f"Error in after-commit callback: {e}")
+
+    def after_commit(self, callback) -> None:
+        """Run callback once the current transaction commits (never, if it rolls back), or right away outside one"""
+        tx = _current_transaction.get()
+        if tx is None:
+            callback()
+        else:
+            tx.on_commit.append(callback)
+
+    @contextmanager
+    def get_cursor(self):
+        """Cursor for a single query, shared with the enclosing transaction if there is one"""
+        tx = _current_transaction.get()
+        if tx is not None:
+            try:
+                yield tx.cursor
+            except Exception:
+                tx.rollback_only = True
+                raise
+            return
+
+        with self.get_connection() as conn:
+            with conn.cursor(cursor_factory=RealDictCursor) as cur:
+                yield cur
+
+    @contextmanager
+    def get_connection(self):
+        tx = _current_transaction.get()
+        if tx is not None:
+            # Inside a transaction: share its connection, the commit happens when it ends
+            try:
+                yield tx.conn
+            except Exception:
+                tx.rollback_only = True
+                raise
+            return
+
+        pool = self.pool
+        conn = pool.getconn()
+        discard = False
+        try:
             yield conn
             conn.commit()
         except Exception as e:
-            if conn:
+            try:
                 conn.rollback()
+            except Exception:
+                discard = True
             logging.error(f"Database error: {e}")
             raise
         finally:
-            if conn:
-                conn.close()
+            pool.putconn(conn, discard=discard or conn.closed)
 
-db_manager = DatabaseConnection()
\ No newline at end of file
+db_manager = DatabaseConnection()
@@ -220,6 +220,7 @@ CREATE TABLE IF NOT EXISTS entity_links (
 
 -- Indexes for performance
 CREATE INDEX IF NOT EXISTS idx_scenes_guild_active ON scenes(guild_id, is_active);
+CREATE INDEX IF NOT EXISTS idx_scenes_guild_lower_name ON scenes(guild_id, LOWER(name));
 
 CREATE INDEX IF NOT EXISTS idx_reminders_timestamp ON reminders(timestamp);
 
@@ -0,0 +1,90 @@
+import asyncio
+import functools
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Any, Callable, Generic, List, Optional, TypeVar
+from data.database import db_manager
+from .base_repository import BaseRepository
+
+T = TypeVar('T')
+
+_db_executor: Optional[ThreadPoolExecutor] = None
+_db_executor_workers = 0
+_db_executor_lock = threading.Lock()
+
+def _get_db_executor() -> ThreadPoolExecutor:
+    """The DB executor, created on first use and recreated if configure_pool changed max_size"""
+    global _db_executor, _db_executor_workers
+    # One worker per pooled connection, so executor threads never queue on the pool
+    max_workers = db_manager.pool_config['max_size']
+    with _db_executor_lock:
+        if _db_executor is None or _db_executor_workers != max_workers:
+            if _db_executor is not None:
+                # Calls already queued on the old executor still finish
+                _db_executor.shutdown(wait=False)
+            _db_executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='db')
+            _db_executor_workers = max_workers
+        return _db_executor
+
+async def run_in_db_executor(func: Callable, *args, **kwargs) -> Any:
+    """Run a blocking database call on the bounded DB executor and await its result"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_get_db_executor(), functools.partial(func, *args, **kwargs))
+
+class AsyncRepository(Generic[T]):
+    """
+    Awaitable counterpart of BaseRepository.
+
+    Wraps a synchronous repository and runs its queries on the bounded DB executor
+    so they don't block the Discord event loop. Repository-specific methods
+    (e.g. get_by_id, get_active_character) are exposed as coroutines as well.
+    """
+    def __init__(self, repository: BaseRepository[T]):
+        self.sync = repository
+        self.table_name = repository.table_name
+
+    async def execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, select_override: bool = False):
+        """Execute a query and return results"""
+        return await run_in_db_executor(self.sync.execute_query, query, params, fetch_one, select_override)
+
+    async def find_by_id(self, id_column: str, id_value: str) -> Optional[T]:
+        """Find entity by ID"""
+        return await run_in_db_executor(self.sync.find_by_id, id_column, id_value)
+
+    async def find_all_by_column(self, column: str, value: str) -> List[T]:
+        """Find all entities by column value"""
+        return await run_in_db_executor(self.sync.find_all_by_column, column, value)
+
+    async def save(self, entity: T, conflict_columns: List[str] = None) -> Optional[int]:
+        """Save entity with upsert logic, returns rows written (None on error)"""
+        return await run_in_db_executor(self.sync.save, entity, conflict_columns)
+
+    async def delete(self, where_clause: str, params: tuple = None) -> int:
+        """Delete entities matching where clause"""
+        return await run_in_db_executor(self.sync.delete, where_clause, params)
+
+    def __getattr__(self, name: str):
+        attr = getattr(self.sync, name)
+        if not callable(attr) or asyncio.iscoroutinefunction(attr):
+            # Plain attributes and methods that are already awaitable pass through
+            return attr
+
+        @functools.wraps(attr)
+        async def wrapper(*args, **kwargs):
+            return await run_in_db_executor(attr, *args, **kwargs)
+        return wrapper
+
+class AsyncRepositoryFactory:
+    """Exposes every repository of a RepositoryFactory as an AsyncRepository"""
+    def __init__(self, factory):
+        self._factory = factory
+        self._repos = {}
+
+    def __getattr__(self, name: str) -> AsyncRepository:
+        if name.startswith('_'):
+            raise AttributeError(name)
+        repo = self._repos.get(name)
+        if repo is None:
+            repo = AsyncRepository(getattr(self._factory, name))
+            self._repos[name] = repo
+        return repo
@@ -23,8 +23,7 @@ class BaseRepository(Generic[T], ABC):
     def execute_query(self, query: str, params: tuple = None, fetch_one: bool = False, select_override: bool = False):
         """Execute a query and return results"""
         try:
-            with db_manager.get_connection() as conn:
-                cur = conn.cursor(cursor_factory=psycopg2.extras.RealDictCursor)
+            with db_manager.get_cursor() as cur:
                 cur.execute(query, params or ())
                 
                 # Only try to fetch if this is a SELECT query
@@ -49,6 +48,15 @@ class BaseRepository(Generic[T], ABC):
             else:
                 return None
     
+    def select_or_raise(self, query: str, params: tuple = None, fetch_one: bool = False):
+        """Like execute_query for a SELECT, but database errors raise instead of looking like an empty result"""
+        with db_manager.get_cursor() as cur:
+            cur.execute(query, params or ())
+            if fetch_one:
+                result = cur.fetchone()
+                return self.from_dict(dict(result)) if result else None
+            return [self.from_dict(dict(row)) for row in cur.fetchall()]
+    
     def find_by_id(self, id_column: str, id_value: str) -> Optional[T]:
         """Find entity by ID"""
         query = f"SELECT * FROM {self.table_name} WHERE {id_column} = %s"
@@ -59,8 +67,27 @@ class BaseRepository(Generic[T], ABC):
         query = f"SELECT * FROM {self.table_name} WHERE {column} = %s"
         return self.execute_query(query, (value,))
     
-    def save(self, entity: T, conflict_columns: List[str] = None) -> None:
-        """Save entity with upsert logic"""
+    def _on_conflict_clause(self, columns: List[str], conflict_columns: List[str] = None) -> str:
+        """Build the ON CONFLICT clause used by save and save_many"""
+        if not conflict_columns:
+            return ""
+        
+        # Add ON CONFLICT DO UPDATE for PostgreSQL
+        conflict_cols = ', '.join(conflict_columns)
+        
+        # Only include columns that are NOT in the conflict columns for the UPDATE
+        update_columns = [col for col in columns if col not in conflict_columns]
+        
+        if update_columns:
+            # There are columns to update
+            update_cols = ', '.join([f"{col} = EXCLUDED.{col}" for col in update_columns])
+            return f" ON CONFLICT ({conflict_cols}) DO UPDATE SET {update_cols}"
+        
+        # All columns are part of the primary key/conflict, so just ignore duplicates
+        return f" ON CONFLICT ({conflict_cols}) DO NOTHING"
+
+    def save(self, entity: T, conflict_columns: List[str] = None) -> Optional[int]:
+        """Save entity with upsert logic, returns rows written (None on error)"""
         data = self.to_dict(entity)
         columns = list(data.keys())
         placeholders = ['%s'] * len(columns)
@@ -70,25 +97,42 @@ class BaseRepository(Generic[T], ABC):
             INSERT INTO {self.table_name} ({', '.join(columns)})
             VALUES ({', '.join(placeholders)})
         """
+        query += self._on_conflict_clause(columns, conflict_columns)
+        
+        return self.execute_query(query, tuple(values))
+
+    def save_many(self, entities: List[T], conflict_columns: List[str] = None, page_size: int = 500) -> int:
+        """Save many entities with upsert logic using multi-row INSERTs. Returns the number of rows written."""
+        if not entities:
+            return 0
+        
+        rows = [self.to_dict(entity) for entity in entities]
+        columns = list(rows[0].keys())
         
         if conflict_columns:
-            # Add ON CONFLICT DO UPDATE for PostgreSQL
-            conflict_cols = ', '.join(conflict_columns)
-            
-            # Only include columns that are NOT in the conflict columns for the UPDATE
-            update_columns = [col for col in columns if col not in conflict_columns]
-            
-            if update_columns:
-                # There are columns to update
-                update_cols = ', '.join([f"{col} = EXCLUDED.{col}" for col in update_columns])
-                query += f" ON CONFLICT ({conflict_cols}) DO UPDATE SET {update_cols}"
-            else:
-                # All columns are part of the primary key/conflict, so just ignore duplicates
-                query += f" ON CONFLICT ({conflict_cols}) DO NOTHING"
+            # PostgreSQL rejects an upsert that touches the same row twice, so keep the last write per key
+            rows = list({tuple(row[col] for col in conflict_columns): row for row in rows}.values())
         
-        self.execute_query(query, tuple(values))
+        values = [tuple(row[col] for col in columns) for row in rows]
+        query = f"INSERT INTO {self.table_name} ({', '.join(columns)}) VALUES %s"
+        query += self._on_conflict_clause(columns, conflict_columns)
+        
+        try:
+            # All pages run on one connection and commit together
+            with db_manager.get_cursor() as cur:
+                psycopg2.extras.execute_values(cur, query, values, page_size=page_size)
+            return len(values)
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return 0
     
     def delete(self, where_clause: str, params: tuple = None) -> int:
         """Delete entities matching where clause"""
         query = f"DELETE FROM {self.table_name} WHERE {where_clause}"
-        return self.execute_query(query, params)
\ No newline at end of file
+        return self.execute_query(query, params)
+
+    def delete_many(self, ids: List[str], id_column: str = 'id') -> int:
+        """Delete all entities whose id_column is in ids with a single statement"""
+        if not ids:
+            return 0
+        return self.delete(f"{id_column} = ANY(%s)", ([str(id) for id in ids],)) or 0
\ No newline at end of file
@@ -0,0 +1,102 @@
+import threading
+import time
+from typing import Any, Callable, Dict, Hashable, List, Tuple
+
+class TTLCache:
+    """
+    Thread-safe in-process cache whose entries expire after ttl_seconds.
+
+    None is a valid cached value (e.g. "this guild has no settings row"), so
+    lookups go through get_or_load rather than checking for a missing value.
+    """
+    def __init__(self, ttl_seconds: float = 300.0, max_entries: int = 10000):
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max_entries
+        self._entries: Dict[Hashable, Tuple[Any, float]] = {}
+        self._lock = threading.Lock()
+        # Bumped on every invalidation so a load that raced with a write isn't cached
+        self._generation = 0
+        self.hits = 0
+        self.misses = 0
+
+    def get_or_load(self, key: Hashable, loader: Callable[[], Any], store: bool = True) -> Any:
+        """Return the cached value for key, calling loader() and caching its result on a miss"""
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > now:
+                self.hits += 1
+                return entry[0]
+            self.misses += 1
+            generation = self._generation
+
+        value = loader()
+        if store:
+            with self._lock:
+                if generation == self._generation:
+                    self._set(key, value)
+        return value
+
+    def get_if_cached(self, key: Hashable) -> Tuple[bool, Any]:
+        """Return (True, value) on a hit and (False, None) otherwise. Misses aren't counted."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                self.hits += 1
+                return True, entry[0]
+            return False, None
+
+    def peek(self, key: Hashable) -> Tuple[bool, Any]:
+        """Like get_if_cached, but doesn't touch the counters"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry[1] > time.monotonic():
+                return True, entry[0]
+            return False, None
+
+    def values(self) -> List[Any]:
+        """Every unexpired cached value"""
+        now = time.monotonic()
+        with self._lock:
+            return [value for value, expires in self._entries.values() if expires > now]
+
+    def set(self, key: Hashable, value: Any) -> None:
+        with self._lock:
+            self._set(key, value)
+
+    def _set(self, key: Hashable, value: Any) -> None:
+        """Store a value. Caller must hold the lock."""
+        if key not in self._entries and len(self._entries) >= self.max_entries:
+            self._evict_expired()
+            if len(self._entries) >= self.max_entries:
+                # Still full: drop the oldest insertion
+                self._entries.pop(next(iter(self._entries)))
+        self._entries[key] = (value, time.monotonic() + self.ttl_seconds)
+
+    def _evict_expired(self) -> None:
+        """Drop expired entries. Caller must hold the lock."""
+        now = time.monotonic()
+        for key in [key for key, (_, expires) in self._entries.items() if expires <= now]:
+            del self._entries[key]
+
+    def invalidate(self, key: Hashable) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.pop(key, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._entries.clear()
+
+    def stats(self) -> dict:
+        """Hit/miss counters and current size"""
+        with self._lock:
+            total = self.hits + self.misses
+            return {
+                'hits': self.hits,
+                'misses': self.misses,
+                'hit_rate': self.hits / total if total else 0.0,
+                'size': len(self._entries),
+                'ttl_seconds': self.ttl_seconds
+            }
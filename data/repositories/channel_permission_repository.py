@@ -1,10 +1,15 @@
-from typing import Optional
+import logging
+from typing import Dict, Optional
+from data.database import db_manager
 from .base_repository import BaseRepository
+from .cache import TTLCache
 from data.models import ChannelPermission
 
 class ChannelPermissionRepository(BaseRepository[ChannelPermission]):
     def __init__(self):
         super().__init__("channel_permissions")
+        # guild_id -> {channel_id: channel_type}; channel types only change through /setup channel-type
+        self.cache = TTLCache(ttl_seconds=3600)
     
     def to_dict(self, entity: ChannelPermission) -> dict:
         return {
@@ -28,19 +33,51 @@ class ChannelPermissionRepository(BaseRepository[ChannelPermission]):
             channel_type=channel_type
         )
         self.save(permission, conflict_columns=['guild_id', 'channel_id'])
+        self.cache.invalidate(str(guild_id))
     
     def get_channel_type(self, guild_id: str, channel_id: str) -> Optional[str]:
         """Get the channel type for a specific channel"""
-        query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND channel_id = %s"
-        result = self.execute_query(query, (str(guild_id), str(channel_id)), fetch_one=True)
-        return result.channel_type if result else None
+        return self.get_channel_type_map(guild_id).get(str(channel_id))
+    
+    async def get_channel_type_async(self, guild_id: str, channel_id: str) -> Optional[str]:
+        """Get the channel type for a specific channel, only leaving the event loop on a cache miss"""
+        found, channel_types = self.cache.get_if_cached(str(guild_id))
+        if not found:
+            from .async_repository import run_in_db_executor
+            channel_types = await run_in_db_executor(self.get_channel_type_map, guild_id)
+        return channel_types.get(str(channel_id))
+    
+    def get_channel_type_map(self, guild_id: str) -> Dict[str, str]:
+        """Get {channel_id: channel_type} for every configured channel in a guild (cached, read-only)"""
+        try:
+            return self.cache.get_or_load(
+                str(guild_id),
+                lambda: self._load_channel_type_map(guild_id),
+                store=not db_manager.in_transaction
+            )
+        except Exception as e:
+            # Failed loads aren't cached, so the next lookup tries the database again
+            logging.error(f"Database error: {e}")
+            return {}
+    
+    def _load_channel_type_map(self, guild_id: str) -> Dict[str, str]:
+        query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s"
+        return {
+            permission.channel_id: permission.channel_type
+            for permission in self.select_or_raise(query, (str(guild_id),))
+        }
 
     def remove_channel_permission(self, guild_id: str, channel_id: str) -> None:
         """Remove channel permission (set to unrestricted)"""
         query = f"DELETE FROM {self.table_name} WHERE guild_id = %s AND channel_id = %s"
         self.execute_query(query, (str(guild_id), str(channel_id)))
+        self.cache.invalidate(str(guild_id))
     
     def get_all_channel_permissions(self, guild_id: str) -> list[ChannelPermission]:
         """Get all channel permissions for a guild"""
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s"
-        return self.execute_query(query, (str(guild_id),))
\ No newline at end of file
+        return self.execute_query(query, (str(guild_id),))
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the channel type cache"""
+        return self.cache.stats()
\ No newline at end of file
@@ -1,8 +1,12 @@
 from typing import List, Optional
 from .base_repository import BaseRepository
+from .name_index import name_index
+from .narration_context import narration_context
+from data.database import db_manager
 from data.models import Character, ActiveCharacter
 from core.base_models import AccessType, BaseCharacter, BaseEntity, EntityJSONEncoder, EntityType, SystemType
 import json
+import logging
 import core.factories as factories
 
 class CharacterRepository(BaseRepository[Character]):
@@ -86,8 +90,16 @@ class CharacterRepository(BaseRepository[Character]):
 
     def get_by_name(self, guild_id: str, name: str) -> Optional[BaseCharacter]:
         """Get character by name within a guild"""
+        try:
+            return self.load_by_name(guild_id, name)
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return None
+
+    def load_by_name(self, guild_id: str, name: str) -> Optional[BaseCharacter]:
+        """Like get_by_name, but database errors raise instead of looking like no such character"""
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND name = %s"
-        character = self.execute_query(query, (str(guild_id), name), fetch_one=True)
+        character = self.select_or_raise(query, (str(guild_id), name), fetch_one=True)
         return self._convert_to_base_character(character)
 
     def get_all_by_guild(self, guild_id: str, system: SystemType = None) -> List[BaseCharacter]:
@@ -142,20 +154,31 @@ class CharacterRepository(BaseRepository[Character]):
             avatar_url=character.avatar_url
         )
         
-        self.save(storage_character, conflict_columns=['id'])
+        if self.save(storage_character, conflict_columns=['id']):
+            db_manager.after_commit(lambda: self._character_saved(guild_id, storage_character))
+    
+    def _character_saved(self, guild_id: str, character: Character) -> None:
+        name_index.upsert(guild_id, character.id, character.name, character.entity_type, character.owner_id)
+        narration_context.invalidate(guild_id)
 
     def delete_character(self, guild_id: str, character_id: str) -> None:
         """Delete a character and all its links"""
-        # Get the character to find its guild_id
-        character = self.get_by_id(character_id)
-        if character:
-            # Delete all links involving this character
-            from .repository_factory import repositories
-            repositories.link.delete_all_links_for_entity(str(guild_id), character_id)
-            
-        # Delete the character itself
-        query = f"DELETE FROM {self.table_name} WHERE id = %s"
-        self.execute_query(query, (character_id,))
+        with db_manager.transaction():
+            # Get the character to find its guild_id
+            character = self.get_by_id(character_id)
+            if character:
+                # Delete all links involving this character
+                from .repository_factory import repositories
+                repositories.link.delete_all_links_for_entity(str(guild_id), character_id)
+                
+            # Delete the character itself
+            query = f"DELETE FROM {self.table_name} WHERE id = %s"
+            if self.execute_query(query, (character_id,)):
+                db_manager.after_commit(lambda: self._character_deleted(guild_id, character_id))
+    
+    def _character_deleted(self, guild_id: str, character_id: str) -> None:
+        name_index.remove(guild_id, [character_id])
+        narration_context.invalidate(guild_id)
 
     def get_character_by_name(self, guild_id: int, name: str) -> Optional[BaseCharacter]:
         """Alias for get_by_name for backward compatibility"""
@@ -211,26 +234,13 @@ class ActiveCharacterRepository(BaseRepository[ActiveCharacter]):
         """Get user's active character object as BaseCharacter"""
         from .repository_factory import repositories
         
-        active_record = self.get_active_character_record(guild_id, user_id)
-        if active_record:
-            # Use find_all_by_column to get Character, then convert
-            return repositories.entity.get_by_id(active_record.char_id)
-        return None
+        return repositories.entity.get_active_character(str(guild_id), str(user_id))
     
     def get_all_active_characters(self, guild_id: int) -> List[BaseCharacter]:
         """Get all active characters in a guild"""
         from .repository_factory import repositories
         
-        query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s"
-        active_records = self.execute_query(query, (str(guild_id),))
-        
-        active_characters = []
-        for record in active_records:
-            character = repositories.entity.get_by_id(record.char_id)
-            if character:
-                active_characters.append(character)
-        
-        return active_characters
+        return repositories.entity.get_active_characters(str(guild_id))
     
     def set_active_character(self, guild_id: str, user_id: str, character_id: str) -> None:
         """Set a user's active character"""
@@ -240,8 +250,10 @@ class ActiveCharacterRepository(BaseRepository[ActiveCharacter]):
             char_id=character_id
         )
         self.save(active_char, conflict_columns=['guild_id', 'user_id'])
+        narration_context.invalidate_user(guild_id, user_id)
     
     def clear_active_character(self, guild_id: int, user_id: int) -> None:
         """Clear a user's active character"""
         query = f"DELETE FROM {self.table_name} WHERE guild_id = %s AND user_id = %s"
-        self.execute_query(query, (str(guild_id), str(user_id)))
\ No newline at end of file
+        self.execute_query(query, (str(guild_id), str(user_id)))
+        narration_context.invalidate_user(guild_id, user_id)
\ No newline at end of file
@@ -1,7 +1,10 @@
-from typing import List, Optional, Dict, Any
+import logging
+from typing import List, Optional, Dict, Any, Set
+from data.database import db_manager
 from .base_repository import BaseRepository
+from .name_index import name_index
 from data.models import EntityLink
-from core.base_models import BaseEntity
+from core.base_models import BaseEntity, EntityLinkType
 import json
 import uuid
 from datetime import datetime
@@ -88,6 +91,58 @@ class EntityLinkRepository(BaseRepository[EntityLink]):
         parent_entity_dicts = repositories.entity.execute_query(query, tuple(params))
         return repositories.entity._convert_list_to_base_entities(parent_entity_dicts)
 
+    def count_children(self, guild_id: str, entity_ids: List[str], link_type: str = None) -> Dict[str, int]:
+        """Number of outgoing links for each of entity_ids, counted in one query"""
+        if not entity_ids:
+            return {}
+        
+        params = [str(guild_id), [str(entity_id) for entity_id in entity_ids]]
+        link_type_clause = ""
+        if link_type:
+            link_type_clause = "AND link_type = %s"
+            params.append(link_type)
+        
+        query = f"""
+            SELECT from_entity_id, COUNT(*) AS child_count
+            FROM {self.table_name}
+            WHERE guild_id = %s AND from_entity_id = ANY(%s) {link_type_clause}
+            GROUP BY from_entity_id
+        """
+        counts = {str(entity_id): 0 for entity_id in entity_ids}
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(query, tuple(params))
+                for row in cur.fetchall():
+                    counts[row['from_entity_id']] = row['child_count']
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+        return counts
+
+    def get_controller_owner_ids(self, guild_id: str, entity_ids: List[str]) -> Dict[str, Set[str]]:
+        """Owner IDs of the entities that control each of entity_ids, fetched in one query"""
+        if not entity_ids:
+            return {}
+        
+        query = f"""
+            SELECT el.to_entity_id, e.owner_id
+            FROM {self.table_name} el
+            JOIN entities e ON e.id = el.from_entity_id
+            WHERE el.guild_id = %s AND el.link_type = %s AND el.to_entity_id = ANY(%s)
+        """
+        owner_ids = {str(entity_id): set() for entity_id in entity_ids}
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(query, (str(guild_id), EntityLinkType.CONTROLS.value, list(owner_ids)))
+                for row in cur.fetchall():
+                    owner_ids[row['to_entity_id']].add(str(row['owner_id']))
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+        return owner_ids
+
+    def user_controls_entity(self, guild_id: str, user_id: str, entity_id: str) -> bool:
+        """Whether the user owns any entity that controls entity_id"""
+        return str(user_id) in self.get_controller_owner_ids(guild_id, [entity_id])[str(entity_id)]
+
     def get_links_for_entity(self, guild_id: str, entity_id: str) -> List[EntityLink]:
         """Get all links involving this entity (both directions)"""
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND (from_entity_id = %s OR to_entity_id = %s)"
@@ -106,13 +161,17 @@ class EntityLinkRepository(BaseRepository[EntityLink]):
         )
         
         self.save(link, conflict_columns=['guild_id', 'from_entity_id', 'to_entity_id', 'link_type'])
+        if link_type == EntityLinkType.CONTROLS.value:
+            name_index.set_controller(guild_id, to_entity_id, from_entity_id)
         return link
 
     def delete_link(self, link_id: str) -> bool:
         """Delete a link by ID"""
-        query = f"DELETE FROM {self.table_name} WHERE id = %s"
-        result = self.execute_query(query, (link_id,))
-        return result is not None
+        query = f"DELETE FROM {self.table_name} WHERE id = %s RETURNING *"
+        link = self.execute_query(query, (link_id,), fetch_one=True, select_override=True)
+        if link and link.link_type == EntityLinkType.CONTROLS.value:
+            name_index.set_controller(link.guild_id, link.to_entity_id, link.from_entity_id, controls=False)
+        return link is not None
 
     def delete_links_by_entities(self, guild_id: str, from_entity_id: str, to_entity_id: str, link_type: str = None) -> bool:
         """Delete links between two entities"""
@@ -122,6 +181,8 @@ class EntityLinkRepository(BaseRepository[EntityLink]):
         else:
             query = f"DELETE FROM {self.table_name} WHERE guild_id = %s AND from_entity_id = %s AND to_entity_id = %s"
             self.execute_query(query, (str(guild_id), str(from_entity_id), str(to_entity_id)))
+        if link_type in (None, EntityLinkType.CONTROLS.value):
+            name_index.set_controller(guild_id, to_entity_id, from_entity_id, controls=False)
         return True
 
     def get_link_by_entities(self, guild_id: str, from_entity_id: str, to_entity_id: str, link_type: str = None) -> Optional[EntityLink]:
@@ -137,4 +198,177 @@ class EntityLinkRepository(BaseRepository[EntityLink]):
         """Delete all links involving an entity (used when deleting entities)"""
         query = f"DELETE FROM {self.table_name} WHERE guild_id = %s AND (from_entity_id = %s OR to_entity_id = %s)"
         self.execute_query(query, (str(guild_id), str(entity_id), str(entity_id)))
-        return True
\ No newline at end of file
+        return True
+
+    def delete_all_links_for_entities(self, guild_id: str, entity_ids: List[str]) -> int:
+        """Delete all links involving any of the given entities in one statement"""
+        if not entity_ids:
+            return 0
+        ids = [str(entity_id) for entity_id in entity_ids]
+        query = f"DELETE FROM {self.table_name} WHERE guild_id = %s AND (from_entity_id = ANY(%s) OR to_entity_id = ANY(%s))"
+        return self.execute_query(query, (str(guild_id), ids, ids)) or 0
+
+    # Inventory quantities live in metadata->'quantity' of possesses links (missing means 1).
+    # Each operation below is a single conditional statement, so concurrent looting can't lose updates.
+
+    _QUANTITY_SQL = "COALESCE((el.metadata->>'quantity')::int, 1)"
+
+    def _item_stacks_sql(self) -> str:
+        """FROM/WHERE selecting a container's possesses links to items with a given name"""
+        return f"""
+            FROM {self.table_name} el
+            JOIN entities e ON e.id = el.to_entity_id
+            WHERE el.guild_id = %s AND el.from_entity_id = %s AND el.link_type = 'possesses'
+            AND e.entity_type = 'item' AND e.name = %s
+        """
+
+    def _fetch_one(self, query: str, params: tuple) -> Optional[dict]:
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(query, params)
+                row = cur.fetchone()
+                return dict(row) if row else None
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return None
+
+    def get_item_quantity(self, guild_id: str, container_id: str, item_name: str) -> int:
+        """Total quantity of items with this name in a container, summed in SQL"""
+        query = f"SELECT COALESCE(SUM({self._QUANTITY_SQL}), 0) AS quantity {self._item_stacks_sql()}"
+        row = self._fetch_one(query, (str(guild_id), str(container_id), item_name))
+        return int(row['quantity']) if row else 0
+
+    def add_item_quantity(self, guild_id: str, container_id: str, item_id: str, item_name: str,
+                          quantity: int, max_items: int = 0) -> bool:
+        """
+        Add quantity of an item to a container, stacking onto an existing item of the same name.
+        A new stack is only created while the container has fewer than max_items unique items (0 = no limit).
+        """
+        guild_id, container_id = str(guild_id), str(container_id)
+        with db_manager.transaction():
+            # Lock the container row so concurrent adds can't both pass the max_items count below
+            self._fetch_one("SELECT id FROM entities WHERE id = %s FOR UPDATE", (container_id,))
+
+            # Stack onto the oldest existing stack with the same name
+            stack_query = f"""
+                WITH stack AS (
+                    SELECT el.id {self._item_stacks_sql()}
+                    ORDER BY el.created_at, el.id
+                    LIMIT 1
+                    FOR UPDATE OF el
+                )
+                UPDATE {self.table_name} el
+                SET metadata = jsonb_set(COALESCE(el.metadata, '{{}}'::jsonb), '{{quantity}}', to_jsonb({self._QUANTITY_SQL} + %s))
+                FROM stack
+                WHERE el.id = stack.id
+                RETURNING el.id
+            """
+            if self._fetch_one(stack_query, (guild_id, container_id, item_name, quantity)):
+                return True
+
+            # New stack, if there is room. Two players adding the same new item at once merge on the unique key.
+            insert_query = f"""
+                INSERT INTO {self.table_name} (id, guild_id, from_entity_id, to_entity_id, link_type, metadata, created_at)
+                SELECT %s, %s, %s, %s, 'possesses', jsonb_build_object('quantity', %s::int), %s
+                WHERE %s <= 0 OR (
+                    SELECT COUNT(*) FROM {self.table_name} el
+                    JOIN entities e ON e.id = el.to_entity_id
+                    WHERE el.guild_id = %s AND el.from_entity_id = %s AND el.link_type = 'possesses' AND e.entity_type = 'item'
+                ) < %s
+                ON CONFLICT (guild_id, from_entity_id, to_entity_id, link_type) DO UPDATE
+                SET metadata = jsonb_set(
+                    COALESCE({self.table_name}.metadata, '{{}}'::jsonb),
+                    '{{quantity}}',
+                    to_jsonb(COALESCE(({self.table_name}.metadata->>'quantity')::int, 1) + %s)
+                )
+                RETURNING id
+            """
+            row = self._fetch_one(insert_query, (
+                str(uuid.uuid4()), guild_id, container_id, str(item_id), quantity, datetime.now(),
+                max_items, guild_id, container_id, max_items,
+                quantity
+            ))
+            return row is not None
+
+    def take_item_quantity(self, guild_id: str, container_id: str, item_name: str, quantity: int = 1) -> Optional[str]:
+        """
+        Take quantity of a named item out of a container, oldest stacks first, emptying as many stacks as needed.
+        Returns the item id of the oldest stack taken from, or None (taking nothing) if there isn't enough in total.
+        """
+        # Window functions can't be combined with FOR UPDATE, so lock the stacks first and total them after
+        query = f"""
+            WITH locked AS (
+                SELECT el.id, el.to_entity_id, el.created_at, {self._QUANTITY_SQL} AS quantity
+                {self._item_stacks_sql()}
+                FOR UPDATE OF el
+            ),
+            stacks AS (
+                SELECT id, to_entity_id, quantity,
+                       SUM(quantity) OVER (ORDER BY created_at, id) AS running,
+                       SUM(quantity) OVER () AS available
+                FROM locked
+            ),
+            taken AS (
+                SELECT id, to_entity_id, running FROM stacks
+                WHERE available >= %s AND running - quantity < %s
+            ),
+            updated AS (
+                UPDATE {self.table_name} el
+                SET metadata = jsonb_set(COALESCE(el.metadata, '{{}}'::jsonb), '{{quantity}}', to_jsonb(taken.running - %s))
+                FROM taken
+                WHERE el.id = taken.id AND taken.running > %s
+            ),
+            deleted AS (
+                DELETE FROM {self.table_name} el
+                USING taken
+                WHERE el.id = taken.id AND taken.running <= %s
+            )
+            SELECT to_entity_id FROM taken ORDER BY running LIMIT 1
+        """
+        row = self._fetch_one(query, (
+            str(guild_id), str(container_id), item_name,
+            quantity, quantity,
+            quantity, quantity,
+            quantity
+        ))
+        return row['to_entity_id'] if row else None
+
+    def remove_item_quantity(self, guild_id: str, container_id: str, item_id: str, quantity: int = None) -> bool:
+        """
+        Remove quantity of an item from a container in one statement: decrement its stack, or delete
+        the stack when quantity is None or at least the stack size. Returns whether anything was removed.
+        """
+        take_all = quantity is None
+        quantity = quantity or 0
+        query = f"""
+            WITH target AS (
+                SELECT el.id, {self._QUANTITY_SQL} AS quantity
+                FROM {self.table_name} el
+                WHERE el.guild_id = %s AND el.from_entity_id = %s AND el.to_entity_id = %s AND el.link_type = 'possesses'
+                ORDER BY el.created_at, el.id
+                LIMIT 1
+                FOR UPDATE OF el
+            ),
+            updated AS (
+                UPDATE {self.table_name} el
+                SET metadata = jsonb_set(COALESCE(el.metadata, '{{}}'::jsonb), '{{quantity}}', to_jsonb(target.quantity - %s))
+                FROM target
+                WHERE el.id = target.id AND NOT %s AND target.quantity > %s
+                RETURNING el.id
+            ),
+            deleted AS (
+                DELETE FROM {self.table_name} el
+                USING target
+                WHERE el.id = target.id AND (%s OR target.quantity <= %s)
+                RETURNING el.id
+            )
+            SELECT id FROM updated
+            UNION ALL
+            SELECT id FROM deleted
+        """
+        row = self._fetch_one(query, (
+            str(guild_id), str(container_id), str(item_id),
+            quantity, take_all, quantity,
+            take_all, quantity
+        ))
+        return row is not None
@@ -1,8 +1,12 @@
-from typing import List, Optional, Dict, Any
+from typing import List, Optional, Dict, Any, Tuple
 from .base_repository import BaseRepository
+from .name_index import name_index
+from .narration_context import narration_context
+from data.database import db_manager
 from data.models import Entity
 from core.base_models import AccessType, BaseEntity, EntityType, EntityJSONEncoder, SystemType
 import json
+import logging
 import uuid
 import time
 import core.factories as factories
@@ -89,7 +93,45 @@ class EntityRepository(BaseRepository[Entity]):
         """Get entity by ID"""
         entity = self.find_by_id('id', entity_id)
         return self._convert_to_base_entity(entity)
-    
+
+    def get_by_ids(self, entity_ids: List[str]) -> List[BaseEntity]:
+        """Get entities by ID in one query, in the order given; missing IDs are skipped"""
+        entity_ids = [str(entity_id) for entity_id in entity_ids]
+        if not entity_ids:
+            return []
+        query = f"SELECT * FROM {self.table_name} WHERE id = ANY(%s)"
+        entities_by_id = {entity.id: entity for entity in self.execute_query(query, (entity_ids,))}
+        return self._convert_list_to_base_entities([entities_by_id.get(entity_id) for entity_id in entity_ids])
+
+    def get_active_characters(self, guild_id: str) -> List[BaseEntity]:
+        """Get every character set as active by a user in a guild, joined in one query"""
+        query = f"""
+            SELECT e.* FROM active_characters ac
+            JOIN {self.table_name} e ON e.id = ac.char_id
+            WHERE ac.guild_id = %s
+            ORDER BY e.name
+        """
+        entities = self.execute_query(query, (str(guild_id),))
+        return self._convert_list_to_base_entities(entities)
+
+    def get_active_character(self, guild_id: str, user_id: str) -> Optional[BaseEntity]:
+        """Get the character a user has set as active in a guild, joined in one query"""
+        try:
+            return self.load_active_character(guild_id, user_id)
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return None
+
+    def load_active_character(self, guild_id: str, user_id: str) -> Optional[BaseEntity]:
+        """Like get_active_character, but database errors raise instead of looking like no active character"""
+        query = f"""
+            SELECT e.* FROM active_characters ac
+            JOIN {self.table_name} e ON e.id = ac.char_id
+            WHERE ac.guild_id = %s AND ac.user_id = %s
+        """
+        entity = self.select_or_raise(query, (str(guild_id), str(user_id)), fetch_one=True)
+        return self._convert_to_base_entity(entity)
+
     def get_by_name(self, guild_id: str, name: str) -> Optional[BaseEntity]:
         """Get entity by name within a guild"""
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND name = %s"
@@ -113,19 +155,15 @@ class EntityRepository(BaseRepository[Entity]):
         entities = self.execute_query(query, (str(guild_id), str(owner_id)))
         return self._convert_list_to_base_entities(entities)
     
-    def get_all_accessible(self, guild_id: str, user_id: str, is_gm: bool) -> List[BaseEntity]:
-        """Get all entities accessible to a user with optimized database queries"""
-        
+    def _accessible_query(self, guild_id: str, user_id: str, is_gm: bool) -> Tuple[str, tuple]:
+        """SELECT returning every entity accessible to a user, and its params"""
         if is_gm:
             # GMs can see everything
-            query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s ORDER BY name"
-            entities = self.execute_query(query, (str(guild_id),))
-            return self._convert_list_to_base_entities(entities)
+            return f"SELECT * FROM {self.table_name} WHERE guild_id = %s", (str(guild_id),)
         
         # Single optimized query for non-GM users
         # Note: owner_id is only relevant for PCs, not for general entity access
         access_query = f"""
-        WITH user_accessible AS (
             -- User's own PCs (owner_id only matters for PCs)
             SELECT e.* FROM {self.table_name} e 
             WHERE e.guild_id = %s 
@@ -168,18 +206,61 @@ class EntityRepository(BaseRepository[Entity]):
             AND user_pc.entity_type = 'pc'
             AND user_pc.owner_id = %s
             AND el.link_type IN ('possesses', 'controls')
-        )
-        SELECT DISTINCT * FROM user_accessible ORDER BY name
         """
         
-        entities = self.execute_query(access_query, (
+        return access_query, (
             str(guild_id), str(user_id),  # User's own PCs
             str(guild_id),                # Public entities
             str(guild_id),                # Possesses check
             str(guild_id),                # Controls check
             str(guild_id), str(guild_id), str(user_id)  # PC links
-        ), select_override=True)
+        )
+    
+    def get_all_accessible(self, guild_id: str, user_id: str, is_gm: bool) -> List[BaseEntity]:
+        """Get all entities accessible to a user with optimized database queries"""
+        access_query, params = self._accessible_query(guild_id, user_id, is_gm)
+        query = f"SELECT * FROM ({access_query}) accessible ORDER BY name"
+        entities = self.execute_query(query, params)
+        return self._convert_list_to_base_entities(entities)
+    
+    def get_top_level_accessible(
+        self,
+        guild_id: str,
+        user_id: str,
+        is_gm: bool,
+        entity_type: str = None,
+        after: Tuple[str, str] = None,
+        limit: int = None
+    ) -> List[BaseEntity]:
+        """
+        Get accessible entities that no other entity possesses, in one query.
+        Results are ordered by (name, id); pass the last entity's (name, id) as after to get the next page.
+        """
+        access_query, params = self._accessible_query(guild_id, user_id, is_gm)
+        params = list(params) + [str(guild_id)]
+        
+        # Anti-join: top-level entities have no incoming possesses link
+        query = f"""
+            SELECT accessible.* FROM ({access_query}) accessible
+            WHERE NOT EXISTS (
+                SELECT 1 FROM entity_links el
+                WHERE el.guild_id = %s
+                AND el.to_entity_id = accessible.id
+                AND el.link_type = 'possesses'
+            )
+        """
+        if entity_type:
+            query += " AND accessible.entity_type = %s"
+            params.append(entity_type)
+        if after:
+            query += " AND (accessible.name, accessible.id) > (%s, %s)"
+            params.extend(after)
+        query += " ORDER BY accessible.name, accessible.id"
+        if limit:
+            query += " LIMIT %s"
+            params.append(limit)
         
+        entities = self.execute_query(query, tuple(params))
         return self._convert_list_to_base_entities(entities)
     
     def get_entities_controlled_by_user(self, guild_id: str, user_id: str) -> List[BaseEntity]:
@@ -201,8 +282,8 @@ class EntityRepository(BaseRepository[Entity]):
         entities = self.execute_query(query, (guild_id, user_id))
         return self._convert_list_to_base_entities(entities)
     
-    def upsert_entity(self, guild_id: str, entity: BaseEntity, system: SystemType) -> None:
-        """Save or update a BaseEntity by converting it to Entity first"""
+    def _to_storage_entity(self, guild_id: str, entity: BaseEntity, system: SystemType) -> Entity:
+        """Convert a BaseEntity to the Entity row that gets stored"""
         # Get system-specific fields
         EntityClass = factories.get_specific_entity(system, entity.entity_type)
         system_fields = EntityClass.ENTITY_DEFAULTS.get_defaults(entity.entity_type)
@@ -214,7 +295,7 @@ class EntityRepository(BaseRepository[Entity]):
         notes = entity.notes or []
         
         # Create Entity from BaseEntity
-        storage_entity = Entity(
+        return Entity(
             id=entity.id,
             guild_id=str(guild_id),
             name=entity.name,
@@ -226,26 +307,90 @@ class EntityRepository(BaseRepository[Entity]):
             avatar_url=entity.avatar_url,
             access_type=entity.access_type.value
         )
-        
-        self.save(storage_entity, conflict_columns=['id'])
+
+    def upsert_entity(self, guild_id: str, entity: BaseEntity, system: SystemType) -> None:
+        """Save or update a BaseEntity by converting it to Entity first"""
+        storage_entity = self._to_storage_entity(guild_id, entity, system)
+        if self.save(storage_entity, conflict_columns=['id']):
+            db_manager.after_commit(lambda: self._entity_saved(guild_id, storage_entity))
+    
+    def _entity_saved(self, guild_id: str, entity: Entity) -> None:
+        name_index.upsert(guild_id, entity.id, entity.name, entity.entity_type, entity.owner_id)
+        narration_context.invalidate(guild_id)
     
     def delete_entity(self, guild_id: str, entity_id: str) -> None:
         """Delete an entity and all its links"""
-        entity = self.get_by_id(entity_id)
-        if entity:
-            # Delete all links involving this entity
-            from .repository_factory import repositories
-            repositories.link.delete_all_links_for_entity(
-                guild_id,
-                entity_id
+        with db_manager.transaction():
+            entity = self.get_by_id(entity_id)
+            if entity:
+                # Delete all links involving this entity
+                from .repository_factory import repositories
+                repositories.link.delete_all_links_for_entity(
+                    guild_id,
+                    entity_id
+                )
+                
+                # Delete the entity itself
+                query = f"DELETE FROM {self.table_name} WHERE id = %s"
+                if self.execute_query(query, (entity_id,)):
+                    db_manager.after_commit(lambda: self._entities_deleted(guild_id, [entity_id]))
+    
+    def delete_entities(self, guild_id: str, entity_ids: List[str]) -> int:
+        """Delete many entities and all their links, returns the number of entities deleted"""
+        if not entity_ids:
+            return 0
+        
+        from .repository_factory import repositories
+        with db_manager.transaction():
+            repositories.link.delete_all_links_for_entities(guild_id, entity_ids)
+            deleted_count = self.delete_many(entity_ids)
+            if deleted_count:
+                db_manager.after_commit(lambda: self._entities_deleted(guild_id, entity_ids))
+        return deleted_count
+    
+    def _entities_deleted(self, guild_id: str, entity_ids: List[str]) -> None:
+        name_index.remove(guild_id, entity_ids)
+        narration_context.invalidate(guild_id)
+    
+    def set_access_type_recursive(self, guild_id: str, entity_id: str, access_type: AccessType) -> Optional[List[dict]]:
+        """
+        Set access_type on an entity and everything it possesses, directly or nested, in one UPDATE.
+        Returns the updated possessed entities as {id, name, entity_type} dicts, or None on error.
+        """
+        # UNION (not UNION ALL) drops already-visited ids, so possession cycles terminate
+        query = f"""
+            WITH RECURSIVE possessed(id) AS (
+                SELECT %s::text
+                UNION
+                SELECT el.to_entity_id
+                FROM entity_links el
+                JOIN possessed p ON el.from_entity_id = p.id
+                WHERE el.guild_id = %s AND el.link_type = 'possesses'
             )
-            
-            # Delete the entity itself
-            query = f"DELETE FROM {self.table_name} WHERE id = %s"
-            self.execute_query(query, (entity_id,))
+            UPDATE {self.table_name} e
+            SET access_type = %s
+            FROM possessed
+            WHERE e.id = possessed.id AND e.guild_id = %s
+            RETURNING e.id, e.name, e.entity_type
+        """
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(query, (str(entity_id), str(guild_id), access_type.value, str(guild_id)))
+                rows = [dict(row) for row in cur.fetchall()]
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return None
+        return sorted((row for row in rows if row['id'] != str(entity_id)), key=lambda row: row['name'])
     
-    def rename_entity(self, entity_id: str, new_name: str) -> bool:
+    def rename_entity(self, guild_id: str, entity_id: str, new_name: str) -> bool:
         """Rename an entity"""
-        query = f"UPDATE {self.table_name} SET name = %s WHERE id = %s"
-        self.execute_query(query, (new_name, entity_id))
-        return True
\ No newline at end of file
+        query = f"UPDATE {self.table_name} SET name = %s WHERE id = %s AND guild_id = %s"
+        if not self.execute_query(query, (new_name, entity_id, str(guild_id))):
+            return False
+        db_manager.after_commit(lambda: self._entity_renamed(guild_id, entity_id, new_name))
+        return True
+    
+    def _entity_renamed(self, guild_id: str, entity_id: str, new_name: str) -> None:
+        name_index.rename(guild_id, entity_id, new_name)
+        # Both the old and the new name may be cached, possibly as "no such character"
+        narration_context.invalidate(guild_id)
\ No newline at end of file
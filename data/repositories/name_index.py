@@ -0,0 +1,224 @@
+import bisect
+import logging
+import threading
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from data.database import db_manager
+from .cache import TTLCache
+
+@dataclass(frozen=True)
+class NameIndexEntry:
+    """The few entity columns autocomplete handlers need"""
+    id: str
+    name: str
+    entity_type: str
+    owner_id: str
+    controller_ids: Tuple[str, ...] = ()
+
+class GuildNameIndex:
+    """In-memory name index of every entity in one guild, searchable by prefix and substring"""
+    def __init__(self, entries: Iterable[NameIndexEntry] = ()):
+        self._lock = threading.Lock()
+        self._entries: Dict[str, NameIndexEntry] = {entry.id: entry for entry in entries}
+        self._sorted: List[Tuple[str, str]] = []  # (lowercase name, id), rebuilt lazily
+        self._dirty = True
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, entity_id: str) -> Optional[NameIndexEntry]:
+        return self._entries.get(str(entity_id))
+
+    def upsert(self, entry: NameIndexEntry) -> None:
+        with self._lock:
+            existing = self._entries.get(entry.id)
+            if existing and not entry.controller_ids:
+                # Entity writes don't know about links, keep the controllers we already have
+                entry = replace(entry, controller_ids=existing.controller_ids)
+            self._entries[entry.id] = entry
+            self._dirty = True
+
+    def rename(self, entity_id: str, new_name: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(str(entity_id))
+            if not entry:
+                return False
+            self._entries[entry.id] = replace(entry, name=new_name)
+            self._dirty = True
+            return True
+
+    def remove(self, entity_ids: Iterable[str]) -> None:
+        with self._lock:
+            removed = {str(entity_id) for entity_id in entity_ids}
+            for entity_id in removed:
+                self._entries.pop(entity_id, None)
+            # Links to deleted entities are deleted with them
+            for entry in list(self._entries.values()):
+                if removed.intersection(entry.controller_ids):
+                    self._entries[entry.id] = replace(
+                        entry, controller_ids=tuple(c for c in entry.controller_ids if c not in removed)
+                    )
+            self._dirty = True
+
+    def set_controller(self, entity_id: str, controller_id: str, controls: bool = True) -> None:
+        """Record that controller_id does (or no longer does) control entity_id"""
+        with self._lock:
+            entry = self._entries.get(str(entity_id))
+            if not entry:
+                return
+            controllers = [c for c in entry.controller_ids if c != str(controller_id)]
+            if controls:
+                controllers.append(str(controller_id))
+            self._entries[entry.id] = replace(entry, controller_ids=tuple(controllers))
+
+    def is_controlled_by_user(self, entry: NameIndexEntry, user_id: str) -> bool:
+        """True if any entity controlling entry is owned by user_id"""
+        for controller_id in entry.controller_ids:
+            controller = self._entries.get(controller_id)
+            if controller and str(controller.owner_id) == str(user_id):
+                return True
+        return False
+
+    def _sorted_names(self) -> List[Tuple[str, str]]:
+        with self._lock:
+            if self._dirty:
+                self._sorted = sorted((entry.name.lower(), entry.id) for entry in self._entries.values())
+                self._dirty = False
+            return self._sorted
+
+    def search(self, current: str, entity_types: Iterable[str] = None,
+               predicate: Callable[[NameIndexEntry], bool] = None, limit: int = 25) -> List[NameIndexEntry]:
+        """
+        Entries whose name contains current (case-insensitive), prefix matches first,
+        each group in name order. entity_types and predicate filter the results.
+        """
+        needle = (current or '').lower()
+        types = set(entity_types) if entity_types else None
+        names = self._sorted_names()
+
+        def accept(entity_id: str) -> Optional[NameIndexEntry]:
+            entry = self._entries.get(entity_id)
+            if entry is None or (types and entry.entity_type not in types):
+                return None
+            if predicate and not predicate(entry):
+                return None
+            return entry
+
+        results = []
+        # Prefix matches are a contiguous run in the sorted list
+        start = bisect.bisect_left(names, (needle, ''))
+        prefix_end = start
+        for lower_name, entity_id in names[start:]:
+            if not lower_name.startswith(needle):
+                break
+            prefix_end += 1
+            entry = accept(entity_id)
+            if entry:
+                results.append(entry)
+                if len(results) >= limit:
+                    return results
+
+        if not needle:
+            return results
+
+        for i, (lower_name, entity_id) in enumerate(names):
+            if start <= i < prefix_end or needle not in lower_name:
+                continue
+            entry = accept(entity_id)
+            if entry:
+                results.append(entry)
+                if len(results) >= limit:
+                    break
+        return results
+
+class EntityNameIndex:
+    """
+    Per-guild GuildNameIndex, loaded with two narrow queries on first use and kept up to date
+    by the entity, character and link repositories. Entries expire after ttl_seconds so
+    writes made outside those repositories are picked up eventually.
+    """
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.cache = TTLCache(ttl_seconds=ttl_seconds, max_entries=1000)
+
+    def _load(self, guild_id: str) -> GuildNameIndex:
+        controllers: Dict[str, List[str]] = {}
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(
+                    "SELECT from_entity_id, to_entity_id FROM entity_links WHERE guild_id = %s AND link_type = 'controls'",
+                    (guild_id,)
+                )
+                for row in cur.fetchall():
+                    controllers.setdefault(row['to_entity_id'], []).append(row['from_entity_id'])
+
+                cur.execute(
+                    "SELECT id, name, entity_type, owner_id FROM entities WHERE guild_id = %s",
+                    (guild_id,)
+                )
+                rows = cur.fetchall()
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            raise
+
+        return GuildNameIndex(
+            NameIndexEntry(
+                id=row['id'],
+                name=row['name'],
+                entity_type=row['entity_type'],
+                owner_id=str(row['owner_id']),
+                controller_ids=tuple(controllers.get(row['id'], ()))
+            )
+            for row in rows
+        )
+
+    def get(self, guild_id: str) -> GuildNameIndex:
+        """The name index for a guild, loading it on a miss"""
+        return self.cache.get_or_load(
+            str(guild_id),
+            lambda: self._load(str(guild_id)),
+            store=not db_manager.in_transaction
+        )
+
+    async def get_async(self, guild_id: str) -> GuildNameIndex:
+        """The name index for a guild, only leaving the event loop on a cache miss"""
+        found, index = self.cache.get_if_cached(str(guild_id))
+        if not found:
+            from .async_repository import run_in_db_executor
+            index = await run_in_db_executor(self.get, guild_id)
+        return index
+
+    def _loaded(self, guild_id: str) -> Optional[GuildNameIndex]:
+        """The guild's index if it is loaded; writes to unloaded guilds need no bookkeeping"""
+        found, index = self.cache.peek(str(guild_id))
+        return index if found else None
+
+    def upsert(self, guild_id: str, entity_id: str, name: str, entity_type: str, owner_id: str) -> None:
+        index = self._loaded(guild_id)
+        if index is not None:
+            index.upsert(NameIndexEntry(id=str(entity_id), name=name, entity_type=entity_type, owner_id=str(owner_id)))
+
+    def rename(self, guild_id: str, entity_id: str, new_name: str) -> None:
+        index = self._loaded(guild_id)
+        if index is not None:
+            index.rename(entity_id, new_name)
+
+    def remove(self, guild_id: str, entity_ids: Iterable[str]) -> None:
+        index = self._loaded(guild_id)
+        if index is not None:
+            index.remove(entity_ids)
+
+    def set_controller(self, guild_id: str, entity_id: str, controller_id: str, controls: bool = True) -> None:
+        index = self._loaded(guild_id)
+        if index is not None:
+            index.set_controller(entity_id, controller_id, controls)
+
+    def invalidate(self, guild_id: str = None) -> None:
+        if guild_id is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(str(guild_id))
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+name_index = EntityNameIndex()
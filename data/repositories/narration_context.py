@@ -0,0 +1,99 @@
+import logging
+import threading
+from typing import Dict, Optional
+from core.base_models import BaseCharacter
+from .cache import TTLCache
+
+class GuildNarrationContext:
+    """Who each user is speaking as in one guild: active characters by user and characters by name"""
+    def __init__(self):
+        self._lock = threading.Lock()
+        # Bumped whenever an entry is forgotten, so a load that started before can't store what it read
+        self.version = 0
+        # None is cached too: "no active character" and "no character with this name" are answers
+        self.active_by_user: Dict[str, Optional[BaseCharacter]] = {}
+        self.by_name: Dict[str, Optional[BaseCharacter]] = {}
+
+    def lookup(self, table: Dict[str, Optional[BaseCharacter]], key: str):
+        with self._lock:
+            if key in table:
+                return True, table[key]
+            return False, None
+
+    def store(self, table: Dict[str, Optional[BaseCharacter]], key: str, character: Optional[BaseCharacter], version: int) -> None:
+        """Cache a loaded answer, unless something was forgotten since the load started"""
+        with self._lock:
+            if self.version == version:
+                table[key] = character
+
+    def forget_user(self, user_id: str) -> None:
+        with self._lock:
+            self.version += 1
+            self.active_by_user.pop(user_id, None)
+
+class NarrationContextResolver:
+    """
+    Answers "who is this user speaking as here" for pc::/npc:: narration from per-guild caches.
+
+    Entries are filled lazily and invalidated by the character, entity and active
+    character repositories whenever a character is created, saved (e.g. a new
+    avatar), renamed, deleted or switched to.
+    """
+    def __init__(self, ttl_seconds: float = 600.0):
+        self.cache = TTLCache(ttl_seconds=ttl_seconds)
+
+    def _context(self, guild_id: str) -> GuildNarrationContext:
+        return self.cache.get_or_load(str(guild_id), GuildNarrationContext)
+
+    async def _resolve(self, context: GuildNarrationContext, table, key: str, loader) -> Optional[BaseCharacter]:
+        found, character = context.lookup(table, key)
+        if found:
+            return character
+        from .async_repository import run_in_db_executor
+        version = context.version
+        try:
+            character = await run_in_db_executor(loader)
+        except Exception as e:
+            # Failed loads aren't cached, so the next message tries the database again
+            logging.error(f"Database error: {e}")
+            return None
+        # A write that lands while we load replaces the guild's context or bumps its version,
+        # so this never caches stale data
+        context.store(table, key, character, version)
+        return character
+
+    async def get_active_character(self, guild_id, user_id) -> Optional[BaseCharacter]:
+        """The user's active character in the guild, loaded with one query on a miss"""
+        from .repository_factory import repositories
+        context = self._context(guild_id)
+        return await self._resolve(
+            context, context.active_by_user, str(user_id),
+            lambda: repositories.entity.load_active_character(str(guild_id), str(user_id))
+        )
+
+    async def get_character_by_name(self, guild_id, name: str) -> Optional[BaseCharacter]:
+        """The guild's character with exactly this name"""
+        from .repository_factory import repositories
+        context = self._context(guild_id)
+        return await self._resolve(
+            context, context.by_name, name,
+            lambda: repositories.character.load_by_name(str(guild_id), name)
+        )
+
+    def invalidate(self, guild_id: str = None) -> None:
+        """Forget everything cached for a guild, or for every guild"""
+        if guild_id is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(str(guild_id))
+
+    def invalidate_user(self, guild_id: str, user_id: str) -> None:
+        """Forget a user's active character after they switch or clear it"""
+        found, context = self.cache.peek(str(guild_id))
+        if found:
+            context.forget_user(str(user_id))
+
+    def cache_stats(self) -> dict:
+        return self.cache.stats()
+
+narration_context = NarrationContextResolver()
@@ -1,4 +1,7 @@
-from typing import Optional
+import asyncio
+import logging
+import threading
+from typing import Dict, Optional, Tuple
 from .base_repository import BaseRepository
 from data.models import Reminder, AutoReminderSettings, AutoReminderOptout, LastMessageTime
 
@@ -97,6 +100,11 @@ class AutoReminderOptoutRepository(BaseRepository[AutoReminderOptout]):
 class LastMessageTimeRepository(BaseRepository[LastMessageTime]):
     def __init__(self):
         super().__init__('last_message_times')
+        # Write-behind buffer: latest timestamp per (guild_id, user_id) not yet flushed
+        self._pending: Dict[Tuple[str, str], float] = {}
+        # Times taken out of the buffer by a flush whose write hasn't committed yet
+        self._in_flight: Dict[Tuple[str, str], float] = {}
+        self._pending_lock = threading.Lock()
     
     def to_dict(self, entity: LastMessageTime) -> dict:
         return {
@@ -121,8 +129,53 @@ class LastMessageTimeRepository(BaseRepository[LastMessageTime]):
         )
         self.save(last_msg, conflict_columns=['guild_id', 'user_id'])
     
+    def record_last_message_time(self, guild_id: str, user_id: str, timestamp: float) -> None:
+        """Buffer a last message time in memory; flush_pending() writes it out"""
+        key = (str(guild_id), str(user_id))
+        with self._pending_lock:
+            if timestamp > self._pending.get(key, float('-inf')):
+                self._pending[key] = timestamp
+    
+    def flush_pending(self) -> int:
+        """Write every buffered last message time with one multi-row upsert, returns rows written"""
+        with self._pending_lock:
+            pending, self._pending = self._pending, {}
+            self._in_flight.update(pending)
+        if not pending:
+            return 0
+        
+        rows = [
+            LastMessageTime(guild_id=guild_id, user_id=user_id, timestamp=timestamp)
+            for (guild_id, user_id), timestamp in pending.items()
+        ]
+        written = self.save_many(rows, conflict_columns=['guild_id', 'user_id'])
+        with self._pending_lock:
+            for key, timestamp in pending.items():
+                if self._in_flight.get(key) == timestamp:
+                    del self._in_flight[key]
+                if not written and timestamp > self._pending.get(key, float('-inf')):
+                    # Put the row back (unless something newer arrived meanwhile) and retry next flush
+                    self._pending[key] = timestamp
+        return written
+    
+    async def run_flush_loop(self, interval_seconds: float = 5.0) -> None:
+        """Flush buffered last message times every interval_seconds until cancelled"""
+        from .async_repository import run_in_db_executor
+        while True:
+            await asyncio.sleep(interval_seconds)
+            try:
+                await run_in_db_executor(self.flush_pending)
+            except Exception as e:
+                logging.error(f"Error flushing last message times: {e}")
+    
     def get_last_message_time(self, guild_id: str, user_id: str) -> Optional[float]:
         """Get last message time for a user"""
+        key = (str(guild_id), str(user_id))
+        with self._pending_lock:
+            pending = self._pending.get(key, self._in_flight.get(key))
+        if pending is not None:
+            return pending
+        
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND user_id = %s"
         last_msg = self.execute_query(query, (str(guild_id), str(user_id)), fetch_one=True)
         return last_msg.timestamp if last_msg else None
\ No newline at end of file
@@ -1,17 +1,22 @@
+from data.database import db_manager
 from data.repositories.entity_repository import EntityRepository
 from data.repositories.entity_link_repository import EntityLinkRepository
 from data.repositories.vw_entity_details_repository import EntityDetailsRepository
 from .channel_permission_repository import ChannelPermissionRepository
 from .server_repository import ServerRepository
+from .name_index import EntityNameIndex, name_index
+from .narration_context import NarrationContextResolver, narration_context
 from .homebrew_repository import HomebrewRepository
 from .character_repository import CharacterRepository, ActiveCharacterRepository
 from .scene_repository import SceneNotesRepository, SceneRepository, SceneNPCRepository, PinnedSceneMessageRepository
+from .scene_snapshot_repository import SceneSnapshotRepository
 from .initiative_repository import InitiativeRepository, ServerInitiativeDefaultsRepository
 from .reminder_repository import (
     ReminderRepository, AutoReminderSettingsRepository, 
     AutoReminderOptoutRepository, LastMessageTimeRepository
 )
 from .recap_repository import AutoRecapRepository, ApiKeyRepository
+from .async_repository import AsyncRepositoryFactory
 from .system_specific_repositories import (
     FateSceneAspectsRepository, FateSceneZonesRepository, FateGameAspectsRepository, 
     MGT2ESceneEnvironmentRepository, DefaultSkillsRepository, FateZoneAspectsRepository
@@ -32,6 +37,7 @@ class RepositoryFactory:
         self._scene_npc_repo = None
         self._scene_notes_repo = None
         self._pinned_scene_repo = None
+        self._scene_snapshot_repo = None
         
         # Initiative repositories
         self._initiative_repo = None
@@ -67,7 +73,20 @@ class RepositoryFactory:
         # Entity details view repository
         self._entity_details_repo = None
 
+        # Awaitable wrappers around the repositories above
+        self._async_factory = None
+
     # Core repositories
+    @property
+    def name_index(self) -> EntityNameIndex:
+        """In-memory per-guild entity name index used by autocompletes"""
+        return name_index
+
+    @property
+    def narration_context(self) -> NarrationContextResolver:
+        """Per-guild cache of the characters users speak as through narration"""
+        return narration_context
+
     @property
     def server(self) -> ServerRepository:
         if self._server_repo is None:
@@ -117,7 +136,13 @@ class RepositoryFactory:
         if self._pinned_scene_repo is None:
             self._pinned_scene_repo = PinnedSceneMessageRepository()
         return self._pinned_scene_repo
-    
+
+    @property
+    def scene_snapshot(self) -> SceneSnapshotRepository:
+        if self._scene_snapshot_repo is None:
+            self._scene_snapshot_repo = SceneSnapshotRepository()
+        return self._scene_snapshot_repo
+
     # Initiative repositories
     @property
     def initiative(self) -> InitiativeRepository:
@@ -234,5 +259,25 @@ class RepositoryFactory:
             self._entity_details_repo = EntityDetailsRepository()
         return self._entity_details_repo
 
+    # Unit of work
+    def transaction(self):
+        """
+        Context manager that runs every repository call inside it on one connection and commits once.
+
+        Usage:
+            with repositories.transaction():
+                repositories.link.delete_all_links_for_entity(guild_id, entity_id)
+                repositories.entity.delete(...)
+        """
+        return db_manager.transaction()
+
+    # Async repositories
+    @property
+    def aio(self) -> AsyncRepositoryFactory:
+        """Awaitable versions of every repository, e.g. await repositories.aio.entity.get_by_id(...)"""
+        if self._async_factory is None:
+            self._async_factory = AsyncRepositoryFactory(self)
+        return self._async_factory
+
 # Global repository factory instance
 repositories = RepositoryFactory()
\ No newline at end of file
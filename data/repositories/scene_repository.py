@@ -1,6 +1,7 @@
 from typing import List, Optional
 from .base_repository import BaseRepository
-from data.models import Scene, SceneNPC, PinnedSceneMessage, SceneNotes
+from data.database import db_manager
+from data.models import Character, Scene, SceneNPC, PinnedSceneMessage, SceneNotes
 import time
 import uuid
 
@@ -70,31 +71,37 @@ class SceneRepository(BaseRepository[Scene]):
     
     def set_active_scene(self, guild_id: str, scene_id: str) -> None:
         """Set a scene as active and deactivate all others"""
-        with self.db_manager.get_connection() as conn:
-            with conn.cursor() as cur:
-                # Deactivate all scenes in guild
-                cur.execute(
-                    f"UPDATE {self.table_name} SET is_active = false WHERE guild_id = %s",
-                    (str(guild_id),)
-                )
-                # Activate the specified scene
-                cur.execute(
-                    f"UPDATE {self.table_name} SET is_active = true WHERE guild_id = %s AND scene_id = %s",
-                    (str(guild_id), str(scene_id))
-                )
+        with db_manager.transaction():
+            # Deactivate all scenes in guild
+            self.execute_query(
+                f"UPDATE {self.table_name} SET is_active = false WHERE guild_id = %s",
+                (str(guild_id),)
+            )
+            # Activate the specified scene
+            self.execute_query(
+                f"UPDATE {self.table_name} SET is_active = true WHERE guild_id = %s AND scene_id = %s",
+                (str(guild_id), str(scene_id))
+            )
     
     def rename_scene(self, guild_id: str, scene_id: str, new_name: str) -> None:
         """Rename a scene"""
         query = f"UPDATE {self.table_name} SET name = %s WHERE guild_id = %s AND scene_id = %s"
         self.execute_query(query, (new_name, str(guild_id), str(scene_id)))
     
+    # Tables holding per-scene data that should go away with the scene
+    SCENE_DATA_TABLES = [
+        'scene_npcs', 'scene_notes', 'pinned_scene_messages',
+        'fate_scene_aspects', 'fate_scene_zones', 'fate_zone_aspects', 'mgt2e_scene_environment'
+    ]
+
     def delete_scene(self, guild_id: str, scene_id: str) -> bool:
-        """Delete a scene and return True if successful"""
-        deleted_count = self.delete(
-            "guild_id = %s AND scene_id = %s",
-            (str(guild_id), str(scene_id))
-        )
-        return deleted_count > 0
+        """Delete a scene and all its associated data, return True if successful"""
+        params = (str(guild_id), str(scene_id))
+        with db_manager.transaction():
+            for table in self.SCENE_DATA_TABLES:
+                self.execute_query(f"DELETE FROM {table} WHERE guild_id = %s AND scene_id = %s", params)
+            deleted_count = self.delete("guild_id = %s AND scene_id = %s", params)
+        return bool(deleted_count)
 
 class SceneNPCRepository(BaseRepository[SceneNPC]):
     def __init__(self):
@@ -116,8 +123,9 @@ class SceneNPCRepository(BaseRepository[SceneNPC]):
     
     def get_scene_npc_ids(self, guild_id: str, scene_id: str) -> List[str]:
         """Get all NPC IDs in a scene"""
-        scene_npcs = self.find_all_by_column('guild_id', str(guild_id))
-        return [snpc.npc_id for snpc in scene_npcs if snpc.scene_id == scene_id]
+        query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s AND scene_id = %s"
+        scene_npcs = self.execute_query(query, (str(guild_id), str(scene_id)))
+        return [snpc.npc_id for snpc in scene_npcs]
     
     def add_npc_to_scene(self, guild_id: str, scene_id: str, npc_id: str) -> None:
         """Add an NPC to a scene"""
@@ -136,35 +144,33 @@ class SceneNPCRepository(BaseRepository[SceneNPC]):
         )
         return deleted_count > 0
     
-    def get_scene_npcs(self, guild_id: str, scene_name: str = None) -> List[dict]:
-        """Get NPCs for a scene - helper method for initiative commands"""
+    def get_scene_npcs(self, guild_id: str, scene_name: str = None, scene_id: str = None) -> List[Character]:
+        """Get NPCs for a scene by name (case-insensitive), by ID, or the active scene - helper method for initiative commands"""
         from .repository_factory import repositories
         
-        if scene_name:
-            # Get specific scene
-            scenes = repositories.scene.find_all_by_column('guild_id', str(guild_id))
-            scene = next((s for s in scenes if s.name.lower() == scene_name.lower()), None)
-            if not scene:
-                return []
-            
-            # Get NPCs for this scene
-            scene_npcs = self.find_all_by_column('scene_id', scene.scene_id)
-            npc_ids = [sn.npc_id for sn in scene_npcs]
-            
-            # Get the actual NPC character objects
-            all_chars = repositories.character.find_all_by_column('guild_id', str(guild_id))
-            return [c for c in all_chars if c.is_npc and c.id in npc_ids]
+        if scene_id:
+            scene_filter = "sn.scene_id = %s"
+            params = (str(guild_id), str(scene_id))
+        elif scene_name:
+            # Served by idx_scenes_guild_lower_name
+            scene_filter = """sn.scene_id = (
+                SELECT scene_id FROM scenes
+                WHERE guild_id = %s AND LOWER(name) = LOWER(%s)
+                ORDER BY creation_time
+                LIMIT 1
+            )"""
+            params = (str(guild_id), str(guild_id), scene_name)
         else:
-            # Get active scene NPCs
-            active_scene = repositories.scene.get_active_scene(str(guild_id))
-            if not active_scene:
-                return []
-            
-            scene_npcs = self.find_all_by_column('scene_id', active_scene.scene_id)
-            npc_ids = [sn.npc_id for sn in scene_npcs]
-            
-            all_chars = repositories.character.find_all_by_column('guild_id', str(guild_id))
-            return [c for c in all_chars if c.is_npc and c.id in npc_ids]
+            scene_filter = "sn.scene_id = (SELECT scene_id FROM scenes WHERE guild_id = %s AND is_active = true LIMIT 1)"
+            params = (str(guild_id), str(guild_id))
+        
+        query = f"""
+            SELECT e.* FROM {self.table_name} sn
+            JOIN entities e ON e.id = sn.npc_id
+            WHERE sn.guild_id = %s AND {scene_filter} AND e.entity_type = 'npc'
+            ORDER BY e.name
+        """
+        return repositories.character.execute_query(query, params)
 
 class PinnedSceneMessageRepository(BaseRepository[PinnedSceneMessage]):
     def __init__(self):
@@ -0,0 +1,104 @@
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from core.base_models import BaseEntity, SystemType
+from rpg_systems.fate.aspect import Aspect
+from data.database import db_manager
+from data.models import Scene
+import json
+import logging
+
+@dataclass
+class SceneSnapshot:
+    """Everything needed to render a scene, loaded in one query"""
+    scene: Scene
+    notes: Optional[str] = None
+    npcs: List[BaseEntity] = field(default_factory=list)
+    # Fate
+    game_aspects: List[Aspect] = field(default_factory=list)
+    scene_aspects: List[Aspect] = field(default_factory=list)
+    zones: List[str] = field(default_factory=list)
+    zone_aspects: Dict[str, List[Aspect]] = field(default_factory=dict)
+    # MGT2E
+    environment: Dict[str, str] = field(default_factory=dict)
+
+def _json(value, default):
+    """Decode a JSON column that may arrive as text or already parsed"""
+    if isinstance(value, str):
+        value = json.loads(value)
+    return default if value is None else value
+
+class SceneSnapshotRepository:
+    """Read-only loader joining a scene with its notes, NPCs and system-specific data"""
+    table_name = 'scenes'
+
+    # Extra (columns, joins) per system, appended to the base snapshot query
+    SYSTEM_SECTIONS = {
+        SystemType.FATE: (
+            """,
+            fa.aspects AS scene_aspects,
+            fz.zones,
+            ga.rows AS game_aspects,
+            za.rows AS zone_aspects""",
+            """
+            LEFT JOIN fate_scene_aspects fa ON fa.guild_id = s.guild_id AND fa.scene_id = s.scene_id
+            LEFT JOIN fate_scene_zones fz ON fz.guild_id = s.guild_id AND fz.scene_id = s.scene_id
+            LEFT JOIN LATERAL (
+                SELECT jsonb_agg(ga.aspect::jsonb ORDER BY ga.id) AS rows
+                FROM fate_game_aspects ga
+                WHERE ga.guild_id = s.guild_id
+            ) ga ON TRUE
+            LEFT JOIN LATERAL (
+                SELECT jsonb_agg(jsonb_build_object('zone_name', za.zone_name, 'aspect', za.aspect::jsonb) ORDER BY za.id) AS rows
+                FROM fate_zone_aspects za
+                WHERE za.guild_id = s.guild_id AND za.scene_id = s.scene_id
+            ) za ON TRUE"""
+        ),
+        SystemType.MGT2E: (
+            """,
+            env.environment""",
+            """
+            LEFT JOIN mgt2e_scene_environment env ON env.guild_id = s.guild_id AND env.scene_id = s.scene_id"""
+        ),
+    }
+
+    def from_dict(self, data: dict) -> SceneSnapshot:
+        from .repository_factory import repositories
+
+        zone_aspects: Dict[str, List[Aspect]] = {}
+        for row in _json(data.get('zone_aspects'), []):
+            zone_aspects.setdefault(row['zone_name'], []).append(Aspect.from_dict(row['aspect']))
+
+        return SceneSnapshot(
+            scene=repositories.scene.from_dict(data),
+            notes=data.get('notes'),
+            npcs=[repositories.entity._row_to_entity(row) for row in _json(data.get('npcs'), [])],
+            game_aspects=[Aspect.from_dict(aspect) for aspect in _json(data.get('game_aspects'), [])],
+            scene_aspects=[Aspect.from_dict(aspect) for aspect in _json(data.get('scene_aspects'), [])],
+            zones=_json(data.get('zones'), []),
+            zone_aspects=zone_aspects,
+            environment=_json(data.get('environment'), {})
+        )
+
+    def load(self, guild_id: str, scene_id: str, system: SystemType = None) -> Optional[SceneSnapshot]:
+        """Load a scene with its notes, NPCs and the given system's scene data in one round trip"""
+        columns, joins = self.SYSTEM_SECTIONS.get(system, ("", ""))
+        query = f"""
+            SELECT s.*, n.notes, npcs.rows AS npcs{columns}
+            FROM {self.table_name} s
+            LEFT JOIN scene_notes n ON n.guild_id = s.guild_id AND n.scene_id = s.scene_id
+            LEFT JOIN LATERAL (
+                SELECT jsonb_agg(to_jsonb(e) ORDER BY e.name) AS rows
+                FROM scene_npcs sn
+                JOIN entities e ON e.id = sn.npc_id
+                WHERE sn.guild_id = s.guild_id AND sn.scene_id = s.scene_id
+            ) npcs ON TRUE{joins}
+            WHERE s.guild_id = %s AND s.scene_id = %s
+        """
+        try:
+            with db_manager.get_cursor() as cur:
+                cur.execute(query, (str(guild_id), str(scene_id)))
+                row = cur.fetchone()
+        except Exception as e:
+            logging.error(f"Database error: {e}")
+            return None
+        return self.from_dict(dict(row)) if row else None
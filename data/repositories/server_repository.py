@@ -1,13 +1,19 @@
+import logging
+import os
 from typing import Optional
 
 from core.base_models import SystemType
+from data.database import db_manager
 from .base_repository import BaseRepository
+from .cache import TTLCache
 from data.models import ServerSettings
 import discord
 
 class ServerRepository(BaseRepository[ServerSettings]):
     def __init__(self):
         super().__init__('server_settings')
+        # Settings are read by nearly every command, autocomplete and interaction_check
+        self.cache = TTLCache(ttl_seconds=float(os.getenv('SERVER_SETTINGS_CACHE_TTL', '300')))
     
     def to_dict(self, entity: ServerSettings) -> dict:
         return {
@@ -28,9 +34,37 @@ class ServerRepository(BaseRepository[ServerSettings]):
         )
     
     def get_by_guild_id(self, guild_id: str) -> Optional[ServerSettings]:
-        """Get server settings by guild ID"""
+        """Get server settings by guild ID (cached, treat the result as read-only)"""
+        # Inside a transaction we may see uncommitted writes, so don't cache those reads
+        try:
+            return self.cache.get_or_load(
+                str(guild_id),
+                lambda: self._load_by_guild_id(guild_id),
+                store=not db_manager.in_transaction
+            )
+        except Exception as e:
+            # Failed loads aren't cached, so the next lookup tries the database again
+            logging.error(f"Database error: {e}")
+            return None
+    
+    def _load_by_guild_id(self, guild_id: str) -> Optional[ServerSettings]:
         query = f"SELECT * FROM {self.table_name} WHERE guild_id = %s"
-        return self.execute_query(query, (str(guild_id),), fetch_one=True)
+        return self.select_or_raise(query, (str(guild_id),), fetch_one=True)
+    
+    def _save_settings(self, server: ServerSettings) -> None:
+        self.save(server, conflict_columns=['guild_id'])
+        self.cache.invalidate(str(server.guild_id))
+    
+    def invalidate_cache(self, guild_id: str = None) -> None:
+        """Drop cached settings for one guild, or for every guild"""
+        if guild_id is None:
+            self.cache.clear()
+        else:
+            self.cache.invalidate(str(guild_id))
+    
+    def cache_stats(self) -> dict:
+        """Hit/miss counters for the settings cache"""
+        return self.cache.stats()
     
     def get_system(self, guild_id: int) -> SystemType:
         """Get the RPG system for a guild"""
@@ -39,7 +73,11 @@ class ServerRepository(BaseRepository[ServerSettings]):
 
     async def has_gm_permission(self, guild_id: int, user: discord.Member) -> bool:
         """Check if user has GM permissions"""
-        server_settings = self.get_by_guild_id(str(guild_id))
+        found, server_settings = self.cache.get_if_cached(str(guild_id))
+        if not found:
+            # Only a cache miss needs the DB executor
+            from .async_repository import run_in_db_executor
+            server_settings = await run_in_db_executor(self.get_by_guild_id, str(guild_id))
         if server_settings and server_settings.gm_role_id:
             gm_role = user.guild.get_role(int(server_settings.gm_role_id))
             if gm_role and gm_role in user.roles:
@@ -49,12 +87,12 @@ class ServerRepository(BaseRepository[ServerSettings]):
     
     def set_system(self, guild_id: str, system: SystemType) -> None:
         """Set the RPG system for a server"""
-        server = self.get_by_guild_id(guild_id)
+        server = self._load_by_guild_id(guild_id)
         if server:
             server.system = system.value
         else:
             server = ServerSettings(guild_id=guild_id, system=system.value)
-        self.save(server, conflict_columns=['guild_id'])
+        self._save_settings(server)
     
     def get_gm_role_id(self, guild_id: int) -> Optional[str]:
         """Get GM role ID for a guild"""
@@ -63,9 +101,9 @@ class ServerRepository(BaseRepository[ServerSettings]):
     
     def set_gm_role(self, guild_id: int, role_id: int) -> None:
         """Set GM role for a guild"""
-        server = self.get_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
+        server = self._load_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
         server.gm_role_id = str(role_id)
-        self.save(server, conflict_columns=['guild_id'])
+        self._save_settings(server)
     
     def get_player_role_id(self, guild_id: int) -> Optional[str]:
         """Get player role ID for a guild"""
@@ -74,9 +112,9 @@ class ServerRepository(BaseRepository[ServerSettings]):
     
     def set_player_role(self, guild_id: int, role_id: int) -> None:
         """Set player role for a guild"""
-        server = self.get_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
+        server = self._load_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
         server.player_role_id = str(role_id)
-        self.save(server, conflict_columns=['guild_id'])
+        self._save_settings(server)
 
     def get_generic_base_roll(self, guild_id: int) -> Optional[int]:
         """Get the generic base roll for a guild"""
@@ -85,6 +123,6 @@ class ServerRepository(BaseRepository[ServerSettings]):
     
     def set_generic_base_roll(self, guild_id: int, base_roll: str) -> None:
         """Set the generic base roll for a guild"""
-        server = self.get_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
+        server = self._load_by_guild_id(str(guild_id)) or ServerSettings(guild_id=str(guild_id))
         server.generic_base_roll = base_roll
-        self.save(server, conflict_columns=['guild_id'])
\ No newline at end of file
+        self._save_settings(server)
\ No newline at end of file
@@ -3,6 +3,7 @@ from typing import List, Optional, Dict, Any
 from core.base_models import SystemType
 from rpg_systems.fate.aspect import Aspect, AspectType
 from .base_repository import BaseRepository
+from data.database import db_manager
 from data.models import FateSceneAspects, FateSceneZones, GameAspect, MGT2ESceneEnvironment, DefaultSkills, ZoneAspect
 import json
 
@@ -191,7 +192,7 @@ class DefaultSkillsRepository(BaseRepository[DefaultSkills]):
 
 class FateGameAspectsRepository(BaseRepository[GameAspect]):
     def __init__(self):
-        super().__init__('game_aspects')
+        super().__init__('fate_game_aspects')
         
     def to_dict(self, entity: GameAspect) -> dict:
         return {
@@ -236,9 +237,24 @@ class FateGameAspectsRepository(BaseRepository[GameAspect]):
         """Clear all game aspects for a guild."""
         self.delete(f"guild_id = %s", (str(guild_id),))
 
+    def replace_game_aspects(self, guild_id: str, aspects: List[Aspect]):
+        """Replace all game aspects for a guild in one transaction."""
+        game_aspects = []
+        for aspect in aspects:
+            aspect.aspect_type = AspectType.GAME
+            game_aspects.append(GameAspect(
+                guild_id=str(guild_id),
+                aspect_name=aspect.name,
+                aspect=aspect.to_dict()
+            ))
+        
+        with db_manager.transaction():
+            self.clear_game_aspects(guild_id)
+            self.save_many(game_aspects, conflict_columns=['guild_id', 'aspect_name'])
+
 class FateZoneAspectsRepository(BaseRepository[ZoneAspect]):
     def __init__(self):
-        super().__init__('zone_aspects')
+        super().__init__('fate_zone_aspects')
     
     def to_dict(self, entity: ZoneAspect) -> dict:
         return {
@@ -311,4 +327,22 @@ class FateZoneAspectsRepository(BaseRepository[ZoneAspect]):
     def clear_zone_aspects(self, guild_id: str, scene_id: str):
         """Clear all zone aspects for a specific scene."""
         query = f"DELETE FROM fate_zone_aspects WHERE guild_id = %s AND scene_id = %s"
-        self.execute_query(query, (str(guild_id), str(scene_id)))
\ No newline at end of file
+        self.execute_query(query, (str(guild_id), str(scene_id)))
+
+    def replace_zone_aspects(self, guild_id: str, scene_id: str, aspects_by_zone: Dict[str, List[Aspect]]):
+        """Replace all zone aspects for a scene in one transaction."""
+        zone_aspects = []
+        for zone_name, aspects in aspects_by_zone.items():
+            for aspect in aspects:
+                aspect.aspect_type = AspectType.ZONE
+                zone_aspects.append(ZoneAspect(
+                    guild_id=str(guild_id),
+                    scene_id=str(scene_id),
+                    zone_name=zone_name,
+                    aspect_name=aspect.name,
+                    aspect=aspect.to_dict()
+                ))
+        
+        with db_manager.transaction():
+            self.clear_zone_aspects(guild_id, scene_id)
+            self.save_many(zone_aspects, conflict_columns=['guild_id', 'scene_id', 'zone_name', 'aspect_name'])
\ No newline at end of file
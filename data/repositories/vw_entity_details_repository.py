@@ -1,5 +1,5 @@
 import json
-from typing import Optional
+from typing import List, Optional
 from data.models import EntityDetails
 from data.repositories.base_repository import BaseRepository
 
@@ -41,4 +41,18 @@ class EntityDetailsRepository(BaseRepository[EntityDetails]):
         )
     
     def get_by_id(self, entity_id: str) -> Optional[EntityDetails]:
-        return self.find_by_id('id', entity_id)
\ No newline at end of file
+        return self.find_by_id('id', entity_id)
+
+    def get_many(self, entity_ids: List[str]) -> List[EntityDetails]:
+        """Get details for many entities, aggregating only their links in one query"""
+        if not entity_ids:
+            return []
+        ids = [str(entity_id) for entity_id in entity_ids]
+        query = """
+            SELECT e.id, e.guild_id, e.name, e.owner_id, e.entity_type, e.system, e.avatar_url, e.access_type,
+                   s.possessed_items, s.possessed_by, s.controls, s.controlled_by
+            FROM entities e
+            LEFT JOIN entity_link_summary(%s) s ON s.entity_id = e.id
+            WHERE e.id = ANY(%s)
+        """
+        return self.execute_query(query, (ids, ids))
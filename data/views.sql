@@ -1,8 +1,43 @@
-
 -- This SQL script creates a view that aggregates entity details along with their links
 -- Update this if you add new link types or entity attributes
+
+-- Link summary per entity. Every link is read once per direction, joined to the
+-- entity on the other end once, and aggregated in a single GROUP BY.
+-- Pass entity_ids to summarize only those entities; NULL summarizes every entity.
+CREATE OR REPLACE FUNCTION entity_link_summary(entity_ids TEXT[] DEFAULT NULL)
+RETURNS TABLE (
+    entity_id TEXT,
+    possessed_items JSONB,
+    possessed_by JSONB,
+    controls JSONB,
+    controlled_by JSONB
+)
+LANGUAGE sql STABLE AS $$
+    SELECT
+        l.entity_id,
+        jsonb_agg(jsonb_build_object('id', other.id, 'name', other.name))
+            FILTER (WHERE l.outgoing AND l.link_type = 'possesses'),
+        jsonb_agg(jsonb_build_object('id', other.id, 'name', other.name))
+            FILTER (WHERE NOT l.outgoing AND l.link_type = 'possesses'),
+        jsonb_agg(jsonb_build_object('id', other.id, 'name', other.name))
+            FILTER (WHERE l.outgoing AND l.link_type = 'controls'),
+        jsonb_agg(jsonb_build_object('id', other.id, 'name', other.name))
+            FILTER (WHERE NOT l.outgoing AND l.link_type = 'controls')
+    FROM (
+        SELECT from_entity_id AS entity_id, to_entity_id AS other_id, link_type, TRUE AS outgoing
+        FROM entity_links
+        WHERE entity_ids IS NULL OR from_entity_id = ANY(entity_ids)
+        UNION ALL
+        SELECT to_entity_id, from_entity_id, link_type, FALSE
+        FROM entity_links
+        WHERE entity_ids IS NULL OR to_entity_id = ANY(entity_ids)
+    ) l
+    JOIN entities other ON other.id = l.other_id
+    GROUP BY l.entity_id
+$$;
+
 CREATE OR REPLACE VIEW vw_entity_details AS
-SELECT 
+SELECT
     e.id,
     e.guild_id,
     e.name,
@@ -11,29 +46,9 @@ SELECT
     e.system,
     e.avatar_url,
     e.access_type,
-    (
-        SELECT jsonb_agg(jsonb_build_object('id', child.id, 'name', child.name))
-        FROM entity_links el
-        JOIN entities child ON el.to_entity_id = child.id
-        WHERE el.from_entity_id = e.id AND el.link_type = 'possesses'
-    ) AS possessed_items,
-    (
-        SELECT jsonb_agg(jsonb_build_object('id', parent.id, 'name', parent.name))
-        FROM entity_links el
-        JOIN entities parent ON el.from_entity_id = parent.id
-        WHERE el.to_entity_id = e.id AND el.link_type = 'possesses'
-    ) AS possessed_by,
-    (
-        SELECT jsonb_agg(jsonb_build_object('id', child.id, 'name', child.name))
-        FROM entity_links el
-        JOIN entities child ON el.to_entity_id = child.id
-        WHERE el.from_entity_id = e.id AND el.link_type = 'controls'
-    ) AS controls,
-    (
-        SELECT jsonb_agg(jsonb_build_object('id', parent.id, 'name', parent.name))
-        FROM entity_links el
-        JOIN entities parent ON el.from_entity_id = parent.id
-        WHERE el.to_entity_id = e.id AND el.link_type = 'controls'
-    ) AS controlled_by
-FROM entities e;
-
+    s.possessed_items,
+    s.possessed_by,
+    s.controls,
+    s.controlled_by
+FROM entities e
+LEFT JOIN entity_link_summary() s ON s.entity_id = e.id;
@@ -7,6 +7,9 @@ from commands.narration import process_narration
 from commands import character_commands, entity_commands, initiative_commands, link_commands, reminder_commands, roll_commands, scene_commands, setup_commands, recap_commands, rules_commands
 from rpg_systems.fate import fate_commands
 from core.initiative_views import GenericInitiativeView, PopcornInitiativeView
+from core.message_dispatch import MessageClass, classify_message, message_stats
+from core.message_editor import pinned_message_editor
+from core.webhook_cache import character_webhooks
 from core.scene_views import GenericSceneView
 from rpg_systems.fate.fate_scene_views import FateSceneView
 from rpg_systems.mgt2e.mgt2e_scene_views import MGT2ESceneView
@@ -69,6 +72,14 @@ async def setup_hook():
     bot.add_view(FateSceneView())
     bot.add_view(MGT2ESceneView())
 
+    # Periodically write buffered last message times
+    bot.loop.create_task(repositories.last_message_time.run_flush_loop(
+        float(os.getenv('LAST_MESSAGE_FLUSH_SECONDS', '5'))
+    ))
+
+    # Pinned scene and initiative edits arriving within this window are coalesced into one
+    pinned_message_editor.debounce_seconds = float(os.getenv('PINNED_EDIT_DEBOUNCE_SECONDS', '0.5'))
+
     # Sync the command tree
     await bot.tree.sync()
 
@@ -76,6 +87,11 @@ async def setup_hook():
 async def on_ready():
     print(f'Logged in as {bot.user}!')
 
+@bot.event
+async def on_webhooks_update(channel):
+    # A webhook in this channel was created, edited or deleted; look ours up again on the next post if it is gone
+    await character_webhooks.invalidate_if_missing(channel)
+
 @bot.event
 async def on_guild_join(guild):
     # Try to DM the owner
@@ -98,22 +114,31 @@ async def on_guild_join(guild):
 
 @bot.event
 async def on_message(message: discord.Message):
-    # Don't process commands here - we use the app_commands system
-    
-    # Update the last message time for the user
-    if message.guild:
-        if message.author.id != bot.user.id:
-            repositories.last_message_time.update_last_message_time(message.guild.id, message.author.id, message.created_at.timestamp())
-    
-    # Handle mentions for automatic reminders (only for non-narration messages)
+    # Decide up front which stages apply, so most messages skip everything but a dict update
+    message_class = classify_message(message, bot.user.id, bot.command_prefix)
+    with message_stats.track(message_class):
+        await dispatch_message(message, message_class)
+
+async def dispatch_message(message: discord.Message, message_class: MessageClass):
+    if message_class is MessageClass.DIRECT:
+        # Don't process commands here - we use the app_commands system; only prefix commands matter
+        if message.content.startswith(bot.command_prefix):
+            await bot.process_commands(message)
+        return
+
+    # Update the last message time for people posting in the guild
+    if message_class in (MessageClass.NARRATION, MessageClass.COMMAND, MessageClass.MENTION, MessageClass.CHAT):
+        # Buffered in memory and written in batches by the flush loop started in setup_hook
+        repositories.last_message_time.record_last_message_time(message.guild.id, message.author.id, message.created_at.timestamp())
+
+    # Handle mentions for automatic reminders, whoever sent the message (e.g. our own turn pings)
     if message.guild and message.mentions:
         reminder_cog = bot.get_cog("ReminderCommands")
         if reminder_cog:
             for user in message.mentions:
                 await reminder_cog.handle_mention(message, user)
 
-    # Process narration
-    if message.author.id != bot.user.id and (message.content.startswith("gm::") or message.content.startswith("pc::") or message.content.startswith("npc::")):
+    if message_class is MessageClass.NARRATION:
         try:
             await process_narration(message)
         except Exception as e:
@@ -122,9 +147,8 @@ async def on_message(message: discord.Message):
                 await message.reply(f"❌ Error processing character speech: {str(e)}", delete_after=10)
             except:
                 pass
-        return
-
-    await bot.process_commands(message)
+    elif message_class is MessageClass.COMMAND:
+        await bot.process_commands(message)
 
 @bot.command()
 async def myguild(ctx):
@@ -134,4 +158,12 @@ is_deployment = os.getenv("RAILWAY_ENVIRONMENT") is not None
 log_level = logging.INFO if is_deployment else logging.DEBUG
 
 handler = logging.FileHandler(filename='discord.log', encoding='utf-8', mode='w')
-bot.run(os.getenv("DISCORD_BOT_TOKEN"), log_handler=handler, log_level=log_level)
\ No newline at end of file
+bot.run(os.getenv("DISCORD_BOT_TOKEN"), log_handler=handler, log_level=log_level)
+
+logging.info(f"Pinned message edits: {pinned_message_editor.stats()}")
+logging.info(f"Character webhooks: {character_webhooks.stats()}")
+logging.info(f"on_message by message class: {message_stats.stats()}")
+
+# Write any buffered last message times, then release pooled database connections
+repositories.last_message_time.flush_pending()
+db_manager.close_pool()
\ No newline at end of file
@@ -108,12 +108,7 @@ class FateCommands(commands.Cog):
         npc_aspects_by_character = {}
         npc_ids = repositories.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(active_scene.scene_id))
         
-        for npc_id in npc_ids:
-            # Get all characters and find the specific NPC
-            npc = repositories.entity.get_by_id(str(npc_id))
-            if not npc:
-                continue
-                
+        for npc in repositories.entity.get_by_ids(npc_ids):
             # Get aspect data for this NPC
             character_aspects = []
             if npc.aspects:
@@ -14,6 +14,10 @@ class FateRollFormula(RollFormula):
         super().__init__(roll_parameters_dict)
         self.skill = roll_parameters_dict.get("skill") if roll_parameters_dict else None
 
+    def base_dice(self) -> str:
+        """The dice expression for a Fate roll: four Fate dice"""
+        return "4df"
+
     def get_modifiers(self, character: "FateCharacter") -> Dict[str, str]:
         modifiers = super().get_modifiers(character).items()
         if self.skill:
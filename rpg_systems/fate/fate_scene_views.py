@@ -25,25 +25,21 @@ class FateSceneView(BasePinnableSceneView):
             return
 
     async def create_scene_content(self):
-        # Get scene info
-        scene = repositories.scene.find_by_id('scene_id', self.scene_id)
-        if not scene:
+        # Load the scene and all of its Fate data in one query
+        snapshot = await repositories.aio.scene_snapshot.load(str(self.guild_id), str(self.scene_id), SYSTEM)
+        if not snapshot:
             return discord.Embed(
                 title="❌ Scene Not Found",
                 description="This scene no longer exists.",
                 color=discord.Color.red()
             ), "❌ **SCENE ERROR** ❌"
         
-        # Format scene content - standard part
-                
-        # Get scene notes
-        notes = repositories.scene_notes.get_scene_notes(str(self.guild_id), str(self.scene_id))
-        
-        # Get Fate-specific data
-        game_aspects = repositories.fate_game_aspects.get_game_aspects(str(self.guild_id)) or []
-        scene_aspects = repositories.fate_aspects.get_aspects(str(self.guild_id), str(self.scene_id)) or []
-        scene_zones = repositories.fate_zones.get_zones(str(self.guild_id), str(self.scene_id)) or []
-        zone_aspects = repositories.fate_zone_aspects.get_all_zone_aspects_for_scene(str(self.guild_id), str(self.scene_id)) or {}
+        scene = snapshot.scene
+        notes = snapshot.notes
+        game_aspects = snapshot.game_aspects
+        scene_aspects = snapshot.scene_aspects
+        scene_zones = snapshot.zones
+        zone_aspects = snapshot.zone_aspects
         
         # Create embed
         embed = discord.Embed(
@@ -117,13 +113,8 @@ class FateSceneView(BasePinnableSceneView):
                 description += zone_line + "\n"
             description += "\n"
         
-        # Get NPCs in scene
-        npc_ids = repositories.scene_npc.get_scene_npc_ids(str(self.guild_id), str(self.scene_id))
-        lines = []
-        for npc_id in npc_ids:
-            npc = repositories.entity.get_by_id(str(npc_id))
-            if npc:
-                lines.append(npc.format_npc_scene_entry(is_gm=self.is_gm))
+        # NPCs in scene
+        lines = [npc.format_npc_scene_entry(is_gm=self.is_gm) for npc in snapshot.npcs]
             
         if lines:
             description += "**NPCs:**\n"
@@ -217,10 +208,10 @@ class ManageNPCsButton(ui.Button):
             return
         
         # Get available NPCs
-        npcs = repositories.character.get_npcs(str(interaction.guild.id))
+        npcs = await repositories.aio.character.get_npcs(str(interaction.guild.id))
         
         # Get NPCs currently in the scene
-        scene_npc_ids = repositories.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
+        scene_npc_ids = await repositories.aio.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
         
         # Create selection options for NPCs
         options = []
@@ -271,7 +262,7 @@ class ZoneEditOptionsView(discord.ui.View):
     @discord.ui.button(label="Edit Zone Aspects", style=discord.ButtonStyle.secondary)
     async def edit_zone_aspects(self, interaction: discord.Interaction, button: discord.ui.Button):
         # Get current zones
-        zones = repositories.fate_zones.get_zones(str(self.parent_view.guild_id), str(self.parent_view.scene_id)) or []
+        zones = await repositories.aio.fate_zones.get_zones(str(self.parent_view.guild_id), str(self.parent_view.scene_id)) or []
         
         if not zones:
             await interaction.response.send_message("❌ No zones found. Create zones first.", ephemeral=True)
@@ -300,7 +291,7 @@ class ManageNPCsSelect(discord.ui.Select):
         
     async def callback(self, interaction: discord.Interaction):
         # Get current NPCs in scene
-        scene_npc_ids = repositories.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
+        scene_npc_ids = await repositories.aio.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
         
         # NPCs to add (selected but not in scene)
         to_add = [npc_id for npc_id in self.values if npc_id not in scene_npc_ids]
@@ -310,13 +301,13 @@ class ManageNPCsSelect(discord.ui.Select):
         
         # Perform the updates
         for npc_id in to_add:
-            repositories.scene_npc.add_npc_to_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
+            await repositories.aio.scene_npc.add_npc_to_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
             
         for npc_id in to_remove:
-            repositories.scene_npc.remove_npc_from_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
+            await repositories.aio.scene_npc.remove_npc_from_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
     
         # Check if this is the active scene before updating pins
-        scene = repositories.scene.find_by_id('scene_id', self.parent_view.scene_id)
+        scene = await repositories.aio.scene.find_by_id('scene_id', self.parent_view.scene_id)
     
         # Only update all pinned instances if this is the active scene
         if scene and scene.is_active:
@@ -415,12 +406,8 @@ class EditGameAspectsModal(discord.ui.Modal, title="Edit Game Aspects"):
                     free_invokes=free_invokes
                 ))
                 
-        # Clear existing game aspects first, then add new ones
-        repositories.fate_game_aspects.clear_game_aspects(str(self.parent_view.guild_id))
-        
-        # Update game aspects in DB
-        for aspect in aspects:
-            repositories.fate_game_aspects.set_game_aspect(str(self.parent_view.guild_id), aspect)
+        # Replace existing game aspects with the new ones in one write
+        await repositories.aio.fate_game_aspects.replace_game_aspects(str(self.parent_view.guild_id), aspects)
         
         # Update the view - this will now update both pinned and ephemeral messages
         await self.parent_view.update_view(interaction)
@@ -499,7 +486,7 @@ class EditSceneAspectsModal(discord.ui.Modal, title="Edit Scene Aspects"):
                 ))
         
         # Update aspects in DB
-        repositories.fate_aspects.set_aspects(str(self.parent_view.guild_id), str(self.parent_view.scene_id), aspects)
+        await repositories.aio.fate_aspects.set_aspects(str(self.parent_view.guild_id), str(self.parent_view.scene_id), aspects)
         
         # Update the view - this will now update both pinned and ephemeral messages
         await self.parent_view.update_view(interaction)
@@ -530,7 +517,7 @@ class EditZonesModal(discord.ui.Modal, title="Edit Scene Zones"):
         zone_lines = [line for line in zone_lines if line]
         
         # Update zones in DB
-        repositories.fate_zones.set_zones(str(self.parent_view.guild_id), str(self.parent_view.scene_id), zone_lines)
+        await repositories.aio.fate_zones.set_zones(str(self.parent_view.guild_id), str(self.parent_view.scene_id), zone_lines)
         
         # Update the view - this will now update both pinned and ephemeral messages
         await self.parent_view.update_view(interaction)
@@ -578,14 +565,8 @@ class EditZoneAspectsModal(discord.ui.Modal, title="Edit Zone Aspects"):
         self.add_item(self.zone_aspects)
 
     async def on_submit(self, interaction: discord.Interaction):
-        # Clear existing zone aspects for this scene
-        for zone in self.zones:
-            repositories.fate_zone_aspects.clear_zone_aspects(
-                str(self.parent_view.guild_id), 
-                str(self.parent_view.scene_id)
-            )
-        
         # Parse new zone aspects
+        aspects_by_zone = {}
         aspect_lines = [line.strip() for line in self.zone_aspects.value.splitlines()]
         aspect_lines = [line for line in aspect_lines if line and ':' in line]
         
@@ -629,14 +610,14 @@ class EditZoneAspectsModal(discord.ui.Modal, title="Edit Zone Aspects"):
                     free_invokes=free_invokes
                 ))
             
-            # Save aspects for this zone
-            for aspect in aspects:
-                repositories.fate_zone_aspects.set_zone_aspect(
-                    str(self.parent_view.guild_id),
-                    str(self.parent_view.scene_id),
-                    zone_name,
-                    aspect
-                )
+            aspects_by_zone.setdefault(zone_name, []).extend(aspects)
+        
+        # Replace existing zone aspects for this scene in one write
+        await repositories.aio.fate_zone_aspects.replace_zone_aspects(
+            str(self.parent_view.guild_id),
+            str(self.parent_view.scene_id),
+            aspects_by_zone
+        )
         
         # Update the view
         await self.parent_view.update_view(interaction)
\ No newline at end of file
@@ -1,7 +1,8 @@
-import random
-from typing import Dict
+from typing import Dict, List, Tuple
 from dataclasses import dataclass
 from core.base_models import RollFormula
+from core.dice_expression import compile_dice
+from core.roll_odds import Distribution, dice_distribution
 from typing import TYPE_CHECKING
 
 if TYPE_CHECKING:
@@ -114,52 +115,42 @@ class MGT2ERollFormula(RollFormula):
             
         return modifiers
     
+    def base_dice(self) -> str:
+        """The dice expression for a 2d6 check: 3d6 keeping the best or worst two with a boon or bane"""
+        net_effect = self.boon_bane.net_effect
+        if net_effect > 0:
+            return "3d6kh2"
+        if net_effect < 0:
+            return "3d6kl2"
+        return "2d6"
+
     def roll_formula(self, character: "MGT2ECharacter", base_roll: str) -> tuple:
         """Execute MGT2E boon/bane rolling mechanics"""
         
         # For MGT2E, the base roll should be 2d6, but we'll roll 3d6 for boons/banes
         if not base_roll.startswith("2d6"):
             # If it's not a 2d6 roll, fall back to standard mechanics
-            return super().roll_formula(character, base_roll, self)
-        
-        # Roll 3d6 for boon/bane mechanics
-        dice_rolls = [random.randint(1, 6) for _ in range(3)]
-        dice_rolls.sort()
+            return super().roll_formula(character, base_roll)
         
-        # Determine which dice to keep based on net boon/bane effect
+        # Boons keep the highest 2 of 3d6, banes the lowest 2; if they cancel out it's a standard roll
         net_effect = self.boon_bane.net_effect
-        
-        if net_effect > 0:  # Boons - keep highest 2
-            dice_rolls = [random.randint(1, 6) for _ in range(3)]
-            dice_rolls.sort()
-            kept_dice = dice_rolls[-2:]
-            boon_bane_instruction = f"Boon"
-        elif net_effect < 0:  # Banes - keep lowest 2
-            dice_rolls = [random.randint(1, 6) for _ in range(3)]
-            dice_rolls.sort()
-            kept_dice = dice_rolls[:2]
-            boon_bane_instruction = f"Bane"
-        else:  # Cancel out - keep first 2 (standard roll)
-            dice_rolls = [random.randint(1, 6) for _ in range(2)]
-            kept_dice = dice_rolls
+        dice = compile_dice(self.base_dice()).roll().terms[0]
+        if net_effect > 0:
+            boon_bane_instruction = "Boon"
+        elif net_effect < 0:
+            boon_bane_instruction = "Bane"
+        else:
             boon_bane_instruction = ""
         
+        if boon_bane_instruction:
+            dice_rolls = sorted(dice.rolls)
+            kept_dice = sorted(dice.kept_rolls)
+        else:
+            dice_rolls = kept_dice = dice.rolls
         base_total = sum(kept_dice)
         
         # Calculate other modifiers (excluding boon/bane)
-        modifier_descriptions = []
-        total_mod = 0
-        
-        for key, value in self.get_modifiers(character).items():
-            if key == "Boon/Bane":
-                continue  # Already handled above
-            try:
-                mod = int(value)
-                total_mod += mod
-                sign = "+" if mod >= 0 else ""
-                modifier_descriptions.append(f"{key} ({sign}{mod})")
-            except (ValueError, TypeError):
-                continue
+        modifier_descriptions, total_mod = self._numeric_modifiers(character)
         
         total = base_total + total_mod
         
@@ -176,3 +167,31 @@ class MGT2ERollFormula(RollFormula):
         
         response = f'🎲 {formula_str}\n🧮 Total: {total}'
         return response, total
+
+    def _numeric_modifiers(self, character: "MGT2ECharacter") -> Tuple[List[str], int]:
+        """Descriptions and sum of the numeric modifiers; boons and banes are applied to the dice instead"""
+        modifier_descriptions = []
+        total_mod = 0
+        
+        for key, value in self.get_modifiers(character).items():
+            if key == "Boon/Bane":
+                continue  # Handled by the dice
+            try:
+                mod = int(value)
+                total_mod += mod
+                sign = "+" if mod >= 0 else ""
+                modifier_descriptions.append(f"{key} ({sign}{mod})")
+            except (ValueError, TypeError):
+                continue
+        return modifier_descriptions, total_mod
+
+    def roll_distribution(self, character: "MGT2ECharacter", base_roll: str) -> Tuple[Distribution, str]:
+        """Exact distribution of roll_formula's total, with boons and banes rolling 3d6 and keeping 2"""
+        if not base_roll.startswith("2d6"):
+            return super().roll_distribution(character, base_roll)
+        
+        modifier_descriptions, total_mod = self._numeric_modifiers(character)
+        base_dice = self.base_dice()
+        if self.boon_bane.net_effect:
+            base_dice += f" ({self.boon_bane})"
+        return dice_distribution(self.base_dice()).shift(total_mod), " + ".join([base_dice] + modifier_descriptions)
@@ -21,30 +21,23 @@ class MGT2ESceneView(BasePinnableSceneView):
             return
     
     async def create_scene_content(self):
-        # Get scene info
-        scene = repositories.scene.find_by_id('scene_id', self.scene_id)
-        if not scene:
+        # Load the scene, its NPCs, notes and environment in one query
+        snapshot = await repositories.aio.scene_snapshot.load(str(self.guild_id), str(self.scene_id), SystemType.MGT2E)
+        if not snapshot:
             return discord.Embed(
                 title="❌ Scene Not Found",
                 description="This scene no longer exists.",
                 color=discord.Color.red()
             ), "❌ **SCENE ERROR** ❌"
         
-        # Get NPCs in scene
-        npc_ids = repositories.scene_npc.get_scene_npc_ids(str(self.guild_id), str(self.scene_id))
+        scene = snapshot.scene
         
         # Format scene content - standard part
-        lines = []
-        for npc_id in npc_ids:
-            npc = repositories.entity.get_by_id(str(npc_id))
-            if npc:
-                lines.append(npc.format_npc_scene_entry(is_gm=self.is_gm))
-                
-        # Get scene notes
-        notes = repositories.scene_notes.get_scene_notes(str(self.guild_id), str(self.scene_id))
-        
-        # Get MGT2E-specific scene data
-        environment = repositories.mgt2e_environment.get_environment(str(self.guild_id), str(self.scene_id)) or {}
+        lines = [npc.format_npc_scene_entry(is_gm=self.is_gm) for npc in snapshot.npcs]
+        notes = snapshot.notes
+        
+        # MGT2E-specific scene data
+        environment = snapshot.environment
         
         # Create embed
         embed = discord.Embed(
@@ -122,10 +115,10 @@ class ManageNPCsButton(ui.Button):
             return
         
         # Get available NPCs
-        npcs = repositories.character.get_npcs(str(interaction.guild.id))
+        npcs = await repositories.aio.character.get_npcs(str(interaction.guild.id))
         
         # Get NPCs currently in the scene
-        scene_npc_ids = repositories.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
+        scene_npc_ids = await repositories.aio.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
         
         # Create selection options for NPCs
         options = []
@@ -184,7 +177,7 @@ class ManageNPCsSelect(discord.ui.Select):
         
     async def callback(self, interaction: discord.Interaction):
         # Get current NPCs in scene
-        scene_npc_ids = repositories.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
+        scene_npc_ids = await repositories.aio.scene_npc.get_scene_npc_ids(str(interaction.guild.id), str(self.parent_view.scene_id))
         
         # NPCs to add (selected but not in scene)
         to_add = [npc_id for npc_id in self.values if npc_id not in scene_npc_ids]
@@ -194,13 +187,13 @@ class ManageNPCsSelect(discord.ui.Select):
         
         # Perform the updates
         for npc_id in to_add:
-            repositories.scene_npc.add_npc_to_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
+            await repositories.aio.scene_npc.add_npc_to_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
             
         for npc_id in to_remove:
-            repositories.scene_npc.remove_npc_from_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
+            await repositories.aio.scene_npc.remove_npc_from_scene(str(interaction.guild.id), str(self.parent_view.scene_id), npc_id)
     
         # Check if this is the active scene before updating pins
-        scene = repositories.scene.find_by_id('scene_id', self.parent_view.scene_id)
+        scene = await repositories.aio.scene.find_by_id('scene_id', self.parent_view.scene_id)
     
         # Only update all pinned instances if this is the active scene
         if scene and scene.is_active:
@@ -270,7 +263,7 @@ class EditEnvironmentModal(discord.ui.Modal, title="Edit Scene Environment"):
 
     async def on_submit(self, interaction: discord.Interaction):
         # Update environment data in DB
-        repositories.mgt2e_environment.set_environment(str(self.parent_view.guild_id), str(self.parent_view.scene_id), {
+        await repositories.aio.mgt2e_environment.set_environment(str(self.parent_view.guild_id), str(self.parent_view.scene_id), {
             "description": self.description.value,
             "gravity": self.gravity.value,
             "atmosphere": self.atmosphere.value,
@@ -278,7 +271,7 @@ class EditEnvironmentModal(discord.ui.Modal, title="Edit Scene Environment"):
         })
         
         # Check if this is the active scene before updating pins
-        scene = repositories.scene.find_by_id('scene_id', self.parent_view.scene_id)
+        scene = await repositories.aio.scene.find_by_id('scene_id', self.parent_view.scene_id)
         
         # Only update pinned scenes if this is the active scene
         if scene and scene.is_active:
@@ -298,7 +291,7 @@ class EditEnvironmentModal(discord.ui.Modal, title="Edit Scene Environment"):
         
         # Create a new scene view with the updated environment data
         temp_view = factories.get_specific_scene_view(
-            system=repositories.server.get_system(str(interaction.guild.id)),
+            system=await repositories.aio.server.get_system(str(interaction.guild.id)),
             guild_id=str(interaction.guild.id),
             channel_id=str(interaction.channel.id),
             scene_id=self.parent_view.scene_id
@@ -312,7 +305,7 @@ class EditEnvironmentModal(discord.ui.Modal, title="Edit Scene Environment"):
         # If this scene is active AND there's a pinned message for it, add the footer
         pinned_msg = None
         if scene and scene.is_active:
-            pinned_msg = repositories.pinned_scene.get_scene_message_info(str(interaction.guild.id), str(interaction.channel.id))
+            pinned_msg = await repositories.aio.pinned_scene.get_scene_message_info(str(interaction.guild.id), str(interaction.channel.id))
             if pinned_msg and pinned_msg.scene_id == self.parent_view.scene_id:
                 embed.set_footer(text="This scene is also pinned at the top of the channel.")
         
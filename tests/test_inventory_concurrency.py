@@ -0,0 +1,118 @@
+"""
+Concurrent inventory updates against a real PostgreSQL database.
+
+Skipped unless a database is configured the same way as the bot (DATABASE_URL or DB_HOST).
+Rows are created under a random test guild id and removed afterwards.
+
+Run from the project root:
+    python -m unittest tests.test_inventory_concurrency
+"""
+import os
+import threading
+import unittest
+import uuid
+
+try:
+    from data.database import db_manager
+    from data.models import Entity
+    from data.repositories.repository_factory import repositories
+except ImportError:
+    db_manager = None
+
+THREADS = 8
+
+def make_entity(guild_id: str, name: str, entity_type: str) -> "Entity":
+    return Entity(
+        id=str(uuid.uuid4()),
+        guild_id=guild_id,
+        name=name,
+        owner_id='0',
+        entity_type=entity_type,
+        system='generic',
+        system_specific_data={},
+        notes=[],
+        avatar_url='',
+        access_type='public'
+    )
+
+def run_threads(target, count: int = THREADS):
+    threads = [threading.Thread(target=target, args=(i,)) for i in range(count)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+@unittest.skipUnless(
+    db_manager is not None and (os.getenv('DATABASE_URL') or os.getenv('DB_HOST')),
+    "needs psycopg2 and a configured PostgreSQL database"
+)
+class InventoryConcurrencyTest(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        with open('data/init_db.sql', 'r') as f:
+            schema_sql = f.read()
+        with db_manager.get_connection() as conn:
+            with conn.cursor() as cur:
+                cur.execute(schema_sql)
+        db_manager.configure_pool(max_size=THREADS * 2)
+
+    @classmethod
+    def tearDownClass(cls):
+        db_manager.close_pool()
+
+    def setUp(self):
+        self.guild_id = f"test-{uuid.uuid4()}"
+        self.link = repositories.link
+        self.container = make_entity(self.guild_id, 'Loot Chest', 'container')
+        repositories.entity.save_many([self.container], conflict_columns=['id'])
+
+    def tearDown(self):
+        self.link.delete("guild_id = %s", (self.guild_id,))
+        repositories.entity.delete("guild_id = %s", (self.guild_id,))
+
+    def test_concurrent_takes_never_overdraw(self):
+        # Two stacks of the same item name, so takes have to cross from one stack to the next
+        torches = [make_entity(self.guild_id, 'Torch', 'item') for _ in range(2)]
+        repositories.entity.save_many(torches, conflict_columns=['id'])
+        for torch in torches:
+            self.assertTrue(self.link.add_item_quantity(self.guild_id, self.container.id, torch.id, torch.name, 25))
+
+        taken = [0] * THREADS
+
+        def looter(i: int):
+            # Odd threads take three at a time, so some takes span both stacks or ask for more than is left
+            quantity = 3 if i % 2 else 1
+            while self.link.take_item_quantity(self.guild_id, self.container.id, 'Torch', quantity):
+                taken[i] += quantity
+
+        run_threads(looter)
+
+        remaining = self.link.get_item_quantity(self.guild_id, self.container.id, 'Torch')
+        self.assertGreaterEqual(remaining, 0)
+        self.assertEqual(sum(taken) + remaining, 50)
+        # Whatever is left is too little for even the smallest take
+        self.assertEqual(remaining, 0)
+
+    def test_concurrent_adds_respect_max_items(self):
+        max_items = 3
+        items = [make_entity(self.guild_id, f"Gem {i}", 'item') for i in range(THREADS)]
+        repositories.entity.save_many(items, conflict_columns=['id'])
+
+        added = [False] * THREADS
+
+        def adder(i: int):
+            added[i] = self.link.add_item_quantity(
+                self.guild_id, self.container.id, items[i].id, items[i].name, 1, max_items=max_items
+            )
+
+        run_threads(adder)
+
+        stacks = [
+            self.link.get_item_quantity(self.guild_id, self.container.id, item.name)
+            for item in items
+        ]
+        self.assertEqual(sum(added), max_items)
+        self.assertEqual(sum(1 for quantity in stacks if quantity), max_items)
+
+if __name__ == '__main__':
+    unittest.main()